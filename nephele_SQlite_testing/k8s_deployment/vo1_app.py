@@ -9,10 +9,42 @@ LOGGER = logging.getLogger()
 
 from io import BytesIO
 import base64
+import binascii
 LOGGER.setLevel(logging.INFO)
 
 TABLE_NAME = "string_data_table"
 
+legacy_maps_lock = asyncio.Lock()
+legacy_maps_imported = False
+
+
+async def import_legacy_maps():
+    # Maps stored by previous versions as base64 TEXT rows are copied once to the blob store
+    global legacy_maps_imported
+
+    async with legacy_maps_lock:
+        if legacy_maps_imported:
+            return
+
+        servient = exposed_thing.servient
+        sqlite_db = servient.sqlite_db
+        blob_store = servient.blob_store
+        table = await sqlite_db.fetch_one(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?", (TABLE_NAME,))
+
+        if table is not None:
+            async for filename, content in sqlite_db.iterate(f"SELECT filename, content FROM {TABLE_NAME}"):
+                if filename is None or content is None or await blob_store.exists(filename):
+                    continue
+                try:
+                    data = base64.b64decode(content, validate=True)
+                except (binascii.Error, ValueError):
+                    data = content.encode()
+                await blob_store.put(filename, data)
+                LOGGER.info('Imported map {} to the blob store'.format(filename))
+
+        legacy_maps_imported = True
+
 
 
 async def someStringProperty_write_handler(value):
@@ -25,8 +57,8 @@ async def someStringProperty_write_handler(value):
         "filename": "TEXT",
         "content": "TEXT"
     }
-    sqlite_db.create_table_if_not_exists(TABLE_NAME, columns)
-    sqlite_db.insert_data(TABLE_NAME, (filename, content))
+    await sqlite_db.create_table(TABLE_NAME, columns)
+    await sqlite_db.insert(TABLE_NAME, (filename, content))
 
 async def map_write_handler(value):
     servient = exposed_thing.servient
@@ -38,22 +70,25 @@ async def map_write_handler(value):
         "filename": "TEXT",
         "content": "TEXT"
     }
-    sqlite_db.create_table_if_not_exists(TABLE_NAME, columns)
-    sqlite_db.insert_data(TABLE_NAME, (filename, content))
+    await sqlite_db.create_table(TABLE_NAME, columns)
+    await sqlite_db.insert(TABLE_NAME, (filename, content))
 
 async def someStringProperty_read_handler():
     servient = exposed_thing.servient
     sqlite_db = servient.sqlite_db
 
-    return servient.sqlite_db.execute_query("SELECT content FROM string_data_table WHERE filename='filename2'")
-    #return servient.sqlite_db.fetch_all_rows(TABLE_NAME)
+    return await servient.sqlite_db.query("SELECT content FROM string_data_table WHERE filename = ?", ("filename2",))
+    #return await servient.sqlite_db.fetch_rows(TABLE_NAME)
     
 async def filenamesReadDB_handler(params):
     params = params['input'] if params['input'] else {}
     # Default values
+    await import_legacy_maps()
     servient = exposed_thing.servient
-    sqlite_db = servient.sqlite_db
-    result=sqlite_db.execute_query("SELECT filename FROM string_data_table")
+    blob_store = servient.blob_store
+    names=await blob_store.names(limit=params.get('limit'), offset=params.get('offset', 0))
+    # Same shape as the rows of the previous string_data_table query
+    result=[[name] for name in names]
     return result
 
 async def mapReadDB_handler(params):
@@ -62,11 +97,14 @@ async def mapReadDB_handler(params):
     filename_map = 'test'
     filename_map = params.get('filename_map', filename_map)
     LOGGER.info('Result after params is {}'.format(filename_map))
+    await import_legacy_maps()
     servient = exposed_thing.servient
-    sqlite_db = servient.sqlite_db
-    result=sqlite_db.execute_query("SELECT content FROM string_data_table WHERE filename='%s'" % filename_map)
-   # result= sqlite_db.execute_query("SELECT filename FROM string_data_table") 
-    parsed_result=result[0][0]
+    blob_store = servient.blob_store
+    if not await blob_store.exists(filename_map):
+        return None
+    # Maps are stored as binary blobs and sent base64 encoded
+    content = await blob_store.get(filename_map)
+    parsed_result=base64.b64encode(content).decode()
     return parsed_result
 
 
@@ -80,16 +118,12 @@ async def mapStoreDB_handler(params):
     LOGGER.info('Consumed Thing: {}'.format(consumed_vos["tb2"]))
     mapstring = await consumed_vos["tb2"].invoke_action("mapExport")
             
+    await import_legacy_maps()
     servient = exposed_thing.servient
-    sqlite_db = servient.sqlite_db
-    content = mapstring
+    blob_store = servient.blob_store
+    content = base64.b64decode(mapstring)
 
-    columns = {
-        "filename": "TEXT",
-        "content": "TEXT"
-    }
-    sqlite_db.create_table_if_not_exists(TABLE_NAME, columns)
-    result=sqlite_db.insert_data(TABLE_NAME, (filename_tosave, content))
+    result=await blob_store.put(filename_tosave, content)
     
     return {'message': f'Your map storing on db is in progress!'}
 
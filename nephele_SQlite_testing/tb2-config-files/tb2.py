@@ -7,6 +7,7 @@ from std_msgs.msg import Bool
 from std_msgs.msg import Float32
 from diagnostic_msgs.msg import DiagnosticArray
 
+import asyncio
 import subprocess
 import time
 import base64
@@ -103,8 +104,11 @@ async def triggerBringup_handler(params):
     # Check if params are provided
     launchfileId = params.get('launchfileId', launchfileId)
 
+    # Blocking calls (sensor reads, process waits) run in the executor of the servient loop
+    loop = asyncio.get_running_loop()
+
     # Check if there is resources
-    battery_info = read_from_sensor('kobuki: Battery')
+    battery_info = await loop.run_in_executor(None, read_from_sensor, 'kobuki: Battery')
     batterypercent = battery_info[0] if battery_info is not None else None
     batterycharging = battery_info[1] if battery_info is not None else None
     print(f'Battery Percentage: {batterypercent}%')
@@ -122,7 +126,7 @@ async def triggerBringup_handler(params):
         print("Battery status unknown, start turtlebot2_bringup!")
         process_bringup = subprocess.Popen(['ros2', 'launch', 'turtlebot2_bringup', 'tb2_complete_no_map.launch.py'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
         # Allow some time for the launch file to start
-        time.sleep(15)  
+        await asyncio.sleep(15)  
 
         # Check if the process is still running
         if process_bringup.poll() is None:
@@ -136,7 +140,7 @@ async def triggerBringup_handler(params):
         # If battery percentage is more than 50, allow to start the mapping launch file
         print("Battery sufficient, start turtlebot2 mapping!")
         process_mapping = subprocess.Popen(['ros2', 'launch', 'slam_toolbox', 'online_async_launch.py'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        time.sleep(10) 
+        await asyncio.sleep(10) 
 
         if process_mapping.poll() is None:
             print("Mapping started successfully.")
@@ -148,7 +152,7 @@ async def triggerBringup_handler(params):
     if launchfileId == 'savemap': #and mappingaction == True:
         print("Mapping finished, save the map!")
         process_savemapping = subprocess.Popen(['ros2', 'launch', 'turtlebot2_bringup', 'map_save.launch.py'], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-        time.sleep(10) 
+        await asyncio.sleep(10) 
        
         print("Map saved successfully.")
         saveaction = True
@@ -157,7 +161,7 @@ async def triggerBringup_handler(params):
         print("Starting recording rosbag!")
         global process_bagrecording
         process_bagrecording = subprocess.Popen(['exec ros2 bag record -s mcap -o my_bag /camera/color/image/compressed'], stdout=subprocess.PIPE, stderr=subprocess.PIPE,shell=True)
-        time.sleep(1) 
+        await asyncio.sleep(1) 
        
         print("Bag recording started.")
         savebagaction = True
@@ -166,8 +170,8 @@ async def triggerBringup_handler(params):
         print("Stopping recording rosbag!")
         if process_bagrecording.poll() is None:
             process_bagrecording.terminate()
-            process_bagrecording.wait()
-            time.sleep(1)
+            await loop.run_in_executor(None, process_bagrecording.wait)
+            await asyncio.sleep(1)
         #print(process_bagrecording)
         #process_bagrecording.terminate()#kill()
         #os.killpg(process_bagrecording, signal.SIGTERM)
@@ -191,8 +195,9 @@ async def triggerBringup_handler(params):
 
     # Calculate the new level of resources
     newResources = resources.copy()
-    newResources['battery_percent'] = read_from_sensor('kobuki: Battery')[0]
-    newResources['battery_charging'] = read_from_sensor('kobuki: Battery')[1]
+    battery_info = await loop.run_in_executor(None, read_from_sensor, 'kobuki: Battery')
+    newResources['battery_percent'] = battery_info[0]
+    newResources['battery_charging'] = battery_info[1]
     
     # Check if the amount of available resources is sufficient to launch
     if newResources['battery_percent'] <= 30:
@@ -15,12 +15,12 @@ async def someStringProperty_write_handler(value):
         "name": "TEXT",
         "content": "TEXT"
     }
-    sqlite_db.create_table_if_not_exists(TABLE_NAME, columns)
-    sqlite_db.insert_data(TABLE_NAME, (name, content))
+    await sqlite_db.create_table(TABLE_NAME, columns)
+    await sqlite_db.insert(TABLE_NAME, (name, content))
 
 
 async def someStringProperty_read_handler():
     servient = exposed_thing.servient
     sqlite_db = servient.sqlite_db
 
-    return servient.sqlite_db.fetch_all_rows(TABLE_NAME)
+    return await servient.sqlite_db.fetch_rows(TABLE_NAME)
@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from tests.utils import run_test_coroutine
+from wotpy.database.enums import BackpressurePolicy
+from wotpy.database.influxdb_writer import InfluxDBBatchWriter
+
+
+def _written_records(influxdb):
+    """Returns the list of (bucket, record) tuples written to the mocked database."""
+
+    return [
+        (call.args[0], record)
+        for call in influxdb.write_records.call_args_list
+        for record in call.args[1]
+    ]
+
+
+def test_writer_flushes_on_batch_size():
+    """Points are written in the background once a full batch is queued."""
+
+    influxdb = MagicMock()
+    writer = InfluxDBBatchWriter(influxdb, batch_size=3, flush_interval=60000)
+
+    async def test_coroutine():
+        writer.start()
+
+        for idx in range(3):
+            writer.enqueue("bucket", idx)
+
+        for _ in range(100):
+            if writer.stats["flushed"] == 3:
+                break
+            await asyncio.sleep(0.01)
+
+        assert _written_records(influxdb) == [("bucket", 0), ("bucket", 1), ("bucket", 2)]
+        assert writer.stats["pending"] == 0
+
+        await writer.stop()
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_writer_flushes_on_stop():
+    """Pending points are written grouped by bucket when the writer stops."""
+
+    influxdb = MagicMock()
+    writer = InfluxDBBatchWriter(influxdb, batch_size=100, flush_interval=60000)
+
+    async def test_coroutine():
+        writer.start()
+
+        writer.enqueue("a", 1)
+        writer.enqueue("b", 2)
+        writer.enqueue("a", 3)
+
+        assert not influxdb.write_records.called
+
+        await writer.stop()
+
+        assert not writer.is_running
+        assert _written_records(influxdb) == [("a", 1), ("a", 3), ("b", 2)]
+        assert writer.stats == {"queued": 3, "dropped": 0, "flushed": 3, "failed": 0, "pending": 0}
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_writer_backpressure_drop():
+    """The drop policies discard the oldest or the newest point when the queue is full."""
+
+    influxdb = MagicMock()
+
+    writer_oldest = InfluxDBBatchWriter(
+        influxdb, batch_size=2, max_queue_size=2, backpressure=BackpressurePolicy.DROP_OLDEST)
+    writer_newest = InfluxDBBatchWriter(
+        influxdb, batch_size=2, max_queue_size=2, backpressure=BackpressurePolicy.DROP_NEWEST)
+
+    for writer in (writer_oldest, writer_newest):
+        for idx in range(4):
+            writer.enqueue("bucket", idx)
+
+        assert writer.stats["dropped"] == 2
+        assert writer.pending == 2
+
+    assert list(writer_oldest._queue) == [("bucket", 2), ("bucket", 3)]
+    assert list(writer_newest._queue) == [("bucket", 0), ("bucket", 1)]
+    assert not influxdb.write_records.called
+
+
+def test_writer_backpressure_block():
+    """The block policy writes the oldest batch in the caller when the queue is
+    full, so the queue never grows past its maximum size."""
+
+    influxdb = MagicMock()
+    writer = InfluxDBBatchWriter(influxdb, batch_size=2, max_queue_size=4, flush_interval=60000)
+
+    async def test_coroutine():
+        writer.start()
+
+        for idx in range(5):
+            writer.enqueue("bucket", idx)
+
+        assert _written_records(influxdb) == [("bucket", 0), ("bucket", 1)]
+        assert writer.pending == 3
+
+        await writer.stop()
+
+        assert _written_records(influxdb) == [("bucket", idx) for idx in range(5)]
+        assert writer.stats == {"queued": 5, "dropped": 0, "flushed": 5, "failed": 0, "pending": 0}
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_writer_wait_for_capacity():
+    """Coroutines waiting for capacity resume once the background flush
+    frees room in a full queue, without writing in the event loop."""
+
+    influxdb = MagicMock()
+    writer = InfluxDBBatchWriter(influxdb, batch_size=2, max_queue_size=2, flush_interval=60000)
+
+    async def test_coroutine():
+        writer.start()
+
+        writer.enqueue("bucket", 0)
+        writer.enqueue("bucket", 1)
+
+        await asyncio.wait_for(writer.wait_for_capacity(), timeout=5)
+
+        assert writer.pending < 2
+        assert _written_records(influxdb) == [("bucket", 0), ("bucket", 1)]
+
+        writer.enqueue("bucket", 2)
+
+        await writer.stop()
+
+        assert writer.stats["flushed"] == 3
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_writer_counts_failures():
+    """Points that can not be written are counted as failed."""
+
+    influxdb = MagicMock()
+    influxdb.write_records.side_effect = ConnectionError
+    writer = InfluxDBBatchWriter(influxdb)
+
+    async def test_coroutine():
+        writer.start()
+        writer.enqueue("bucket", 1)
+        await writer.stop()
+
+        assert writer.stats["failed"] == 1
+        assert writer.stats["flushed"] == 0
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_writer_invalid_options():
+    """Invalid writer options are rejected."""
+
+    with pytest.raises(ValueError):
+        InfluxDBBatchWriter(MagicMock(), backpressure="unknown")
+
+    with pytest.raises(ValueError):
+        InfluxDBBatchWriter(MagicMock(), batch_size=10, max_queue_size=5)
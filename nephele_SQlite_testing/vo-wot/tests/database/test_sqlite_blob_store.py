@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import hashlib
+import io
+import os
+
+import pytest
+
+from tests.utils import run_test_coroutine
+from wotpy.database.sqlite_blob_store import SQLiteBlobStore
+from wotpy.database.sqlite_database import SQLiteDatabase
+
+
+@pytest.fixture
+def blob_store(tmp_path):
+    """Returns a blob store with small chunks in a temporary database."""
+
+    db = SQLiteDatabase(str(tmp_path / "vo.db"))
+
+    yield SQLiteBlobStore(db, chunk_size=10)
+
+    db.conn.close()
+
+
+def test_blob_store_put_get(blob_store):
+    """Blobs are written in chunks and can be read whole or by ranges."""
+
+    content = os.urandom(95)
+
+    async def test_coroutine():
+        info = await blob_store.put("map", content)
+
+        assert info == {
+            "name": "map",
+            "hash": hashlib.sha256(content).hexdigest(),
+            "size": 95,
+            "deduplicated": False
+        }
+
+        assert await blob_store.get("map") == content
+        assert await blob_store.read("map", offset=8, length=25) == content[8:33]
+        assert await blob_store.read("map", offset=90, length=100) == content[90:]
+        assert [len(chunk) async for chunk in blob_store.stream("map", offset=5)] == [5] + [10] * 8 + [5]
+
+        chunks = await blob_store._sqlite_db.query("SELECT COUNT(*) FROM blob_chunk")
+        assert chunks == [(10,)]
+
+        with pytest.raises(ValueError):
+            await blob_store.get("unknown")
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_blob_store_streaming_sources(blob_store):
+    """Content can be read from file-like objects and async iterables."""
+
+    async def pieces():
+        for piece in (b"abc", b"defghijklmno", b"", b"pq"):
+            yield piece
+
+    async def test_coroutine():
+        await blob_store.put("file", io.BytesIO(b"0123456789" * 3))
+        await blob_store.put("pieces", pieces())
+
+        assert await blob_store.get("file") == b"0123456789" * 3
+        assert await blob_store.get("pieces") == b"abcdefghijklmnopq"
+        assert await blob_store.names() == ["file", "pieces"]
+        assert await blob_store.names(limit=1) == ["file"]
+        assert await blob_store.names(limit=1, offset=1) == ["pieces"]
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_blob_store_dedupe(blob_store):
+    """Blobs with the same content share their chunks, which are
+    removed once no blob refers to them."""
+
+    async def test_coroutine():
+        await blob_store.put("a", b"x" * 25)
+        info = await blob_store.put("b", b"x" * 25)
+
+        assert info["deduplicated"]
+
+        chunks = await blob_store._sqlite_db.query("SELECT COUNT(*) FROM blob_chunk")
+        assert chunks == [(3,)]
+
+        await blob_store.put("a", b"y" * 5)
+        assert await blob_store.delete("b")
+        assert not await blob_store.delete("b")
+        assert not await blob_store.exists("b")
+
+        chunks = await blob_store._sqlite_db.query("SELECT COUNT(*) FROM blob_chunk")
+        assert chunks == [(1,)]
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_blob_store_failed_upload(blob_store):
+    """Chunks of an interrupted upload are discarded."""
+
+    async def pieces():
+        yield b"z" * 30
+        raise IOError
+
+    async def test_coroutine():
+        with pytest.raises(IOError):
+            await blob_store.put("broken", pieces())
+
+        chunks = await blob_store._sqlite_db.query("SELECT COUNT(*) FROM blob_chunk")
+        assert chunks == [(0,)]
+        assert not await blob_store.exists("broken")
+
+    run_test_coroutine(test_coroutine)
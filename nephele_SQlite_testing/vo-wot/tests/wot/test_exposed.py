@@ -2,6 +2,8 @@
 # -*- coding: utf-8 -*-
 
 import asyncio
+import operator
+import threading
 import time
 import uuid
 # noinspection PyCompatibility
@@ -12,10 +14,12 @@ from faker import Faker
 from slugify import slugify
 
 from tests.utils import run_test_coroutine
+from wotpy.functions.functions import forecasting, mean_value
 from wotpy.wot.constants import WOT_TD_CONTEXT_URL_V1_1
 from wotpy.wot.dictionaries.interaction import PropertyFragmentDict, ActionFragmentDict, EventFragmentDict
 from wotpy.wot.dictionaries.thing import ThingFragment
 from wotpy.wot.enums import TDChangeMethod, TDChangeType, DataType
+from wotpy.wot.exposed.action_engine import ActionRejectedException
 from wotpy.wot.exposed.thing import ExposedThing
 from wotpy.wot.servient import Servient
 from wotpy.wot.thing import Thing
@@ -281,6 +285,398 @@ def test_on_event(exposed_thing, event_fragment):
     subscription.dispose()
 
 
+def test_keyed_event_dispatch(exposed_thing, property_fragment, event_fragment):
+    """Emissions are only delivered to the subscribers of the same
+    interaction and subscriber counts are kept for each interaction."""
+
+    async def test_coroutine():
+        prop_names = [Faker().pystr() for _ in range(2)]
+        event_name = Faker().pystr()
+
+        for prop_name in prop_names:
+            exposed_thing.add_property(prop_name, property_fragment)
+
+        exposed_thing.add_event(event_name, event_fragment)
+
+        received = {name: [] for name in prop_names + [event_name]}
+
+        subscriptions = [
+            exposed_thing.on_property_change(name).subscribe(
+                lambda ev, name=name: received[name].append(ev.data.value))
+            for name in prop_names
+        ]
+
+        subscriptions.append(exposed_thing.on_event(event_name).subscribe(
+            lambda ev: received[event_name].append(ev.data)))
+
+        subscriptions.append(exposed_thing.on_event(event_name).subscribe(lambda ev: None))
+
+        assert exposed_thing.properties[prop_names[0]].subscriber_count == 1
+        assert exposed_thing.events[event_name].subscriber_count == 2
+        assert exposed_thing.subscriber_counts == {
+            "propertychange": {prop_names[0]: 1, prop_names[1]: 1},
+            "event": {event_name: 2}
+        }
+
+        await exposed_thing.write_property(prop_names[0], "a")
+        await exposed_thing.write_property(prop_names[1], "b")
+        exposed_thing.emit_event(event_name, "c")
+
+        assert received == {prop_names[0]: ["a"], prop_names[1]: ["b"], event_name: ["c"]}
+
+        for subscription in subscriptions:
+            subscription.dispose()
+
+        assert exposed_thing.subscriber_counts == {}
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_property_history(exposed_thing):
+    """Property writes are recorded with versions and timestamps in a bounded history."""
+
+    async def test_coroutine():
+        num_name = Faker().pystr()
+        str_name = Faker().pystr()
+
+        exposed_thing.add_property(num_name, {"type": DataType.NUMBER}, value=0.5)
+        exposed_thing.add_property(str_name, {"type": DataType.STRING})
+
+        num_prop = exposed_thing.properties[num_name]
+        str_prop = exposed_thing.properties[str_name]
+
+        assert num_prop.sample.value == 0.5
+        assert str_prop.sample is None
+        assert str_prop.version == 0
+
+        num_prop.history_size = 5
+
+        for idx in range(8):
+            await num_prop.write(float(idx))
+
+        await str_prop.write("a")
+
+        assert num_prop.version < str_prop.version
+        assert exposed_thing.property_store.version == str_prop.version
+        assert exposed_thing.property_store._histories[num_name].typecode == "d"
+        assert [sample.value for sample in num_prop.last(10)] == [3.0, 4.0, 5.0, 6.0, 7.0]
+        assert [sample.value for sample in num_prop.last(2)] == [6.0, 7.0]
+
+        version = num_prop.last(3)[0].version
+
+        assert [sample.value for sample in num_prop.since(version)] == [6.0, 7.0]
+        assert num_prop.since(num_prop.version) == []
+
+        await num_prop.write(None)
+
+        assert await num_prop.read() is None
+        assert [sample.value for sample in num_prop.last(2)] == [7.0, None]
+
+        samples = num_prop.last(5)
+        assert all(a.timestamp <= b.timestamp for a, b in zip(samples, samples[1:]))
+
+        exposed_thing.remove_property(num_name)
+        exposed_thing.add_property(num_name, {"type": DataType.NUMBER})
+
+        assert exposed_thing.properties[num_name].last(10) == []
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_property_history_handlers(exposed_thing):
+    """Writes are recorded once when a custom handler calls the default handler,
+    not at all when it does not, and the history functions work without InfluxDB."""
+
+    async def test_coroutine():
+        prop_name = Faker().pystr()
+        exposed_thing.add_property(prop_name, {"type": DataType.NUMBER})
+
+        async def handler(value):
+            await exposed_thing._default_update_property_handler(prop_name, value * 2)
+
+        exposed_thing.set_property_write_handler(prop_name, handler)
+
+        assert await forecasting(exposed_thing, prop_name) is None
+
+        for value in (1.0, 2.0, 3.0):
+            await exposed_thing.write_property(prop_name, value)
+
+        prop = exposed_thing.properties[prop_name]
+
+        assert [sample.value for sample in prop.last(10)] == [2.0, 4.0, 6.0]
+        assert await mean_value(exposed_thing, prop_name, 2) == 5.0
+        assert await mean_value(exposed_thing, prop_name, 0) == 4.0
+
+        ignored_name = Faker().pystr()
+        exposed_thing.add_property(ignored_name, {"type": DataType.NUMBER})
+
+        async def ignore_handler(value):
+            pass
+
+        exposed_thing.set_property_write_handler(ignored_name, ignore_handler)
+        await exposed_thing.write_property(ignored_name, 1.0)
+
+        assert exposed_thing.properties[ignored_name].last(10) == []
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_multiple_properties(exposed_thing):
+    """Multiple Properties can be read and written at once."""
+
+    async def test_coroutine():
+        names = [Faker().pystr() for _ in range(3)]
+
+        for name in names:
+            exposed_thing.add_property(name, {"type": DataType.STRING})
+
+        exposed_thing.add_property(names[-1] + "ro", {"type": DataType.STRING, "readOnly": True}, value="a")
+        exposed_thing.add_property(names[-1] + "wo", {"type": DataType.STRING, "writeOnly": True}, value="b")
+
+        values = {name: Faker().sentence() for name in names}
+
+        await exposed_thing.handle_write_multiple_properties(values)
+
+        assert (await exposed_thing.read_multiple_properties(names[:2])) == {name: values[name] for name in names[:2]}
+
+        all_values = await exposed_thing.read_all_properties()
+
+        assert all(all_values[name] == values[name] for name in names)
+        assert all_values[names[-1] + "ro"] == "a"
+        assert names[-1] + "wo" not in all_values
+
+        with pytest.raises(TypeError):
+            await exposed_thing.handle_write_multiple_properties({names[0]: "x", names[-1] + "ro": "x"})
+
+        with pytest.raises(TypeError):
+            await exposed_thing.write_multiple_properties({names[0]: "x", names[-1] + "ro": "x"})
+
+        with pytest.raises(ValueError):
+            await exposed_thing.write_multiple_properties({names[0]: "x", Faker().pystr(): "x"})
+
+        assert (await exposed_thing.read_property(names[0])) == values[names[0]]
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_property_change_policy(exposed_thing):
+    """Property writes that do not pass the change policy are not published."""
+
+    async def test_coroutine():
+        num_name = Faker().pystr()
+        obj_name = Faker().pystr()
+
+        exposed_thing.add_property(num_name, {
+            "type": DataType.NUMBER,
+            "observable": True,
+            "changePolicy": {"deadband": 1.0}
+        })
+
+        exposed_thing.add_property(obj_name, {"type": DataType.OBJECT, "observable": True})
+
+        num_prop = exposed_thing.properties[num_name]
+        obj_prop = exposed_thing.properties[obj_name]
+
+        assert num_prop.change_policy.deadband == 1.0
+        assert obj_prop.change_policy is None
+
+        emitted = []
+
+        exposed_thing.on_property_change(num_name).subscribe(
+            lambda item: emitted.append(item.data.value))
+        exposed_thing.on_property_change(obj_name).subscribe(
+            lambda item: emitted.append(item.data.value))
+
+        for value in [10.0, 10.5, 10.9, 11.0, 11.2, 9.9]:
+            await num_prop.write(value)
+
+        assert emitted == [10.0, 11.0, 9.9]
+        assert [sample.value for sample in num_prop.last(10)] == [10.0, 10.5, 10.9, 11.0, 11.2, 9.9]
+
+        emitted.clear()
+
+        obj_prop.change_policy = {"suppressEqual": True, "minInterval": 50}
+
+        await obj_prop.write({"a": 1})
+        await obj_prop.write({"a": 1})
+        await obj_prop.write({"a": 2})
+        await obj_prop.write({"a": 3})
+
+        assert emitted == [{"a": 1}]
+
+        await asyncio.sleep(0.1)
+
+        assert emitted == [{"a": 1}, {"a": 3}]
+
+        emitted.clear()
+
+        num_prop.change_policy = {"suppressEqual": True, "maxInterval": 50}
+
+        await num_prop.write(5.0)
+        await num_prop.write(5.0)
+
+        assert emitted == [5.0]
+
+        await asyncio.sleep(0.06)
+        await num_prop.write(5.0)
+
+        assert emitted == [5.0, 5.0]
+
+        with pytest.raises(ValueError):
+            num_prop.change_policy = {"unknown": 1}
+
+        with pytest.raises(ValueError):
+            num_prop.change_policy = {"minInterval": 100, "maxInterval": 50}
+
+        num_prop.change_policy = None
+
+        assert num_prop.change_policy.to_dict() == {"deadband": 1.0}
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_action_execution_policy(exposed_thing):
+    """Action invocations are limited, queued and rejected according to the execution policy."""
+
+    async def test_coroutine():
+        action_name = Faker().pystr()
+        release = asyncio.Event()
+
+        async def action_handler(parameters):
+            await release.wait()
+            return parameters.get("input")
+
+        exposed_thing.add_action(action_name, {
+            "executionPolicy": {"maxConcurrency": 1, "queueSize": 1}
+        }, action_handler)
+
+        action = exposed_thing.actions[action_name]
+
+        assert action.execution_policy.max_concurrency == 1
+
+        first = asyncio.ensure_future(action.invoke(1))
+        second = asyncio.ensure_future(action.invoke(2))
+
+        await asyncio.sleep(0)
+
+        with pytest.raises(ActionRejectedException):
+            await action.invoke(3)
+
+        assert action.metrics["running"] == 1
+        assert action.metrics["queue_depth"] == 1
+        assert action.metrics["rejected"] == 1
+
+        release.set()
+
+        assert (await first) == 1
+        assert (await second) == 2
+        assert action.metrics["completed"] == 2
+        assert action.metrics["max_queue_depth"] == 1
+        assert action.metrics["mean_execution_time"] is not None
+
+        release.clear()
+        action.execution_policy = {"maxConcurrency": 1, "queueSize": 1, "rejectPolicy": "dropOldest"}
+
+        first = asyncio.ensure_future(action.invoke(1))
+        second = asyncio.ensure_future(action.invoke(2))
+
+        await asyncio.sleep(0)
+
+        third = asyncio.ensure_future(action.invoke(3))
+
+        await asyncio.sleep(0)
+
+        release.set()
+
+        assert (await first) == 1
+        assert (await third) == 3
+
+        with pytest.raises(ActionRejectedException):
+            await second
+
+        with pytest.raises(ValueError):
+            action.execution_policy = {"mode": "unknown"}
+
+        action.execution_policy = None
+
+        assert action.execution_policy.to_dict()["maxConcurrency"] == 1
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_action_execution_offload(exposed_thing):
+    """Blocking Action handlers in thread or process mode do not block the event loop."""
+
+    async def test_coroutine():
+        action_name = Faker().pystr()
+
+        def blocking_handler(parameters):
+            time.sleep(0.3)
+            return threading.current_thread().name
+
+        exposed_thing.add_action(action_name, {
+            "executionPolicy": {"mode": "thread"}
+        }, blocking_handler)
+
+        action = exposed_thing.actions[action_name]
+        future_invoke = asyncio.ensure_future(action.invoke())
+
+        started = time.perf_counter()
+        await asyncio.sleep(0.05)
+
+        assert time.perf_counter() - started < 0.25
+        assert not future_invoke.done()
+        assert (await future_invoke).startswith("wotpy-action")
+        assert action.metrics["mode"] == "thread"
+
+        action.execution_policy = {"mode": "process"}
+        exposed_thing.set_action_handler(action_name, operator.itemgetter("input"))
+
+        assert (await action.invoke({"a": 1})) == {"a": 1}
+
+        exposed_thing.servient.action_pools.shutdown(wait=True)
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_action_execution_thread_coroutine(exposed_thing):
+    """Coroutine handlers in thread mode run on the event loop of the servient,
+    so Property writes deferred by a change policy are still published."""
+
+    async def test_coroutine():
+        action_name = Faker().pystr()
+        prop_name = Faker().pystr()
+        loop_thread = threading.current_thread()
+        handler_threads = []
+        changes = []
+
+        exposed_thing.add_property(prop_name, {
+            "type": DataType.NUMBER,
+            "observable": True,
+            "changePolicy": {"minInterval": 100}
+        })
+
+        async def handler(parameters):
+            handler_threads.append(threading.current_thread())
+            await exposed_thing.properties[prop_name].write(1)
+            await exposed_thing.properties[prop_name].write(2)
+            return await exposed_thing.properties[prop_name].read()
+
+        exposed_thing.add_action(action_name, {"executionPolicy": {"mode": "thread"}}, handler)
+        exposed_thing.on_property_change(prop_name).subscribe(lambda item: changes.append(item.data.value))
+
+        assert await exposed_thing.actions[action_name].invoke() == 2
+        assert handler_threads == [loop_thread]
+
+        await asyncio.sleep(0.3)
+
+        assert changes == [1, 2]
+
+        exposed_thing.servient.action_pools.shutdown(wait=True)
+
+    run_test_coroutine(test_coroutine)
+
+
 def test_on_td_change(exposed_thing, property_fragment, event_fragment, action_fragment):
     """Thing Description changes can be observed."""
 
@@ -6,7 +6,6 @@ CLI for the WoT runtime that handles servient configuration and execution of WoT
 """
 
 import argparse
-import asyncio
 import json
 import logging
 import time
@@ -15,15 +14,17 @@ import importlib.util
 
 from tornado.httpclient import HTTPClientError
 from tornado.ioloop import PeriodicCallback
+from tornado.process import fork_processes
 
-from wotpy.functions import functions
-from wotpy.cli.default_servient import DefaultServient
+import wotpy
 from wotpy.protocols.netconf.utils import inject_netconf_properties
+from wotpy.utils.event_loop import EventLoopPolicies, new_event_loop, set_event_loop_policy
+from wotpy.utils.profiling import disable_startup_profiler, enable_startup_profiler, startup_phase
 from wotpy.utils.proxy import build_prop_read_proxy, build_prop_write_proxy, \
     build_action_invoke_proxy, subscribe_event
 
 
-def create_proxy_functions(consumed_vos, proxy_dict, exposed_thing):
+def create_proxy_functions(consumed_vos, proxy_dict, exposed_thing, is_leader=True):
     """
     Creates proxy functions that propagate interactions with properties, actions
     and events to another thing. The operations that are proxied are:
@@ -37,6 +38,9 @@ def create_proxy_functions(consumed_vos, proxy_dict, exposed_thing):
         - on_next function
         - on_completed function
         - on_error function
+
+    Event subscriptions are only created on the leader worker of a cluster,
+    the other workers receive the Events from the leader.
     """
 
     if "propertiesMap" in proxy_dict and proxy_dict["propertiesMap"] is not None:
@@ -57,7 +61,7 @@ def create_proxy_functions(consumed_vos, proxy_dict, exposed_thing):
                 build_action_invoke_proxy(consumed_vos[target_vo], action)
             )
 
-    if "eventsMap" in proxy_dict and proxy_dict["eventsMap"] is not None:
+    if is_leader and "eventsMap" in proxy_dict and proxy_dict["eventsMap"] is not None:
         for event, target_vo in proxy_dict["eventsMap"].items():
             subscribe_event(consumed_vos[target_vo], exposed_thing, event)
 
@@ -120,7 +124,7 @@ async def subscribe_remote_events(consumed_vos, consumed_vos_dict, module):
             )
 
 
-async def map_user_defined_code(TD, exposed_thing, module):
+async def map_user_defined_code(TD, exposed_thing, module, is_leader=True):
     """
     Maps the following user-defined code to the corresponding WoT constructs:
 
@@ -138,12 +142,15 @@ async def map_user_defined_code(TD, exposed_thing, module):
         - on_next function
         - on_completed function
         - on_error function
+
+    Initial values and subscriptions are only mapped on the leader worker of
+    a cluster, so that they take effect once for all the workers.
     """
 
     for proprty in TD.get("properties", {}):
         property_init_name = proprty + "_init"
         property_init_value = getattr(module, property_init_name, None)
-        if property_init_value is not None:
+        if is_leader and property_init_value is not None:
             await exposed_thing.properties[proprty].write(property_init_value)
 
         property_read_handler_name = proprty + "_read_handler"
@@ -164,7 +171,7 @@ async def map_user_defined_code(TD, exposed_thing, module):
         on_completed_handler = getattr(module, on_completed_handler_name, None)
         on_error_handler = getattr(module, on_error_handler_name, None)
 
-        if on_next_handler is not None:
+        if is_leader and on_next_handler is not None:
             exposed_thing.properties[proprty].subscribe(
                 on_next=on_next_handler,
                 on_completed=on_completed_handler,
@@ -187,7 +194,7 @@ async def map_user_defined_code(TD, exposed_thing, module):
         on_completed_handler = getattr(module, on_completed_handler_name, None)
         on_error_handler = getattr(module, on_error_handler_name, None)
 
-        if on_next_handler is not None:
+        if is_leader and on_next_handler is not None:
             exposed_thing.events[event].subscribe(
                 on_next=on_next_handler,
                 on_completed=on_completed_handler,
@@ -210,31 +217,79 @@ def schedule_periodic_functions(periodic_function_data, module):
 def inject_generic_function(generic_function_data, module):
     """Inject generic function in the user-defined module's functions"""
 
+    if not generic_function_data:
+        return
+
+    # Generic functions depend on heavy packages, so they are only imported if used
+    from wotpy.functions import functions
+
     for generic_function in generic_function_data:
         function = getattr(functions, generic_function)
         setattr(module, generic_function, function)
 
 
-async def run_script(thing_description_path, script_path, config_path):
-    """Creates a Servient based on the config file and initializes the WoT runtime"""
+def load_config(config_path):
+    """Loads the VO descriptor from the given YAML file (empty if None)."""
 
     config = {}
     if config_path is not None:
         with open(config_path, "r") as config_file:
             config = yaml.safe_load(config_file)
 
-    default_servient = DefaultServient(config)
+    return config
+
+
+def setup_event_loop(config, policy=None, executor_size=None, slow_callback_duration=None):
+    """Creates the event loop of the WoT runtime with the eventLoop options
+    of the VO descriptor, overridden by the options of the command line."""
+
+    loop_config = {"policy": None, "executorSize": None, "slowCallbackDuration": None}
+    loop_config.update(config.get("eventLoop") or {})
+
+    overrides = {
+        "policy": policy,
+        "executorSize": executor_size,
+        "slowCallbackDuration": slow_callback_duration
+    }
+    loop_config.update({key: val for key, val in overrides.items() if val is not None})
+
+    if loop_config["policy"] is not None:
+        set_event_loop_policy(loop_config["policy"])
+
+    return new_event_loop(
+        executor_size=loop_config["executorSize"],
+        slow_callback_duration=loop_config["slowCallbackDuration"])
+
+
+async def run_script(thing_description_path, script_path, config_path, workers=None, worker_id=None):
+    """Creates a Servient based on the config file and initializes the WoT runtime.
+    When running several workers, periodic functions and subscriptions only run on the leader.
+    The startup phases are recorded if the startup profiler is enabled."""
+
+    config = load_config(config_path)
+    if workers is not None:
+        config["workers"] = workers
+
+    with startup_phase("imports"):
+        from wotpy.cli.default_servient import DefaultServient
+
+    with startup_phase("servient build"):
+        default_servient = DefaultServient(config, worker_id=worker_id)
+
     wot = await default_servient.start()
+    is_leader = default_servient.cluster is None or default_servient.cluster.is_leader
 
     # Dynamically loads the python script with the user-defined code
-    spec = importlib.util.spec_from_file_location("wot_script", script_path)
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
+    with startup_phase("user script"):
+        spec = importlib.util.spec_from_file_location("wot_script", script_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
 
-    with open(thing_description_path, "r") as thing_description:
-        TD = json.load(thing_description)
+    with startup_phase("TD build"):
+        with open(thing_description_path, "r") as thing_description:
+            TD = json.load(thing_description)
 
-    exposed_thing = wot.produce(json.dumps(TD))
+        exposed_thing = wot.produce(json.dumps(TD))
 
     http_sb_credentials = default_servient.config["bindingSB"]["securitySB"]["securitySBHTTP"]
     try:
@@ -249,33 +304,44 @@ async def run_script(thing_description_path, script_path, config_path):
             credentials_dict = None
     except KeyError:
         credentials_dict = None
-    consumed_vos_dict = default_servient.config.get("consumedVOs", {})
-    consumed_vos = await consume_vos(consumed_vos_dict, wot, credentials_dict)
-    await subscribe_remote_events(consumed_vos, consumed_vos_dict, module)
 
-    proxy_data = default_servient.config.get("proxy", {})
-    create_proxy_functions(consumed_vos, proxy_data, exposed_thing)
-
-    generic_function_data = default_servient.config.get("genericFunction", [])
-    inject_generic_function(generic_function_data, module)
+    with startup_phase("consume"):
+        consumed_vos_dict = default_servient.config.get("consumedVOs", {})
+        consumed_vos = await consume_vos(consumed_vos_dict, wot, credentials_dict)
+        if is_leader:
+            await subscribe_remote_events(consumed_vos, consumed_vos_dict, module)
+
+        proxy_data = default_servient.config.get("proxy", {})
+        create_proxy_functions(consumed_vos, proxy_data, exposed_thing, is_leader=is_leader)
+
+    with startup_phase("imports"):
+        generic_function_data = default_servient.config.get("genericFunction", [])
+        inject_generic_function(generic_function_data, module)
+
+    with startup_phase("TD build"):
+        if default_servient.config["bindingNB"]["netconf"]["enabled"]:
+            inject_netconf_properties(
+                exposed_thing,
+                default_servient.config["bindingNB"]["netconf"]["schedulerURL"],
+                default_servient.config["bindingNB"]["netconf"]["netconfServerURL"]
+            )
 
-    if default_servient.config["bindingNB"]["netconf"]["enabled"]:
-        inject_netconf_properties(
-            exposed_thing,
-            default_servient.config["bindingNB"]["netconf"]["schedulerURL"],
-            default_servient.config["bindingNB"]["netconf"]["netconfServerURL"]
-        )
+        # Make instances available to user-defined code
+        module.exposed_thing = exposed_thing
+        module.consumed_vos = consumed_vos
 
-    # Make instances available to user-defined code
-    module.exposed_thing = exposed_thing
-    module.consumed_vos = consumed_vos
+        await map_user_defined_code(TD, exposed_thing, module, is_leader=is_leader)
 
-    await map_user_defined_code(TD, exposed_thing, module)
+        exposed_thing.expose()
 
-    exposed_thing.expose()
+    if is_leader:
+        periodic_function_data = default_servient.config.get("periodicFunction", {})
+        schedule_periodic_functions(periodic_function_data, module)
 
-    periodic_function_data = default_servient.config.get("periodicFunction", {})
-    schedule_periodic_functions(periodic_function_data, module)
+    profiler = disable_startup_profiler()
+    if profiler is not None:
+        logging.getLogger(__name__).info(
+            "Startup profile (worker %s):\n%s", worker_id or 0, profiler.report())
 
 
 def setup_logging():
@@ -290,10 +356,36 @@ def main():
     parser.add_argument("script", help="user python script file")
     parser.add_argument("-f", "--config-file", help="path to the configuration file")
     parser.add_argument("-t", "--thing-description", help="path to the thing description")
+    parser.add_argument("-w", "--workers", type=int,
+                        help="number of worker processes (overrides the workers of the config file)")
+    parser.add_argument("--loop", choices=EventLoopPolicies.list(),
+                        help="event loop implementation (overrides the eventLoop policy of the config file)")
+    parser.add_argument("--executor-size", type=int,
+                        help="number of threads of the default executor of the event loop")
+    parser.add_argument("--slow-callback-duration", type=float,
+                        help="log the callbacks that block the event loop for longer than this (ms)")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="log the time and memory of each startup phase")
     args = parser.parse_args()
 
-    loop = asyncio.get_event_loop()
-    loop.create_task(run_script(args.thing_description, args.script, args.config_file))
+    config = load_config(args.config_file)
+    workers = args.workers or int(config.get("workers", 1))
+    worker_id = None
+    if workers > 1:
+        # The parent process supervises the workers and never returns from here
+        worker_id = fork_processes(workers)
+
+    if args.profile_startup:
+        # The time spent importing the runtime before main() is reported too
+        enable_startup_profiler(started=wotpy.IMPORT_STARTED)
+
+    # The loop is configured before the Servient is built in run_script
+    loop = setup_event_loop(
+        config, policy=args.loop, executor_size=args.executor_size,
+        slow_callback_duration=args.slow_callback_duration)
+    loop.create_task(run_script(
+        args.thing_description, args.script, args.config_file,
+        workers=workers, worker_id=worker_id))
     loop.run_forever()
 
 
@@ -0,0 +1,57 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Enumeration classes related to the databases.
+"""
+
+from wotpy.utils.enums import EnumListMixin
+
+
+class InfluxDBWriteMode(EnumListMixin):
+    """Enumeration of the modes used to write points to InfluxDB."""
+
+    SYNC = "sync"
+    BATCH = "batch"
+
+
+class BackpressurePolicy(EnumListMixin):
+    """Enumeration of the policies applied when the
+    in-memory queue of the batch writer is full."""
+
+    BLOCK = "block"
+    DROP_OLDEST = "drop-oldest"
+    DROP_NEWEST = "drop-newest"
+
+
+class InfluxDBLayout(EnumListMixin):
+    """Enumeration of the layouts used to store points in InfluxDB."""
+
+    BUCKET_PER_KEY = "bucket-per-key"
+    BUCKET_PER_VO = "bucket-per-vo"
+
+
+class QueryOutputFormat(EnumListMixin):
+    """Enumeration of the formats of columnar query results."""
+
+    NUMPY = "numpy"
+    ARROW = "arrow"
+
+
+class SQLiteJournalMode(EnumListMixin):
+    """Enumeration of the journal modes of the SQLite database."""
+
+    WAL = "WAL"
+    DELETE = "DELETE"
+    TRUNCATE = "TRUNCATE"
+    PERSIST = "PERSIST"
+    MEMORY = "MEMORY"
+
+
+class SQLiteSynchronous(EnumListMixin):
+    """Enumeration of the synchronous levels of the SQLite database."""
+
+    OFF = "OFF"
+    NORMAL = "NORMAL"
+    FULL = "FULL"
+    EXTRA = "EXTRA"
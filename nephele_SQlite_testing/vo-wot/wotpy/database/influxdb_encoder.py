@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Functions that encode property values as typed InfluxDB point fields.
+"""
+
+import collections.abc
+import json
+import logging
+import math
+
+DEFAULT_FIELD = "value"
+FIELD_SEPARATOR = "."
+
+_logr = logging.getLogger(__name__)
+
+
+def _join_key(parent_key, key):
+    """Returns the field name of a nested key."""
+
+    return "{}{}{}".format(parent_key, FIELD_SEPARATOR, key) if parent_key else str(key)
+
+
+def _to_python(value):
+    """Converts NumPy arrays and scalars to the equivalent Python objects."""
+
+    if hasattr(value, "tolist") and not isinstance(value, str):
+        return value.tolist()
+
+    return value
+
+
+def _sub_schema(schema, key):
+    """Returns the data schema of a dict key or an array index of the given schema."""
+
+    if not isinstance(schema, collections.abc.Mapping):
+        return None
+
+    if isinstance(key, int):
+        items = schema.get("items")
+
+        if isinstance(items, list):
+            return items[key] if key < len(items) else None
+
+        return items
+
+    return (schema.get("properties") or {}).get(key)
+
+
+def _encode(value, key, fields, schema):
+    """Recursively adds the fields of the given value to the fields dict."""
+
+    if value is None or isinstance(value, (bytes, bytearray)):
+        return
+
+    value = _to_python(value)
+
+    if isinstance(value, bool):
+        fields[key] = value
+    elif isinstance(value, int):
+        is_number = isinstance(schema, collections.abc.Mapping) and schema.get("type") == "number"
+        fields[key] = float(value) if is_number else value
+    elif isinstance(value, float):
+        # Line protocol has no representation for NaN or infinity
+        if math.isfinite(value):
+            fields[key] = value
+    elif isinstance(value, str):
+        fields[key] = value
+    elif isinstance(value, (collections.abc.Mapping, list, tuple)) and not value:
+        _logr.warning("Empty value of field %s is not written to InfluxDB", key or DEFAULT_FIELD)
+    elif isinstance(value, collections.abc.Mapping):
+        for sub_key, sub_value in value.items():
+            _encode(sub_value, _join_key(key, sub_key), fields, _sub_schema(schema, sub_key))
+    elif isinstance(value, (list, tuple)):
+        for idx, item in enumerate(value):
+            _encode(item, _join_key(key, idx), fields, _sub_schema(schema, idx))
+    else:
+        fields[key] = json.dumps(value, default=str)
+
+
+def encode_fields(value, schema=None):
+    """Encodes a property value as a dict of typed point fields in a single pass.
+    Nested dicts are flattened into dot-separated field names, lists, tuples and
+    NumPy arrays are expanded into indexed fields and other values are stored in
+    the "value" field. Booleans, strings and integers keep their type. Integers
+    are stored as floats where the TD data schema declares a number, so that a
+    field that receives both 90 and 90.5 never changes its type (which InfluxDB
+    rejects)."""
+
+    fields = {}
+
+    if isinstance(value, collections.abc.Mapping):
+        _encode(value, "", fields, schema)
+    else:
+        _encode(value, DEFAULT_FIELD, fields, schema)
+
+    return fields
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Class that keeps InfluxDB points in a local file while the database is unreachable.
+"""
+
+import json
+import logging
+import os
+import threading
+
+
+class InfluxDBSpool:
+    """Append-only file of points in line protocol waiting to be written to InfluxDB.
+    Every entry is a JSON document in its own line that is flushed and synced to disk
+    before returning, so entries survive a crash of the VO. Incomplete lines left by
+    an interrupted write are skipped when replaying. Points are replayed from a
+    separate file so that new entries can be appended while the replay is running."""
+
+    DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+    def __init__(self, path, max_size=None):
+        self._path = path
+        self._replay_path = "{}.replay".format(path)
+        self._rejected_path = "{}.rejected".format(path)
+        self._max_size = int(max_size or self.DEFAULT_MAX_SIZE)
+        self._lock = threading.Lock()
+        self._logr = logging.getLogger(__name__)
+
+        self._stats = {
+            "spooled": 0,
+            "replayed": 0,
+            "dropped": 0
+        }
+
+    @property
+    def path(self):
+        """Path of the spool file."""
+
+        return self._path
+
+    @property
+    def rejected_path(self):
+        """Path of the file that keeps the points rejected by the database."""
+
+        return self._rejected_path
+
+    @property
+    def stats(self):
+        """Returns a dict with the counters of spooled, replayed and dropped points."""
+
+        return dict(self._stats)
+
+    @property
+    def size(self):
+        """Returns the size in bytes of the pending entries."""
+
+        return sum(
+            os.path.getsize(path)
+            for path in (self._path, self._replay_path)
+            if os.path.exists(path))
+
+    @property
+    def is_empty(self):
+        """Returns True if there are no entries waiting to be replayed."""
+
+        return self.size == 0
+
+    def append(self, bucket, lines):
+        """Appends the given points in line protocol for the given bucket. Points
+        that do not fit in the spool (including the file being replayed) are dropped."""
+
+        data = "".join(
+            json.dumps({"bucket": bucket, "line": line}) + "\n"
+            for line in lines).encode("utf-8")
+
+        with self._lock:
+            if self.size + len(data) > self._max_size:
+                self._stats["dropped"] += len(lines)
+                self._logr.warning("InfluxDB spool is full: dropping %s points", len(lines))
+                return
+
+            with open(self._path, "ab") as spool_file:
+                spool_file.write(data)
+                spool_file.flush()
+                os.fsync(spool_file.fileno())
+
+            self._stats["spooled"] += len(lines)
+
+    def quarantine(self, bucket, lines):
+        """Moves points rejected by the database (e.g. malformed line protocol or
+        field type conflicts) to the rejected file so that they are not replayed again."""
+
+        data = "".join(
+            json.dumps({"bucket": bucket, "line": line}) + "\n"
+            for line in lines).encode("utf-8")
+
+        with self._lock:
+            with open(self._rejected_path, "ab") as rejected_file:
+                rejected_file.write(data)
+
+            self._stats["dropped"] += len(lines)
+
+        self._logr.warning("InfluxDB rejected %s spooled points: moved to %s", len(lines), self._rejected_path)
+
+    def _read_batches(self, batch_size):
+        """Yields lists of (bucket, line) tuples read from the replay file."""
+
+        batch = []
+
+        with open(self._replay_path, "rb") as replay_file:
+            for raw_line in replay_file:
+                try:
+                    entry = json.loads(raw_line.decode("utf-8"))
+                    batch.append((entry["bucket"], entry["line"]))
+                except (ValueError, KeyError, TypeError):
+                    self._logr.warning("Skipping corrupt InfluxDB spool entry")
+                    continue
+
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+
+        if batch:
+            yield batch
+
+    def replay(self, write_batch, batch_size):
+        """Calls write_batch with lists of (bucket, line) tuples until all entries
+        are replayed. Exceptions raised by write_batch are propagated and the
+        entries are kept so that the replay can be retried later."""
+
+        with self._lock:
+            if not os.path.exists(self._replay_path):
+                if not os.path.exists(self._path):
+                    return
+                os.replace(self._path, self._replay_path)
+
+        for batch in self._read_batches(batch_size):
+            write_batch(batch)
+            self._stats["replayed"] += len(batch)
+
+        os.remove(self._replay_path)
@@ -5,6 +5,7 @@
 Class that represents the abstract client interface.
 """
 
+import asyncio
 from abc import ABCMeta, abstractmethod
 
 
@@ -53,6 +54,41 @@ class BaseProtocolClient(metaclass=ABCMeta):
 
         raise NotImplementedError()
 
+    def is_supported_thing_operation(self, td, op):
+        """Returns True if any of the Thing-level Forms for the given operation
+        (e.g. readallproperties) is supported in this Protocol Binding client."""
+
+        return False
+
+    async def read_multiple_properties(self, td, names, timeout=None):
+        """Reads the values of the given Properties on a remote Thing.
+        This default implementation sends one request per Property.
+        Returns a dict of values indexed by Property name."""
+
+        values = await asyncio.gather(*[
+            self.read_property(td, name, timeout=timeout)
+            for name in names
+        ])
+
+        return dict(zip(names, values))
+
+    async def read_all_properties(self, td, timeout=None):
+        """Reads the values of all the readable Properties on a remote Thing.
+        Returns a dict of values indexed by Property name."""
+
+        names = [name for name, prop in td.properties.items() if not prop.write_only]
+
+        return await self.read_multiple_properties(td, names, timeout=timeout)
+
+    async def write_multiple_properties(self, td, values, timeout=None):
+        """Updates the values of the Properties in the given dict on a remote Thing.
+        This default implementation sends one request per Property."""
+
+        await asyncio.gather(*[
+            self.write_property(td, name, value, timeout=timeout)
+            for name, value in values.items()
+        ])
+
     @abstractmethod
     def on_event(self, td, name):
         """Subscribes to an event on a remote Thing.
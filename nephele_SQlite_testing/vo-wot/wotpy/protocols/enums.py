@@ -28,3 +28,6 @@ class InteractionVerbs(EnumListMixin):
     INVOKE_ACTION = "invokeaction"
     SUBSCRIBE_EVENT = "subscribeevent"
     UNSUBSCRIBE_EVENT = "unsubscribeevent"
+    READ_ALL_PROPERTIES = "readallproperties"
+    READ_MULTIPLE_PROPERTIES = "readmultipleproperties"
+    WRITE_MULTIPLE_PROPERTIES = "writemultipleproperties"
@@ -8,6 +8,7 @@ Request handler for Action interactions.
 from tornado.web import RequestHandler
 
 import wotpy.protocols.http.handlers.utils as handler_utils
+from wotpy.wot.enums import InteractionTypes
 
 
 # noinspection PyAbstractClass,PyAttributeOutsideInit
@@ -21,14 +22,15 @@ class ActionInvokeHandler(RequestHandler):
     async def post(self, thing_name, name):
         """Invokes the action and returns the invocation result."""
 
-        exposed_thing = handler_utils.get_exposed_thing(self._server, thing_name)
+        route = handler_utils.get_route(self._server, thing_name, name, InteractionTypes.ACTION)
+        exposed_thing = route.exposed_thing
         valid_creds = await self._server._check_credentials(exposed_thing.title, self.request)
         if not valid_creds:
             handler_utils.request_auth(self, self._server.security_scheme, thing_name)
         else:
             input_value = handler_utils.get_argument(self, "input")
             try:
-                result = await exposed_thing.actions[name].invoke(input_value)
+                result = await exposed_thing.actions[route.name].invoke(input_value)
                 self.write({"result": result})
             except Exception as ex:
                 self.write({"error": str(ex)})
@@ -25,8 +25,15 @@ class PropertyMQTTHandler(BaseMQTTHandler):
     KEY_ACTION = "action"
     KEY_VALUE = "value"
     KEY_ACK = "ack"
+    KEY_ID = "id"
+    KEY_NAMES = "names"
+    KEY_VALUES = "values"
+    KEY_ERROR = "error"
     ACTION_READ = "read"
     ACTION_WRITE = "write"
+    ACTION_READ_ALL = "readall"
+    ACTION_READ_MULTIPLE = "readmultiple"
+    ACTION_WRITE_MULTIPLE = "writemultiple"
     DEFAULT_CALLBACK_MS = 2000
     DEFAULT_JITTER = 0.2
 
@@ -72,6 +79,15 @@ class PropertyMQTTHandler(BaseMQTTHandler):
             thing_name,
             prop_name)
 
+    @classmethod
+    def to_responses_topic(cls, requests_topic):
+        """Takes a multiple Properties requests topic and returns the related responses topic."""
+
+        topic_split = requests_topic.split("/")
+        servient_id, thing_name = topic_split[-4], topic_split[-1]
+
+        return "{}/property/responses/{}".format(servient_id, thing_name)
+
     @property
     def topics(self):
         """List of topics that this MQTT handler wants to subscribe to."""
@@ -88,29 +104,30 @@ class PropertyMQTTHandler(BaseMQTTHandler):
 
         action = parsed_msg.get(self.KEY_ACTION, False)
 
-        if not action or action not in [self.ACTION_WRITE, self.ACTION_READ]:
-            return
-
         topic_split = msg.topic.split("/")
 
         splits_expected_len = len(self.topic_wildcard_requests.split("/")) + 1
 
+        if len(topic_split) == splits_expected_len - 1:
+            await self.handle_multiple_message(msg.topic, topic_split[-1], action, parsed_msg)
+            return
+
+        if not action or action not in [self.ACTION_WRITE, self.ACTION_READ]:
+            return
+
         if len(topic_split) != splits_expected_len:
             return
 
         thing_url_name, prop_url_name = topic_split[-2], topic_split[-1]
 
-        try:
-            exp_thing = next(
-                item for item in self.mqtt_server.exposed_things
-                if item.url_name == thing_url_name)
-
-            prop = next(
-                exp_thing.thing.properties[key] for key in exp_thing.thing.properties
-                if exp_thing.thing.properties[key].url_name == prop_url_name)
-        except StopIteration:
+        route = self.mqtt_server.routing_registry.resolve(
+            thing_url_name, prop_url_name, InteractionTypes.PROPERTY)
+
+        if not route:
             return
 
+        exp_thing, prop = route.exposed_thing, route.interaction
+
         if action == self.ACTION_READ:
             value = await exp_thing.properties[prop.name].read()
             topic = self.build_property_updates_topic(exp_thing.thing, prop)
@@ -120,6 +137,40 @@ class PropertyMQTTHandler(BaseMQTTHandler):
             await exp_thing.handle_write_property(prop.name, parsed_msg[self.KEY_VALUE])
             await self.publish_write_ack(msg)
 
+    async def handle_multiple_message(self, topic, thing_url_name, action, parsed_msg):
+        """Responds to requests to read or write multiple Properties at once.
+        The response is published in the responses topic of the Thing
+        with the ID of the request and either the values or an error."""
+
+        if action not in [self.ACTION_READ_ALL, self.ACTION_READ_MULTIPLE, self.ACTION_WRITE_MULTIPLE]:
+            return
+
+        exp_thing = self.mqtt_server.routing_registry.find_thing(thing_url_name)
+
+        if not exp_thing:
+            return
+
+        response = {self.KEY_ID: parsed_msg.get(self.KEY_ID)}
+
+        try:
+            if action == self.ACTION_READ_ALL:
+                values = await exp_thing.read_all_properties()
+            elif action == self.ACTION_READ_MULTIPLE:
+                values = await exp_thing.read_multiple_properties(parsed_msg.get(self.KEY_NAMES, []))
+            else:
+                values = None
+                await exp_thing.handle_write_multiple_properties(parsed_msg.get(self.KEY_VALUES, {}))
+
+            response[self.KEY_VALUES] = to_json_obj(values)
+        except Exception as ex:
+            response[self.KEY_ERROR] = str(ex)
+
+        await self.queue.put({
+            "topic": self.to_responses_topic(topic),
+            "data": json.dumps(response).encode(),
+            "qos": self._qos_rw
+        })
+
     async def publish_write_ack(self, msg):
         """Takes a Property write request message and publishes the related write ACK message."""
 
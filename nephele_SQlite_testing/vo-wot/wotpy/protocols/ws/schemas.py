@@ -137,6 +137,39 @@ SCHEMA_PARAMS_WRITE_PROPERTY = {
     ]
 }
 
+SCHEMA_PARAMS_READ_ALL_PROPERTIES = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "id": "http://fundacionctic.org/schemas/wotpy-ws-params-read-all-properties.json",
+    "type": "object"
+}
+
+SCHEMA_PARAMS_READ_MULTIPLE_PROPERTIES = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "id": "http://fundacionctic.org/schemas/wotpy-ws-params-read-multiple-properties.json",
+    "type": "object",
+    "properties": {
+        "names": {
+            "type": "array",
+            "items": {"type": "string"}
+        }
+    },
+    "required": [
+        "names"
+    ]
+}
+
+SCHEMA_PARAMS_WRITE_MULTIPLE_PROPERTIES = {
+    "$schema": "https://json-schema.org/draft/2020-12/schema",
+    "id": "http://fundacionctic.org/schemas/wotpy-ws-params-write-multiple-properties.json",
+    "type": "object",
+    "properties": {
+        "values": {"type": "object"}
+    },
+    "required": [
+        "values"
+    ]
+}
+
 SCHEMA_PARAMS_INVOKE_ACTION = {
     "$schema": "https://json-schema.org/draft/2020-12/schema",
     "id": "http://fundacionctic.org/schemas/wotpy-ws-params-invoke-action.json",
@@ -8,6 +8,8 @@ Utility functions and classes.
     :toctree: _utils
 
     wotpy.utils.enums
+    wotpy.utils.event_loop
+    wotpy.utils.profiling
     wotpy.utils.proxy
     wotpy.utils.utils
 """
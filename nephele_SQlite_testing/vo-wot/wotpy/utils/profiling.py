@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Classes and functions to profile the startup of the WoT runtime.
+"""
+
+import contextlib
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def current_rss():
+    """Returns the resident set size of the process in bytes (the peak resident
+    set size if the current one is not available, None on unsupported platforms)."""
+
+    if resource is None:
+        return None
+
+    try:
+        with open("/proc/self/statm", "r") as statm:
+            return int(statm.read().split()[1]) * resource.getpagesize()
+    except (OSError, IndexError, ValueError):
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class StartupProfiler:
+    """Records the time and the memory growth (resident set size) of the phases
+    of the startup. Phases may be nested: the time of a nested phase is not
+    charged to the enclosing one. Phases with the same name are added up.
+    If started (a time.perf_counter() value) is given, the time elapsed
+    since then is recorded as the first phase with the given name."""
+
+    def __init__(self, started=None, started_phase="module imports"):
+        now, rss = time.perf_counter(), current_rss()
+
+        self._started = now if started is None else started
+        self._stack = []
+        self._phases = {}
+        self._mark = (now, rss)
+
+        if started is not None:
+            # The memory of the first phase is the resident set size of the process so far
+            self._phases[started_phase] = {"time": now - started, "memory": rss or 0}
+
+    def _charge(self):
+        """Charges the time and memory since the last mark to the current phase."""
+
+        now, rss = time.perf_counter(), current_rss()
+        last_time, last_rss = self._mark
+        self._mark = (now, rss)
+
+        if not self._stack:
+            return
+
+        phase = self._phases[self._stack[-1]]
+        phase["time"] += now - last_time
+
+        if rss is not None and last_rss is not None:
+            phase["memory"] += rss - last_rss
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Context manager that records the code it runs as the given phase."""
+
+        self._charge()
+        self._phases.setdefault(name, {"time": 0.0, "memory": 0})
+        self._stack.append(name)
+
+        try:
+            yield
+        finally:
+            self._charge()
+            self._stack.pop()
+
+    @property
+    def phases(self):
+        """Returns a dict with the time (in seconds) and memory
+        growth (in bytes) of each phase in order of appearance."""
+
+        return {name: dict(phase) for name, phase in self._phases.items()}
+
+    def report(self):
+        """Returns a text table with the time and memory of each phase."""
+
+        lines = ["{:<16}{:>12}{:>14}".format("Phase", "Time (ms)", "Memory (MiB)")]
+
+        for name, phase in self._phases.items():
+            lines.append("{:<16}{:>12.1f}{:>14.1f}".format(
+                name, phase["time"] * 1000, phase["memory"] / 1048576.0))
+
+        rss = current_rss()
+        total = time.perf_counter() - self._started
+
+        lines.append("{:<16}{:>12.1f}{:>14}".format(
+            "total", total * 1000, "{:.1f}".format(rss / 1048576.0) if rss is not None else "-"))
+
+        return "\n".join(lines)
+
+
+_profiler = None
+
+
+def enable_startup_profiler(started=None):
+    """Starts recording the startup phases and returns the StartupProfiler.
+    The time since started (a time.perf_counter() value) is recorded as
+    the "module imports" phase if given."""
+
+    global _profiler
+    _profiler = StartupProfiler(started=started)
+
+    return _profiler
+
+
+def disable_startup_profiler():
+    """Stops recording the startup phases and returns the StartupProfiler (None if disabled)."""
+
+    global _profiler
+    profiler, _profiler = _profiler, None
+
+    return profiler
+
+
+@contextlib.contextmanager
+def startup_phase(name):
+    """Context manager that records the code it runs as the given startup
+    phase if the startup profiler is enabled (does nothing otherwise)."""
+
+    if _profiler is None:
+        yield
+        return
+
+    with _profiler.phase(name):
+        yield
@@ -0,0 +1,388 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Classes that share the state of the ExposedThings between the worker processes of a servient.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import struct
+import tempfile
+
+from wotpy.utils.enums import EnumListMixin
+from wotpy.utils.utils import to_json_obj
+
+
+class ClusterMessageTypes(EnumListMixin):
+    """Enumeration of the messages exchanged by the workers of a cluster."""
+
+    READ = "read"
+    WRITE = "write"
+    INVOKE = "invoke"
+    EMIT = "emit"
+    SNAPSHOT = "snapshot"
+    VALUE = "value"
+    CHANGE = "change"
+    EVENT = "event"
+    INVOCATION = "invocation"
+    REPLY = "reply"
+
+
+class ClusterException(Exception):
+    """Exception raised when an operation forwarded to the leader worker fails."""
+
+    pass
+
+
+def default_socket_path(name, port=None):
+    """Returns the default path of the Unix socket of the leader worker of a cluster."""
+
+    suffix = "-{}".format(port) if port else ""
+
+    return os.path.join(tempfile.gettempdir(), "wotpy-{}{}.sock".format(name, suffix))
+
+
+class ServientCluster:
+    """Connects the worker processes that serve the same ExposedThings.
+    The leader worker runs a hub on a Unix socket that the other workers connect to.
+    Followers forward to the leader the operations that may have side effects
+    (Property writes, Property reads with a custom handler, Action invocations
+    and Event emissions) and receive the Property values, Property changes,
+    Action invocations and Events published by the leader."""
+
+    LEADER_ID = 0
+    HEADER = struct.Struct("!I")
+
+    def __init__(self, worker_id, socket_path, connect_timeout=30, min_backoff=0.1, max_backoff=5.0,
+                 request_timeout=60, max_buffer_size=16 * 1024 * 1024):
+        self._worker_id = worker_id
+        self._socket_path = socket_path
+        self._connect_timeout = connect_timeout
+        self._request_timeout = request_timeout
+        self._max_buffer_size = max_buffer_size
+        self._min_backoff = min_backoff
+        self._max_backoff = max_backoff
+        self._servient = None
+        self._hub = None
+        self._followers = set()
+        self._reader = None
+        self._writer = None
+        self._pending = {}
+        self._tasks = set()
+        self._msg_ids = itertools.count()
+        self._logr = logging.getLogger(__name__)
+
+    @property
+    def worker_id(self):
+        """Returns the ID of this worker (0 for the leader)."""
+
+        return self._worker_id
+
+    @property
+    def is_leader(self):
+        """Returns True if this worker runs the handlers with side effects."""
+
+        return self._worker_id == self.LEADER_ID
+
+    @property
+    def socket_path(self):
+        """Returns the path of the Unix socket of the leader worker."""
+
+        return self._socket_path
+
+    @property
+    def followers(self):
+        """Returns the number of followers connected to this worker."""
+
+        return len(self._followers)
+
+    @classmethod
+    def _encode(cls, message):
+        """Serializes a message to a JSON document prefixed by its length."""
+
+        data = json.dumps(to_json_obj(message)).encode()
+
+        return cls.HEADER.pack(len(data)) + data
+
+    @classmethod
+    async def _read_message(cls, reader):
+        """Reads a length-prefixed message. Returns None if the stream is closed."""
+
+        try:
+            header = await reader.readexactly(cls.HEADER.size)
+            data = await reader.readexactly(cls.HEADER.unpack(header)[0])
+        except asyncio.IncompleteReadError:
+            return None
+
+        return json.loads(data)
+
+    def _spawn(self, coro):
+        """Runs the given coroutine in a task that is kept until it finishes."""
+
+        task = asyncio.ensure_future(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def start(self, servient):
+        """Starts the hub on the leader or connects a follower to the leader.
+        Followers wait for the leader hub for up to connect_timeout seconds."""
+
+        self._servient = servient
+
+        if self.is_leader:
+            if os.path.exists(self._socket_path):
+                os.unlink(self._socket_path)
+
+            self._hub = await asyncio.start_unix_server(self._serve_follower, path=self._socket_path)
+            return
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._connect_timeout
+
+        while True:
+            try:
+                await self._connect_leader()
+                break
+            except OSError:
+                if loop.time() >= deadline:
+                    raise ClusterException("Leader worker unreachable on: {}".format(self._socket_path))
+
+                await asyncio.sleep(0.1)
+
+        self._spawn(self._follow_leader())
+
+    async def _connect_leader(self):
+        """Opens the connection to the leader and asks for the current Property values."""
+
+        self._reader, self._writer = await asyncio.open_unix_connection(self._socket_path)
+
+        for exposed_thing in self._servient.exposed_things:
+            self.request_snapshot(exposed_thing)
+
+    def _close_leader(self):
+        """Closes the connection to the leader and fails the pending requests."""
+
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ClusterException("Connection to the leader worker lost"))
+
+        self._pending.clear()
+
+    async def _follow_leader(self):
+        """Receives the messages of the leader and reconnects with an exponential
+        backoff when the connection is lost (e.g. the leader process is restarted)."""
+
+        while True:
+            await self._read_leader()
+            self._close_leader()
+            self._logr.warning("Connection to the leader worker closed: reconnecting")
+
+            backoff = self._min_backoff
+
+            while True:
+                await asyncio.sleep(backoff)
+
+                try:
+                    await self._connect_leader()
+                    break
+                except OSError:
+                    backoff = min(backoff * 2, self._max_backoff)
+
+            self._logr.info("Reconnected to the leader worker")
+
+    async def stop(self):
+        """Stops the hub or closes the connection to the leader."""
+
+        for task in list(self._tasks):
+            task.cancel()
+
+        if self._hub is not None:
+            self._hub.close()
+
+            for writer in list(self._followers):
+                writer.close()
+
+            await self._hub.wait_closed()
+            self._hub = None
+
+            if os.path.exists(self._socket_path):
+                os.unlink(self._socket_path)
+
+        self._close_leader()
+
+    async def _serve_follower(self, reader, writer):
+        """Handles the requests of a follower connected to the hub."""
+
+        self._followers.add(writer)
+
+        try:
+            while True:
+                message = await self._read_message(reader)
+
+                if message is None:
+                    break
+
+                self._spawn(self._handle_request(writer, message))
+        except (ConnectionError, ValueError) as ex:
+            self._logr.warning("Closing the connection of a follower worker: {}".format(ex))
+        finally:
+            self._followers.discard(writer)
+            writer.close()
+
+    async def _handle_request(self, writer, message):
+        """Runs an operation forwarded by a follower and replies with its result."""
+
+        reply = {"type": ClusterMessageTypes.REPLY, "id": message.get("id")}
+
+        try:
+            reply["value"] = await self._execute(writer, message)
+        except Exception as ex:
+            reply["error"] = "{}: {}".format(ex.__class__.__name__, ex)
+
+        if reply["id"] is not None and not writer.is_closing():
+            writer.write(self._encode(reply))
+
+    async def _execute(self, writer, message):
+        """Runs an operation on the ExposedThing of the leader."""
+
+        exposed_thing = self._servient.get_exposed_thing(message["thing"])
+        msg_type = message["type"]
+        name = message.get("name")
+        value = message.get("value")
+
+        if msg_type == ClusterMessageTypes.READ:
+            return await exposed_thing.read_property(name)
+
+        if msg_type == ClusterMessageTypes.WRITE:
+            await exposed_thing.write_property(name, value)
+            return None
+
+        if msg_type == ClusterMessageTypes.INVOKE:
+            return await exposed_thing.invoke_action(name, value)
+
+        if msg_type == ClusterMessageTypes.EMIT:
+            exposed_thing.emit_event(name, value)
+            return None
+
+        if msg_type == ClusterMessageTypes.SNAPSHOT:
+            for prop_name in exposed_thing.thing.properties:
+                prop_value = exposed_thing.property_store.read(prop_name)
+
+                if prop_value is not None:
+                    writer.write(self._encode(self._message(
+                        ClusterMessageTypes.VALUE, exposed_thing, prop_name, prop_value)))
+
+            return None
+
+        raise ValueError("Unknown cluster message type: {}".format(msg_type))
+
+    async def _read_leader(self):
+        """Receives the replies and the messages published by the leader
+        until the connection is closed."""
+
+        try:
+            while True:
+                message = await self._read_message(self._reader)
+
+                if message is None:
+                    break
+
+                if message["type"] == ClusterMessageTypes.REPLY:
+                    self._resolve(message)
+                    continue
+
+                exposed_thing = self._servient.exposed_thing_set.find_by_thing_name(message["thing"])
+
+                if exposed_thing is not None:
+                    exposed_thing.apply_cluster_message(message["type"], message["name"], message.get("value"))
+        except (ConnectionError, ValueError) as ex:
+            self._logr.warning("Error reading from the leader worker: {}".format(ex))
+
+    def _resolve(self, reply):
+        """Resolves the pending request of the given reply."""
+
+        future = self._pending.pop(reply["id"], None)
+
+        if future is None or future.done():
+            return
+
+        if "error" in reply:
+            future.set_exception(ClusterException(reply["error"]))
+        else:
+            future.set_result(reply.get("value"))
+
+    @classmethod
+    def _message(cls, msg_type, exposed_thing, name, value=None):
+        """Builds a message about an Interaction of an ExposedThing."""
+
+        return {"type": msg_type, "thing": exposed_thing.title, "name": name, "value": value}
+
+    def _send_leader(self, message):
+        """Sends a message to the leader. Raises ClusterException if disconnected."""
+
+        if self._writer is None or self._writer.is_closing():
+            raise ClusterException("Not connected to the leader worker")
+
+        self._writer.write(self._encode(message))
+
+    async def forward(self, msg_type, exposed_thing, name, value=None):
+        """Runs an operation on the leader worker and returns its result.
+        Raises ClusterException if the leader does not reply in request_timeout seconds."""
+
+        msg_id = next(self._msg_ids)
+        message = self._message(msg_type, exposed_thing, name, value)
+        message["id"] = msg_id
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[msg_id] = future
+
+        try:
+            self._send_leader(message)
+            return await asyncio.wait_for(future, self._request_timeout)
+        except asyncio.TimeoutError:
+            raise ClusterException("Timeout waiting for the leader worker")
+        finally:
+            self._pending.pop(msg_id, None)
+
+    def notify(self, msg_type, exposed_thing, name, value=None):
+        """Sends an operation to the leader worker without waiting for its result."""
+
+        self._send_leader(self._message(msg_type, exposed_thing, name, value))
+
+    def request_snapshot(self, exposed_thing):
+        """Asks the leader for the current Property values of the given ExposedThing."""
+
+        if self.is_leader or self._writer is None:
+            return
+
+        self.notify(ClusterMessageTypes.SNAPSHOT, exposed_thing, None)
+
+    def broadcast(self, msg_type, exposed_thing, name, value=None):
+        """Publishes a message of the leader to all the followers. Followers that
+        do not keep up (more than max_buffer_size bytes waiting to be sent) are
+        disconnected, they reconnect and ask for a new snapshot of the values."""
+
+        if not self._followers:
+            return
+
+        data = self._encode(self._message(msg_type, exposed_thing, name, value))
+
+        for writer in list(self._followers):
+            if writer.is_closing():
+                continue
+
+            if writer.transport.get_write_buffer_size() > self._max_buffer_size:
+                self._logr.warning("Disconnecting a follower worker that does not keep up with the leader")
+                self._followers.discard(writer)
+                writer.close()
+                continue
+
+            writer.write(data)
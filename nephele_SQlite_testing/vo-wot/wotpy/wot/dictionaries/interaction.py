@@ -49,9 +49,12 @@ class InteractionFragmentDict(WotBaseDict):
 class PropertyFragmentDict(InteractionFragmentDict):
     """A dictionary wrapper class that contains data to initialize a Property."""
 
+    __slots__ = ("_data_schema",)
+
     class Meta:
         fields = InteractionFragmentDict.Meta.fields.union({
-            "observable"
+            "observable",
+            "changePolicy"
         })
 
     def __init__(self, *args, **kwargs):
@@ -67,10 +70,10 @@ class PropertyFragmentDict(InteractionFragmentDict):
         except AttributeError:
             return getattr(self.data_schema, name)
 
-    def to_dict(self):
-        """Returns the pure dict (JSON-serializable) representation of this WoT dictionary."""
+    def _build_dict(self):
+        """Builds the pure dict representation of this WoT dictionary."""
 
-        ret = super().to_dict()
+        ret = super()._build_dict()
         ret.update(self.data_schema.to_dict())
 
         return ret
@@ -119,7 +122,8 @@ class ActionFragmentDict(InteractionFragmentDict):
             "output",
             "safe",
             "idempotent",
-            "synchronous"
+            "synchronous",
+            "executionPolicy"
         })
 
         defaults = {
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Classes that decide which Property writes of an ExposedThing are published as changes.
+"""
+
+from wotpy.utils.utils import to_camel
+
+
+class PropertyChangePolicy:
+    """Policy that defines which writes of a Property are significant enough
+    to emit a change event and to be written in the time-series database.
+    Numeric values can be filtered with an absolute or relative deadband,
+    and any value can be suppressed if it is equal to the last published one.
+    Intervals (in milliseconds) limit how often changes are published and
+    force a publication when no change has been published for too long."""
+
+    FIELDS = ("deadband", "relative_deadband", "suppress_equal", "min_interval", "max_interval")
+
+    def __init__(self, deadband=None, relative_deadband=None, suppress_equal=False,
+                 min_interval=None, max_interval=None):
+        for name, val in (("deadband", deadband), ("relative_deadband", relative_deadband),
+                          ("min_interval", min_interval), ("max_interval", max_interval)):
+            if val is not None and val < 0:
+                raise ValueError("Invalid change policy {}: {}".format(name, val))
+
+        if min_interval and max_interval and max_interval < min_interval:
+            raise ValueError("The maximum interval must not be lower than the minimum interval")
+
+        self.deadband = deadband
+        self.relative_deadband = relative_deadband
+        self.suppress_equal = bool(suppress_equal)
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+
+    @classmethod
+    def build(cls, policy):
+        """Builds a PropertyChangePolicy from a dict with camelCase or snake_case keys
+        (e.g. the changePolicy of a Property in the TD). Returns policy objects as is."""
+
+        if policy is None or isinstance(policy, cls):
+            return policy
+
+        fields_camel = {to_camel(name): name for name in cls.FIELDS}
+        unknown = [key for key in policy if to_camel(key) not in fields_camel]
+
+        if unknown:
+            raise ValueError("Unknown change policy fields: {}".format(unknown))
+
+        return cls(**{fields_camel[to_camel(key)]: val for key, val in policy.items()})
+
+    def to_dict(self):
+        """Returns the camelCase dict representation of this policy."""
+
+        return {
+            to_camel(name): getattr(self, name)
+            for name in self.FIELDS
+            if getattr(self, name) not in (None, False)
+        }
+
+    @classmethod
+    def _is_number(cls, value):
+        """Returns True if the given value is a number that can be filtered with a deadband."""
+
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    def is_significant(self, value, last_value):
+        """Returns True if the given value differs enough from the last published one."""
+
+        if self._is_number(value) and self._is_number(last_value):
+            delta = abs(value - last_value)
+
+            if self.deadband is not None and delta < self.deadband:
+                return False
+
+            if self.relative_deadband is not None and delta <= self.relative_deadband * abs(last_value):
+                return False
+
+            return not (self.suppress_equal and delta == 0)
+
+        if self.suppress_equal or self.deadband is not None or self.relative_deadband is not None:
+            return value != last_value
+
+        return True
+
+
+class PropertyChangeFilter:
+    """Keeps the last published value of a Property and decides
+    whether new writes are published according to its policy."""
+
+    PUBLISH = "publish"
+    DEFER = "defer"
+    SUPPRESS = "suppress"
+
+    def __init__(self, policy):
+        self._policy = policy
+        self._last_value = None
+        self._last_time = None
+
+    @property
+    def policy(self):
+        """Returns the PropertyChangePolicy of this filter."""
+
+        return self._policy
+
+    def evaluate(self, value, now):
+        """Returns a tuple with the decision for the given value (PUBLISH, DEFER or SUPPRESS)
+        and, for deferred values, the delay in seconds until they can be published."""
+
+        if self._last_time is None:
+            return self.PUBLISH, None
+
+        elapsed = now - self._last_time
+        max_interval = self._policy.max_interval
+        min_interval = self._policy.min_interval
+
+        if max_interval and elapsed >= max_interval / 1000.0:
+            return self.PUBLISH, None
+
+        if not self._policy.is_significant(value, self._last_value):
+            return self.SUPPRESS, None
+
+        if min_interval and elapsed < min_interval / 1000.0:
+            return self.DEFER, min_interval / 1000.0 - elapsed
+
+        return self.PUBLISH, None
+
+    def published(self, value, now):
+        """Records the given value as the last published one."""
+
+        self._last_value = value
+        self._last_time = now
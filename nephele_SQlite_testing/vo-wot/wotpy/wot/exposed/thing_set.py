@@ -12,6 +12,7 @@ class ExposedThingSet:
 
     def __init__(self):
         self._exposed_things = {}
+        self._url_names = {}
 
     @property
     def exposed_things(self):
@@ -23,7 +24,9 @@ class ExposedThingSet:
     def contains(self, exposed_thing):
         """Returns True if this group contains the given ExposedThing."""
 
-        return exposed_thing in self._exposed_things.values()
+        existing = self._exposed_things.get(exposed_thing.thing.title)
+
+        return existing is not None and existing == exposed_thing
 
     def add(self, exposed_thing):
         """Add a new ExposedThing to this set."""
@@ -32,6 +35,7 @@ class ExposedThingSet:
             raise ValueError("Duplicate Exposed Thing: {}".format(exposed_thing.title))
 
         self._exposed_things[exposed_thing.thing.title] = exposed_thing
+        self._url_names[exposed_thing.thing.url_name] = exposed_thing.thing.title
 
     def remove(self, thing_name):
         """Removes an existing ExposedThing by Name."""
@@ -43,19 +47,24 @@ class ExposedThingSet:
 
         assert exposed_thing.thing.title in self._exposed_things
         self._exposed_things.pop(exposed_thing.thing.title)
+        self._url_names.pop(exposed_thing.thing.url_name, None)
 
     def find_by_thing_name(self, thing_name):
-        """Finds an existing ExposedThing by Thing Name."""
+        """Finds an existing ExposedThing by Thing Name (or its URL-safe version)."""
+
+        exposed_thing = self._exposed_things.get(thing_name)
 
-        def is_match(exp_thing):
-            return exp_thing.thing.title == thing_name or exp_thing.thing.url_name == thing_name
+        if exposed_thing is None:
+            exposed_thing = self._exposed_things.get(self._url_names.get(thing_name))
 
-        return next((item for item in self._exposed_things.values() if is_match(item)), None)
+        return exposed_thing
 
     def find_by_interaction(self, interaction):
         """Finds the ExposedThing whose Thing contains the given Interaction."""
 
-        def is_match(exp_thing):
-            return exp_thing.thing is interaction.thing
+        exposed_thing = self._exposed_things.get(interaction.thing.title)
+
+        if exposed_thing is None or exposed_thing.thing is not interaction.thing:
+            return None
 
-        return next((item for item in self._exposed_things.values() if is_match(item)), None)
+        return exposed_thing
@@ -6,26 +6,33 @@ Classes that represent the JSON and JSON-LD serialization formats of a Thing Des
 """
 
 import json
+import weakref
 
 import jsonschema
 
+from wotpy.wot.dictionaries.link import FormDict
 from wotpy.wot.dictionaries.thing import ThingFragment
 from wotpy.wot.thing import Thing
-from wotpy.wot.validation import SCHEMA_THING, InvalidDescription
+from wotpy.wot.validation import THING_VALIDATOR, InvalidDescription
+
+_THING_DESCRIPTIONS = weakref.WeakKeyDictionary()
 
 
 class ThingDescription:
     """Class that represents a Thing Description document.
     Contains logic to validate and transform a Thing to a serialized TD and vice versa."""
 
-    def __init__(self, doc):
+    def __init__(self, doc, trusted=False):
         """Constructor.
-        Validates that the document conforms to the TD schema."""
+        Validates that the document conforms to the TD schema
+        unless it is trusted (i.e. it was generated internally)."""
 
         self._doc = json.loads(doc) if isinstance(doc, (str, bytes)) else doc
         self._thing_fragment = ThingFragment(self._doc)
+        self._str = None
 
-        self.validate(doc=self._thing_fragment.to_dict())
+        if not trusted:
+            self.validate(doc=self._thing_fragment.to_dict())
 
     @classmethod
     def validate(cls, doc):
@@ -33,15 +40,27 @@ class ThingDescription:
         Raises ValidationError if validation fails."""
 
         try:
-            jsonschema.validate(doc, SCHEMA_THING)
-        except (jsonschema.ValidationError, TypeError) as ex:
+            error = jsonschema.exceptions.best_match(THING_VALIDATOR.iter_errors(doc))
+        except TypeError as ex:
             raise InvalidDescription(str(ex))
 
+        if error is not None:
+            raise InvalidDescription(str(error))
+
     @classmethod
     def from_thing(cls, thing):
-        """Builds an instance of a JSON-serialized Thing Description from a Thing object."""
+        """Builds an instance of a JSON-serialized Thing Description from a Thing object.
+        The document is not validated again as it is generated from the Thing
+        (which is built from a validated TD), and the instance is reused until
+        the Thing is modified."""
+
+        revision, description = _THING_DESCRIPTIONS.get(thing, (None, None))
+
+        if description is None or revision != thing.revision:
+            description = ThingDescription(thing.thing_fragment.to_dict(), trusted=True)
+            _THING_DESCRIPTIONS[thing] = (thing.revision, description)
 
-        return ThingDescription(thing.thing_fragment.to_dict())
+        return description
 
     def __getattr__(self, name):
         """Search for members that raised an AttributeError in
@@ -57,7 +76,10 @@ class ThingDescription:
     def to_str(self):
         """Returns the JSON Thing Description as a string."""
 
-        return json.dumps(self._thing_fragment.to_dict())
+        if self._str is None:
+            self._str = json.dumps(self._thing_fragment.to_dict())
+
+        return self._str
 
     def to_thing_fragment(self):
         """Returns a ThingFragment dictionary built from this TD."""
@@ -83,6 +105,11 @@ class ThingDescription:
 
         return []
 
+    def get_thing_forms(self):
+        """Returns a list of FormDict for the Thing-level operations (e.g. readallproperties)."""
+
+        return [FormDict(item) for item in self._thing_fragment.forms or []]
+
     def get_property_forms(self, name):
         """Returns a list of FormDict for the property that matches the given name."""
 
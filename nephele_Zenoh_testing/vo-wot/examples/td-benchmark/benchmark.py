@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the validation of the Thing Description examples bundled in the repository.
+"""
+
+import argparse
+import glob
+import json
+import os
+import timeit
+
+import jsonschema
+
+from wotpy.wot.td import ThingDescription
+from wotpy.wot.validation import SCHEMA_THING
+
+EXAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+
+def load_examples():
+    """Returns a dict with the TD documents of the examples keyed by path."""
+
+    paths = sorted(glob.glob(os.path.join(EXAMPLES_DIR, "**", "td.json"), recursive=True))
+    examples = {}
+
+    for path in paths:
+        with open(path) as fh:
+            examples[os.path.relpath(path, EXAMPLES_DIR)] = json.load(fh)
+
+    return examples
+
+
+def run_benchmark(name, func, number):
+    """Runs the given function and returns the mean time per call in microseconds."""
+
+    elapsed = min(timeit.repeat(func, number=number, repeat=3))
+
+    return name, elapsed / number * 1e6
+
+
+def main(number):
+    """Compares the validation paths for each bundled TD example."""
+
+    for path, doc in load_examples().items():
+        thing = ThingDescription(doc).build_thing()
+
+        results = [
+            run_benchmark("jsonschema.validate", lambda: jsonschema.validate(doc, SCHEMA_THING), number),
+            run_benchmark("compiled validator", lambda: ThingDescription.validate(doc), number),
+            run_benchmark("from_thing (validated)", lambda: ThingDescription(
+                thing.thing_fragment.to_dict()), number),
+            run_benchmark("from_thing (trusted)", lambda: ThingDescription(
+                thing.thing_fragment.to_dict(), trusted=True), number),
+            run_benchmark("from_thing (cached)", lambda: ThingDescription.from_thing(thing), number)
+        ]
+
+        baseline = results[0][1]
+
+        print(path)
+
+        for name, usecs in results:
+            print("    {:<24} {:>10.1f} us  x{:.1f}".format(name, usecs, baseline / usecs))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Thing Description validation benchmark")
+    parser.add_argument("-n", "--number", type=int, default=50, help="Calls per measurement")
+    args = parser.parse_args()
+
+    main(args.number)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from tests.utils import run_test_coroutine
+from wotpy.database.enums import InfluxDBLayout
+from wotpy.database.influxdb_database import InfluxDB
+
+
+def _build_influxdb(**kwargs):
+    """Builds an InfluxDB instance with mocked APIs."""
+
+    influxdb = InfluxDB(url="http://localhost:8086", org="wot", token="token", **kwargs)
+    influxdb.buckets_api = MagicMock()
+    influxdb.buckets_api.find_bucket_by_name.return_value = None
+    influxdb.write_api = MagicMock()
+    influxdb.query_api = MagicMock()
+
+    return influxdb
+
+
+def _written_points(influxdb):
+    """Returns the list of (bucket, point) tuples written with the mocked write API."""
+
+    points = []
+
+    for call in influxdb.write_api.write.call_args_list:
+        records = call.kwargs["record"]
+        records = records if isinstance(records, list) else [records]
+        points.extend((call.kwargs["bucket"], record) for record in records)
+
+    return points
+
+
+def test_bucket_registry():
+    """Buckets are looked up and created only once."""
+
+    influxdb = _build_influxdb()
+    influxdb.resolve_buckets("thing", ["temperature", "humidity"])
+
+    assert influxdb.buckets_api.find_bucket_by_name.call_count == 2
+    assert influxdb.buckets_api.create_bucket.call_count == 2
+
+    for _ in range(5):
+        influxdb.write_property("thing", "temperature", 20.5)
+
+    assert influxdb.buckets_api.find_bucket_by_name.call_count == 2
+    assert influxdb.write_api.write.call_count == 5
+
+
+def test_layout_bucket_per_key():
+    """The bucket per key layout stores every property value
+    as a single typed point in the bucket of the property."""
+
+    influxdb = _build_influxdb()
+    influxdb.write_property("thing", "battery", {"level": 90, "status": {"charging": True}})
+    influxdb.write_property("thing", "temperature", 20.5)
+    influxdb.write_property("thing", "pose", [1, 2])
+
+    points = _written_points(influxdb)
+
+    assert [bucket for bucket, _ in points] == ["battery", "temperature", "pose"]
+    assert points[0][1].to_line_protocol().startswith("battery level=90i,status.charging=true ")
+    assert points[1][1].to_line_protocol().startswith("temperature value=20.5 ")
+    assert points[2][1].to_line_protocol().startswith("pose value.0=1i,value.1=2i ")
+
+
+def test_layout_bucket_per_vo():
+    """The bucket per VO layout stores one measurement per property with tags."""
+
+    influxdb = _build_influxdb(layout=InfluxDBLayout.BUCKET_PER_VO, bucket="vo1")
+    influxdb.resolve_buckets("thing", ["temperature", "battery"])
+
+    assert influxdb.buckets_api.find_bucket_by_name.call_count == 1
+
+    influxdb.write_property("thing", "temperature", 20.5)
+    influxdb.write_property(
+        "thing", "battery", {"level": 90},
+        schema={"type": "object", "properties": {"level": {"type": "number"}}})
+    influxdb.write_event("thing", "event", "payload")
+
+    lines = [point.to_line_protocol() for _, point in _written_points(influxdb)]
+
+    assert {bucket for bucket, _ in _written_points(influxdb)} == {"vo1"}
+    assert lines[0].startswith("temperature,property=temperature,thing=thing value=20.5 ")
+    assert lines[1].startswith("battery,property=battery,thing=thing level=90 ")
+    assert lines[2].startswith("event,thing=thing value=\"payload\" ")
+    assert influxdb.buckets_api.find_bucket_by_name.call_count == 1
+
+
+def test_property_query():
+    """Property queries select the property measurement in the VO bucket."""
+
+    influxdb_key = _build_influxdb()
+    influxdb_vo = _build_influxdb(layout=InfluxDBLayout.BUCKET_PER_VO)
+
+    assert 'from(bucket:"temperature")' in influxdb_key.property_query("thing", "temperature")
+
+    query_vo = influxdb_vo.property_query("thing", "temperature")
+
+    assert 'from(bucket:"thing")' in query_vo
+    assert 'r._measurement == "temperature" and r.thing == "thing"' in query_vo
+
+
+def test_empty_values_are_not_written():
+    """Values without any field are skipped."""
+
+    influxdb = _build_influxdb()
+    influxdb.write_property("thing", "battery", {})
+    influxdb.write_property("thing", "temperature", None)
+
+    assert not influxdb.write_api.write.called
+
+
+def test_invalid_layout():
+    """Unknown layouts are rejected."""
+
+    with pytest.raises(ValueError):
+        _build_influxdb(layout="unknown")
+
+
+class _Record:
+    """Minimal stand-in for a FluxRecord."""
+
+    def __init__(self, **values):
+        self.values = values
+
+    def get_value(self):
+        return self.values["_value"]
+
+
+def test_query_stream():
+    """Query results are streamed as an async generator and limited to the given rows."""
+
+    influxdb = _build_influxdb()
+    influxdb.query_api.query_stream.side_effect = lambda *args, **kwargs: iter(
+        [_Record(_value=idx) for idx in range(2500)])
+
+    async def test_coroutine():
+        values = [record.get_value() async for record in influxdb.query_stream("query")]
+
+        assert values == list(range(2500))
+
+        values = [record.get_value() async for record in influxdb.query_stream("query", limit=1500)]
+
+        assert values == list(range(1500))
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_query_columns():
+    """Query results can be returned as NumPy columns."""
+
+    influxdb = _build_influxdb()
+    influxdb.query_api.query_stream.return_value = iter(
+        [_Record(_time=idx, _value=idx * 0.5) for idx in range(4)])
+
+    async def test_coroutine():
+        columns = await influxdb.query_columns("query")
+
+        assert columns["_time"].tolist() == [0, 1, 2, 3]
+        assert columns["_value"].tolist() == [0.0, 0.5, 1.0, 1.5]
+
+        with pytest.raises(ValueError):
+            await influxdb.query_columns("query", output="unknown")
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_query_timeout():
+    """Queries that take longer than the timeout are aborted."""
+
+    influxdb = _build_influxdb()
+
+    class SlowRecords:
+        def __init__(self):
+            self.close = MagicMock()
+
+        def __iter__(self):
+            time.sleep(0.3)
+            yield _Record(_value=1)
+
+    records = SlowRecords()
+    influxdb.query_api.query_stream.return_value = records
+
+    async def test_coroutine():
+        with pytest.raises(asyncio.TimeoutError):
+            async for _ in influxdb.query_stream("query", timeout=0.1):
+                pass
+
+        # The stream is closed by the executor thread once it stops reading
+        assert not records.close.called
+
+        await asyncio.sleep(0.5)
+
+        assert records.close.call_count == 1
+
+    run_test_coroutine(test_coroutine)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import json
+from unittest.mock import MagicMock
+
+from influxdb_client.rest import ApiException
+
+from tests.utils import run_test_coroutine
+from wotpy.database.influxdb_database import InfluxDB
+
+
+def _build_influxdb(ping_results, tmp_path):
+    """Builds an InfluxDB instance with mocked APIs and a connection
+    manager whose pings return the given sequence of results."""
+
+    influxdb = InfluxDB(
+        url="http://localhost:8086", org="wot", token="token",
+        connection_options={
+            "spool_path": str(tmp_path / "spool.jsonl"),
+            "min_backoff": 0.01,
+            "max_backoff": 0.02
+        })
+
+    influxdb.client = MagicMock()
+    influxdb.client.ping.side_effect = list(ping_results) + [True] * 100
+    influxdb.buckets_api = MagicMock()
+    influxdb.write_api = MagicMock()
+
+    return influxdb
+
+
+async def _wait_for(condition, timeout=5):
+    """Waits until the given condition function returns True."""
+
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+
+    raise AssertionError("Timeout waiting for condition")
+
+
+def test_points_are_spooled_and_replayed(tmp_path):
+    """Points written while the database is unreachable are replayed on reconnection."""
+
+    influxdb = _build_influxdb([False, False], tmp_path)
+
+    async def test_coroutine():
+        influxdb.resolve_buckets("thing", ["temperature"])
+        influxdb.connection.start()
+
+        influxdb.write_property("thing", "temperature", 20)
+        influxdb.write_property("thing", "temperature", 21)
+
+        assert not influxdb.write_api.write.called
+        await _wait_for(lambda: influxdb.connection.stats["spooled"] == 2)
+
+        await _wait_for(lambda: influxdb.connection.is_connected and influxdb.connection.spool.is_empty)
+
+        replayed = [
+            line
+            for call in influxdb.write_api.write.call_args_list
+            for line in call.kwargs["record"]
+        ]
+
+        assert [line.split(" ")[1] for line in replayed] == ["value=20i", "value=21i"]
+        assert influxdb.buckets_api.find_bucket_by_name.call_count == 1
+
+        await influxdb.shutdown()
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_write_failure_marks_disconnected(tmp_path):
+    """A failed write spools the point and triggers a new probe."""
+
+    influxdb = _build_influxdb([], tmp_path)
+
+    async def test_coroutine():
+        influxdb.connection.start()
+
+        await _wait_for(lambda: influxdb.connection.is_connected)
+
+        influxdb.write_api.write.side_effect = [ConnectionError, None]
+        influxdb.write_property("thing", "temperature", 20)
+
+        assert not influxdb.connection.is_connected
+        await _wait_for(lambda: influxdb.connection.stats["spooled"] == 1)
+
+        await _wait_for(lambda: influxdb.connection.is_connected and influxdb.connection.spool.is_empty)
+
+        assert influxdb.write_api.write.call_count == 2
+
+        await influxdb.shutdown()
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_rejected_points_are_quarantined(tmp_path):
+    """Spooled points rejected by the database are quarantined instead of retried."""
+
+    influxdb = _build_influxdb([False], tmp_path)
+
+    def write(bucket, record):
+        if any("value=21i" in line for line in record):
+            raise ApiException(status=400, reason="field type conflict")
+
+    influxdb.write_api.write.side_effect = write
+
+    async def test_coroutine():
+        influxdb.connection.start()
+
+        influxdb.write_property("thing", "temperature", 20)
+        influxdb.write_property("thing", "temperature", 21)
+
+        await _wait_for(lambda: influxdb.connection.stats["spooled"] == 2)
+        await _wait_for(lambda: influxdb.connection.is_connected and influxdb.connection.spool.is_empty)
+
+        assert influxdb.connection.stats["dropped"] == 1
+
+        with open(influxdb.connection.spool.rejected_path) as rejected:
+            entries = [json.loads(line) for line in rejected]
+
+        assert len(entries) == 1
+        assert "value=21i" in entries[0]["line"]
+
+        await influxdb.shutdown()
+
+    run_test_coroutine(test_coroutine)
@@ -182,6 +182,48 @@ def client_test_write_property(servient, protocol_client_cls, timeout=None):
     run_test_coroutine(test_coroutine)
 
 
+def client_test_multiple_properties(servient, protocol_client_cls, timeout=None):
+    """Helper function to test reads and writes of multiple Properties on bindings clients."""
+
+    exposed_thing = next(servient.exposed_things)
+
+    prop_names = [uuid.uuid4().hex for _ in range(3)]
+
+    for prop_name in prop_names:
+        exposed_thing.add_property(prop_name, PropertyFragmentDict({
+            "type": "string",
+            "observable": True
+        }), value=Faker().sentence())
+
+    servient.refresh_forms()
+
+    td = ThingDescription.from_thing(exposed_thing.thing)
+
+    async def test_coroutine():
+        protocol_client = protocol_client_cls()
+
+        assert len(td.get_thing_forms())
+        assert protocol_client.is_supported_thing_operation(td, "readmultipleproperties")
+
+        values = {prop_name: Faker().sentence() for prop_name in prop_names}
+
+        await protocol_client.write_multiple_properties(td, values, timeout=timeout)
+
+        for prop_name, value in values.items():
+            assert (await exposed_thing.properties[prop_name].read()) == value
+
+        read_values = await protocol_client.read_multiple_properties(td, prop_names[:2], timeout=timeout)
+
+        assert read_values == {prop_name: values[prop_name] for prop_name in prop_names[:2]}
+
+        all_values = await protocol_client.read_all_properties(td, timeout=timeout)
+
+        assert set(prop_names).issubset(all_values.keys())
+        assert all(all_values[prop_name] == values[prop_name] for prop_name in prop_names)
+
+    run_test_coroutine(test_coroutine)
+
+
 def client_test_invoke_action(servient, protocol_client_cls, timeout=None):
     """Helper function to test Action invocations on bindings clients."""
 
@@ -147,6 +147,25 @@ def test_write_property(consumed_exposed_pair):
     run_test_coroutine(test_coroutine)
 
 
+def test_multiple_properties(consumed_exposed_pair):
+    """A ConsumedThing is able to read and write multiple properties at once."""
+
+    consumed_thing = consumed_exposed_pair.pop("consumed_thing")
+    exposed_thing = consumed_exposed_pair.pop("exposed_thing")
+
+    async def test_coroutine():
+        prop_name = next(iter(consumed_thing.td.properties.keys()))
+        value = Faker().sentence()
+
+        await consumed_thing.write_multiple_properties({prop_name: value})
+
+        assert (await exposed_thing.read_all_properties()) == {prop_name: value}
+        assert (await consumed_thing.read_multiple_properties([prop_name])) == {prop_name: value}
+        assert (await consumed_thing.read_all_properties()) == {prop_name: value}
+
+    run_test_coroutine(test_coroutine)
+
+
 def test_invoke_action(consumed_exposed_pair):
     """A ConsumedThing is able to invoke actions."""
 
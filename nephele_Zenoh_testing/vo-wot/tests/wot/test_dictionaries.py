@@ -233,3 +233,29 @@ def test_thing_fragment_setters():
     thing_fragment.version = version_updated
 
     assert thing_fragment.version.instance == version_updated.instance
+
+
+def test_dict_serialization_cache():
+    """Dictionaries have no instance __dict__ and serialize to independent copies of a cached dict."""
+
+    thing_fragment = ThingFragment(THING_INIT)
+
+    assert not hasattr(thing_fragment, "__dict__")
+    assert not hasattr(next(iter(thing_fragment.properties.values())), "__dict__")
+
+    with pytest.raises(AttributeError):
+        thing_fragment.unknown_attribute = Faker().pystr()
+
+    doc = thing_fragment.to_dict()
+    doc["properties"].clear()
+    doc.update({"base": Faker().url()})
+
+    assert thing_fragment.to_dict()["properties"]
+    assert "base" not in thing_fragment.to_dict()
+
+    description_updated = Faker().pystr()
+
+    # noinspection PyPropertyAccess
+    thing_fragment.description = description_updated
+
+    assert thing_fragment.to_dict()["description"] == description_updated
@@ -40,6 +40,20 @@ def test_validate_err():
             ThingDescription.validate(doc=td_err)
 
 
+def test_trusted():
+    """Trusted Thing Description documents are not validated."""
+
+    td_err = copy.deepcopy(TD_EXAMPLE)
+    td_err.update({"actions": "hello-interactions"})
+
+    with pytest.raises(InvalidDescription):
+        ThingDescription(td_err)
+
+    td = ThingDescription(td_err, trusted=True)
+
+    assert td.title == TD_EXAMPLE.get("title")
+
+
 def test_from_dict():
     """ThingDescription objects can be built from TD documents in dict format."""
 
@@ -1,15 +1,18 @@
 import logging
 import os
+import time
+
+# Start of the import of the package, reported by the startup profiler
+IMPORT_STARTED = time.perf_counter()
 
 logger_base = logging.getLogger(__name__)
 logger_base.addHandler(logging.NullHandler())
 
 if os.environ.get("WOTPY_ENABLE_UVLOOP", False):
     try:
-        import asyncio
-        import uvloop
+        from wotpy.utils.event_loop import EventLoopPolicies, set_event_loop_policy
 
         logger_base.warning("Installing uvloop (this is an experimental feature)")
-        uvloop.install()
+        set_event_loop_policy(EventLoopPolicies.UVLOOP)
     except ImportError:
         logger_base.warning("Error installing uvloop (cannot import package)")
@@ -8,6 +8,13 @@ SQLite and InfluxDB database related files.
     :toctree: _database
 
     wotpy.database.database_schema
+    wotpy.database.enums
+    wotpy.database.influxdb_connection
     wotpy.database.influxdb_database
+    wotpy.database.influxdb_encoder
+    wotpy.database.influxdb_event_log
+    wotpy.database.influxdb_spool
+    wotpy.database.influxdb_writer
+    wotpy.database.sqlite_blob_store
     wotpy.database.sqlite_database
 """
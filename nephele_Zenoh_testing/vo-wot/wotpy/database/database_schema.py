@@ -2,9 +2,11 @@
 # -*- coding: utf-8 -*-
 
 """
-Class that defines the base database schema.
+Constants that define the database schemas.
 """
 
+STATUS_TABLES = ("vo_status", "device_status")
+
 DB_SCHEMA = """
     CREATE TABLE IF NOT EXISTS vo_status (
         id INTEGER PRIMARY KEY,
@@ -16,6 +18,8 @@ DB_SCHEMA = """
         timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
         status INTEGER
     );
+    CREATE INDEX IF NOT EXISTS vo_status_timestamp ON vo_status (timestamp);
+    CREATE INDEX IF NOT EXISTS device_status_timestamp ON device_status (timestamp);
     CREATE TABLE IF NOT EXISTS observer (
         id INTEGER PRIMARY KEY,
         ip TEXT
@@ -28,4 +32,25 @@ DB_SCHEMA = """
         id INTEGER PRIMARY KEY,
         device_ip TEXT
     );
-"""
\ No newline at end of file
+"""
+
+BLOB_STORE_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS blob (
+        name TEXT PRIMARY KEY,
+        hash TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS blob_hash ON blob (hash);
+    CREATE TABLE IF NOT EXISTS blob_content (
+        hash TEXT PRIMARY KEY,
+        size INTEGER NOT NULL,
+        chunk_size INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS blob_chunk (
+        key TEXT NOT NULL,
+        idx INTEGER NOT NULL,
+        data BLOB NOT NULL,
+        PRIMARY KEY (key, idx)
+    );
+"""
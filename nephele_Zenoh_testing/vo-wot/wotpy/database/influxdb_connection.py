@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Class that monitors the connection to InfluxDB in the background.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+
+from influxdb_client.rest import ApiException
+
+from wotpy.database.influxdb_spool import InfluxDBSpool
+
+
+def is_rejection(ex):
+    """Returns True if the given exception means that the database rejected the points
+    (e.g. malformed line protocol or a field type conflict), so retrying is pointless."""
+
+    return isinstance(ex, ApiException) and ex.status in (400, 413, 422)
+
+
+class InfluxDBConnectionManager:
+    """Probes the InfluxDB database in the background with exponential backoff.
+    While the database is unreachable the points are kept in an on-disk spool
+    (or dropped if no spool is configured) and they are replayed in batches
+    once the connection is recovered. The Servient never waits for the database
+    to be reachable to start serving requests."""
+
+    DEFAULT_MIN_BACKOFF_SECS = 1
+    DEFAULT_MAX_BACKOFF_SECS = 60
+    DEFAULT_REPLAY_BATCH_SIZE = 500
+
+    def __init__(self, influxdb, spool_path=None, spool_max_size=None,
+                 min_backoff=None, max_backoff=None, replay_batch_size=None):
+        self._influxdb = influxdb
+        self._spool = InfluxDBSpool(spool_path, max_size=spool_max_size) if spool_path else None
+        self._min_backoff = float(min_backoff or self.DEFAULT_MIN_BACKOFF_SECS)
+        self._max_backoff = float(max_backoff or self.DEFAULT_MAX_BACKOFF_SECS)
+        self._replay_batch_size = int(replay_batch_size or self.DEFAULT_REPLAY_BATCH_SIZE)
+
+        if self._min_backoff <= 0 or self._max_backoff < self._min_backoff:
+            raise ValueError("Invalid reconnection backoff limits")
+
+        self._connected = False
+        self._loop = None
+        self._disconnected = None
+        self._task = None
+        self._spool_executor = None
+        self._dropped = 0
+        self._logr = logging.getLogger(__name__)
+
+    @property
+    def is_connected(self):
+        """Returns True if the last probe or write to the database succeeded."""
+
+        return self._connected
+
+    @property
+    def spool(self):
+        """Returns the on-disk spool (None if disabled)."""
+
+        return self._spool
+
+    @property
+    def stats(self):
+        """Returns a dict with the connection status and the spool counters."""
+
+        stats = {
+            "connected": self._connected,
+            "dropped": self._dropped
+        }
+
+        if self._spool is not None:
+            spool_stats = self._spool.stats
+            stats.update({
+                "spooled": spool_stats["spooled"],
+                "replayed": spool_stats["replayed"],
+                "dropped": self._dropped + spool_stats["dropped"]
+            })
+
+        return stats
+
+    def mark_disconnected(self):
+        """Signals that the database is unreachable. May be called from any thread."""
+
+        if not self._connected:
+            return
+
+        self._connected = False
+        self._logr.warning("Lost connection to the InfluxDB database")
+
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._disconnected.set)
+
+    def reject(self, bucket, records):
+        """Drops records that were rejected by the database."""
+
+        records = records if isinstance(records, list) else [records]
+        self._dropped += len(records)
+        self._logr.warning("InfluxDB rejected %s points for bucket %s", len(records), bucket)
+
+    def store(self, bucket, records):
+        """Keeps the given records until the connection is recovered.
+        When called from the event loop the spool (which syncs every entry
+        to disk) is written in order from a dedicated thread."""
+
+        records = records if isinstance(records, list) else [records]
+
+        if self._spool is None:
+            self._dropped += len(records)
+            return
+
+        lines = [
+            record if isinstance(record, str) else record.to_line_protocol()
+            for record in records
+        ]
+
+        try:
+            in_loop = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            in_loop = False
+
+        if in_loop:
+            if self._spool_executor is None:
+                self._spool_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="wotpy-influxdb-spool")
+
+            self._loop.run_in_executor(self._spool_executor, self._spool.append, bucket, lines)
+        else:
+            self._spool.append(bucket, lines)
+
+    def _ping(self):
+        """Returns True if the database answers to a ping request."""
+
+        try:
+            return bool(self._influxdb.client.ping())
+        except Exception:
+            return False
+
+    def _replay_lines(self, bucket, lines):
+        """Writes spooled lines one by one and quarantines the ones rejected by the database."""
+
+        rejected = []
+
+        for line in lines:
+            try:
+                self._influxdb.write_direct(bucket, [line])
+            except Exception as ex:
+                if not is_rejection(ex):
+                    raise
+                rejected.append(line)
+
+        if rejected:
+            self._spool.quarantine(bucket, rejected)
+
+    def _replay_batch(self, batch):
+        """Writes a batch of spooled (bucket, line) tuples. Transport errors are
+        propagated so that the batch is retried, while batches rejected by the
+        database are retried line by line to quarantine the offending points."""
+
+        lines_by_bucket = {}
+
+        for bucket, line in batch:
+            lines_by_bucket.setdefault(bucket, []).append(line)
+
+        for bucket, lines in lines_by_bucket.items():
+            try:
+                self._influxdb.write_direct(bucket, lines)
+            except Exception as ex:
+                if not is_rejection(ex):
+                    raise
+                self._replay_lines(bucket, lines)
+
+    def _replay(self):
+        """Replays every spooled point. Runs in the executor."""
+
+        while not self._spool.is_empty:
+            self._spool.replay(self._replay_batch, self._replay_batch_size)
+
+    async def _run(self):
+        """Probes the database until it is reachable, replays
+        the spool and waits until the connection is lost again.
+        The backoff is only reset once the spool has been replayed."""
+
+        loop = asyncio.get_running_loop()
+        backoff = self._min_backoff
+
+        while True:
+            if not await loop.run_in_executor(None, self._ping):
+                self._logr.info("InfluxDB database unreachable: retrying in %s seconds", backoff)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self._max_backoff)
+                continue
+
+            self._disconnected.clear()
+            self._connected = True
+            self._logr.info("Connected to the InfluxDB database")
+
+            try:
+                await loop.run_in_executor(None, self._influxdb.resolve_pending_buckets)
+
+                if self._spool is not None:
+                    await loop.run_in_executor(None, self._replay)
+            except Exception as ex:
+                self._logr.warning(
+                    "Error synchronizing with the InfluxDB database: retrying in %s seconds: %s", backoff, ex)
+                self.mark_disconnected()
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self._max_backoff)
+                continue
+
+            backoff = self._min_backoff
+            await self._disconnected.wait()
+
+    def start(self):
+        """Starts probing the database in the current event loop."""
+
+        if self._task is not None and not self._task.done():
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._disconnected = asyncio.Event()
+        self._task = self._loop.create_task(self._run())
+
+    async def stop(self):
+        """Stops probing the database."""
+
+        if self._task is None:
+            return
+
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._task = None
+
+        if self._spool_executor is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._spool_executor.shutdown)
+            self._spool_executor = None
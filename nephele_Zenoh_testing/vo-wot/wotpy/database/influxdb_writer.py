@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Class that buffers InfluxDB points and writes them in batches in the background.
+"""
+
+import asyncio
+import collections
+import logging
+import threading
+
+from wotpy.database.enums import BackpressurePolicy
+
+
+class InfluxDBBatchWriter:
+    """Buffers points in a bounded in-memory queue and writes them to InfluxDB
+    in batches from a thread executor, so that the event loop does not wait
+    for the HTTP round trip to the database while the queue has room."""
+
+    DEFAULT_BATCH_SIZE = 500
+    DEFAULT_FLUSH_INTERVAL_MS = 1000
+    DEFAULT_MAX_QUEUE_SIZE = 10000
+
+    def __init__(self, influxdb, batch_size=None, flush_interval=None,
+                 max_queue_size=None, backpressure=None):
+        self._influxdb = influxdb
+        self._batch_size = int(batch_size or self.DEFAULT_BATCH_SIZE)
+        self._flush_interval = int(flush_interval or self.DEFAULT_FLUSH_INTERVAL_MS)
+        self._max_queue_size = int(max_queue_size or self.DEFAULT_MAX_QUEUE_SIZE)
+        self._backpressure = backpressure or BackpressurePolicy.BLOCK
+
+        if self._backpressure not in BackpressurePolicy.list():
+            raise ValueError("Invalid backpressure policy: {}".format(self._backpressure))
+
+        if self._batch_size <= 0 or self._flush_interval <= 0:
+            raise ValueError("Batch size and flush interval must be positive")
+
+        if self._max_queue_size < self._batch_size:
+            raise ValueError("Max queue size can not be smaller than the batch size")
+
+        self._queue = collections.deque()
+        self._wakeup = None
+        self._flush_lock = None
+        self._capacity = None
+        self._task = None
+        self._stats_lock = threading.Lock()
+        self._logr = logging.getLogger(__name__)
+
+        self._stats = {
+            "queued": 0,
+            "dropped": 0,
+            "flushed": 0,
+            "failed": 0
+        }
+
+    @property
+    def is_running(self):
+        """Returns True if the background flush task is running."""
+
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self):
+        """Returns the number of points waiting to be written."""
+
+        return len(self._queue)
+
+    @property
+    def stats(self):
+        """Returns a dict with the counters of queued, dropped,
+        flushed and failed points plus the current queue length."""
+
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        stats["pending"] = self.pending
+
+        return stats
+
+    def _count(self, key, value=1):
+        """Increments a counter (the batches are written from executor threads)."""
+
+        with self._stats_lock:
+            self._stats[key] += value
+
+    def enqueue(self, bucket, record):
+        """Adds a record to the queue of points waiting to be written
+        in the given bucket, applying the backpressure policy if full.
+        With the blocking policy the oldest batch is written in the caller,
+        coroutines should await wait_for_capacity first to avoid it."""
+
+        if len(self._queue) >= self._max_queue_size:
+            if self._backpressure == BackpressurePolicy.DROP_NEWEST:
+                self._count("dropped")
+                return
+            elif self._backpressure == BackpressurePolicy.DROP_OLDEST:
+                self._queue.popleft()
+                self._count("dropped")
+            else:
+                self._write_batch(self._take_batch(self._batch_size))
+
+        self._queue.append((bucket, record))
+        self._count("queued")
+
+        if self._wakeup is not None and len(self._queue) >= self._batch_size:
+            self._wakeup.set()
+
+    def _take_batch(self, size):
+        """Removes and returns up to size items from the head of the queue."""
+
+        return [self._queue.popleft() for _ in range(min(size, len(self._queue)))]
+
+    async def wait_for_capacity(self):
+        """Waits until the queue has room for new points. Only the blocking
+        policy waits, the drop policies always return immediately."""
+
+        if self._backpressure != BackpressurePolicy.BLOCK or not self.is_running:
+            return
+
+        async with self._capacity:
+            while len(self._queue) >= self._max_queue_size:
+                self._wakeup.set()
+                await self._capacity.wait()
+
+    async def _notify_capacity(self):
+        """Wakes up the producers waiting for room in the queue."""
+
+        async with self._capacity:
+            self._capacity.notify_all()
+
+    def _write_batch(self, batch):
+        """Writes a batch of queued items grouping the records by bucket.
+        Runs in the executor thread if the writer is running."""
+
+        records_by_bucket = collections.OrderedDict()
+
+        for bucket, record in batch:
+            records_by_bucket.setdefault(bucket, []).append(record)
+
+        for bucket, records in records_by_bucket.items():
+            try:
+                self._influxdb.write_records(bucket, records)
+                self._count("flushed", len(records))
+            except Exception as ex:
+                self._logr.warning("Error writing %s points to bucket %s: %s", len(records), bucket, ex)
+                self._count("failed", len(records))
+
+    async def flush(self):
+        """Writes every queued point to the database."""
+
+        async with self._flush_lock:
+            loop = asyncio.get_running_loop()
+
+            while self._queue:
+                batch = self._take_batch(self._batch_size)
+                await loop.run_in_executor(None, self._write_batch, batch)
+                await self._notify_capacity()
+
+    async def _run(self):
+        """Flushes the queue when a full batch is available
+        or the flush interval expires, whichever happens first."""
+
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self._flush_interval / 1000.0)
+            except asyncio.TimeoutError:
+                pass
+
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+            except Exception as ex:
+                self._logr.warning("Error flushing InfluxDB points: %s", ex)
+
+    def start(self):
+        """Starts the background flush task in the current event loop."""
+
+        if self.is_running:
+            return
+
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._capacity = asyncio.Condition()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stops the background flush task and writes the remaining points."""
+
+        if not self.is_running:
+            return
+
+        self._task.cancel()
+
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+        self._task = None
+
+        await self.flush()
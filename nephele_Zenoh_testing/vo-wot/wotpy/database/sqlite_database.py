@@ -5,75 +5,604 @@
 Class that handles sqlite database operations.
 """
 
+import asyncio
+import concurrent.futures
+import datetime
 import sqlite3
+import threading
+import time
 
 from wotpy.database.database_schema import DB_SCHEMA
+from wotpy.database.enums import SQLiteJournalMode, SQLiteSynchronous
+
+MEMORY_DB_PATH = ":memory:"
+DEFAULT_DB_PATH = "vo.db"
+
+VALID_COLUMN_TYPES = {"INTEGER", "TEXT", "REAL", "BLOB", "NUMERIC", "INTEGER PRIMARY KEY"}
 
 
 class SQLiteDatabase:
-    """Class that handles all sqlite database operations"""
+    """Class that handles all sqlite database operations.
+    The asynchronous methods run the queries in thread executors so that
+    the event loop is never blocked: all writes go through a single writer
+    connection and reads are served by a pool of reader connections.
+    Write statements that arrive within commit_delay miliseconds of each
+    other are grouped in a single transaction (group commit).
+    Queries take their values as parameters (never formatted into the SQL
+    string) so that the prepared statements are reused from the statement
+    cache of each connection. Results can be fetched one page at a time.
+    Tables can have a retention policy (maximum number of rows and/or maximum
+    age in seconds of the rows) that is enforced in small batches of deletes
+    after inserting into the table."""
+
+    DEFAULT_READER_POOL_SIZE = 4
+    DEFAULT_COMMIT_DELAY_MS = 5
+    DEFAULT_MAX_BATCH_SIZE = 256
+    DEFAULT_STATEMENT_CACHE_SIZE = 128
+    DEFAULT_PAGE_SIZE = 500
+    RETENTION_INTERVAL_SECS = 10
+    RETENTION_BATCH_SIZE = 1000
+
+    def __init__(self, db_path, journal_mode=None, synchronous=None,
+                 reader_pool_size=None, commit_delay=None, max_batch_size=None,
+                 statement_cache_size=None, page_size=None, retention=None):
+        self.db_path = db_path if db_path is not None else DEFAULT_DB_PATH
+        self._journal_mode = (journal_mode or SQLiteJournalMode.WAL).upper()
+        self._synchronous = (synchronous or SQLiteSynchronous.NORMAL).upper()
+        self._reader_pool_size = int(reader_pool_size or self.DEFAULT_READER_POOL_SIZE)
+        self._commit_delay = float(self.DEFAULT_COMMIT_DELAY_MS if commit_delay is None else commit_delay)
+        self._max_batch_size = int(max_batch_size or self.DEFAULT_MAX_BATCH_SIZE)
+        self._statement_cache_size = int(statement_cache_size or self.DEFAULT_STATEMENT_CACHE_SIZE)
+        self._page_size = int(page_size or self.DEFAULT_PAGE_SIZE)
+
+        if self._journal_mode not in SQLiteJournalMode.list():
+            raise ValueError("Invalid journal mode: {}".format(self._journal_mode))
+
+        if self._synchronous not in SQLiteSynchronous.list():
+            raise ValueError("Invalid synchronous level: {}".format(self._synchronous))
 
-    def __init__(self, db_path):
-        self.db_path = db_path if db_path is not None else "vo.db"
-        self.conn = sqlite3.connect(self.db_path)
+        if self._reader_pool_size <= 0 or self._max_batch_size <= 0 or self._commit_delay < 0:
+            raise ValueError("Invalid SQLite pool or group commit settings")
+
+        if self._statement_cache_size <= 0 or self._page_size <= 0:
+            raise ValueError("Statement cache size and page size must be positive")
+
+        self._retention = {}
+        self._retention_last_run = {}
+
+        for table_name, policy in (retention or {}).items():
+            self.set_retention(table_name, **policy)
+
+        self.conn = self._connect()
+        self.conn.execute("PRAGMA journal_mode={}".format(self._journal_mode))
         self.conn.executescript(DB_SCHEMA)
-        self.conn.commit()
 
-    def execute_query(self, query):
-        """Execute the provided SQL query on the database and return the result"""
+        self._write_lock = threading.Lock()
+        self._writer_executor = None
+        self._reader_executor = None
+        self._reader_local = threading.local()
+        self._reader_conns = []
+        self._reader_conns_lock = threading.Lock()
+        self._pending = []
+        self._commit_handle = None
+        self._commit_tasks = set()
 
-        cursor = self.conn.cursor()
-        cursor.execute(query)
-        result = cursor.fetchall()
-        cursor.close()
-        return result
+    @property
+    def journal_mode(self):
+        """Returns the journal mode of the database."""
 
-    def fetch_all_rows(self, table_name):
-        """Fetches all rows of the given table"""
+        return self._journal_mode
 
-        if not table_name.isidentifier():
-            raise ValueError(f"Invalid table name: {table_name}")
+    @property
+    def synchronous(self):
+        """Returns the synchronous level of the database."""
 
-        cursor = self.conn.cursor()
+        return self._synchronous
 
-        query = f"SELECT * FROM {table_name}"
-        cursor.execute(query)
-        rows = cursor.fetchall()
+    @property
+    def page_size(self):
+        """Returns the default number of rows fetched in each page."""
 
-        cursor.close()
+        return self._page_size
 
-        return rows
+    @property
+    def pending(self):
+        """Returns the number of write statements waiting to be committed."""
 
-    def insert_data(self, table_name, data):
-        """Insert the provided data into the specified table"""
+        return len(self._pending)
+
+    def set_retention(self, table_name, max_rows=None, max_age=None):
+        """Sets the maximum number of rows and the maximum age in seconds
+        of the rows of the given table. The age of a row is given by its
+        timestamp column. Both limits are disabled if None."""
+
+        self._check_table_name(table_name)
+
+        if (max_rows is not None and int(max_rows) <= 0) or (max_age is not None and float(max_age) <= 0):
+            raise ValueError("Retention limits must be positive")
+
+        if max_rows is None and max_age is None:
+            self._retention.pop(table_name, None)
+            return
+
+        self._retention[table_name] = {
+            "max_rows": int(max_rows) if max_rows is not None else None,
+            "max_age": float(max_age) if max_age is not None else None
+        }
+
+    def retention(self, table_name):
+        """Returns the retention policy of the given table (None if not set)."""
+
+        policy = self._retention.get(table_name)
+
+        return dict(policy) if policy else None
+
+    def _connect(self):
+        """Opens a new connection to the database in autocommit
+        mode so that transactions are handled explicitly."""
+
+        conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None,
+            cached_statements=self._statement_cache_size)
+        conn.execute("PRAGMA synchronous={}".format(self._synchronous))
+
+        return conn
+
+    def _get_writer_executor(self):
+        """Returns the single thread executor that owns the writer connection."""
+
+        if self._writer_executor is None:
+            self._writer_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="sqlite-writer")
+
+        return self._writer_executor
+
+    def _get_reader_executor(self):
+        """Returns the executor of the reader connections. In-memory databases
+        can not be shared between connections so they are read by the writer."""
+
+        if self.db_path == MEMORY_DB_PATH:
+            return self._get_writer_executor()
+
+        if self._reader_executor is None:
+            self._reader_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._reader_pool_size, thread_name_prefix="sqlite-reader")
+
+        return self._reader_executor
+
+    def _reader_conn(self):
+        """Returns the read-only connection of the current reader thread."""
+
+        if self.db_path == MEMORY_DB_PATH:
+            return self.conn
+
+        conn = getattr(self._reader_local, "conn", None)
+
+        if conn is None:
+            conn = self._connect()
+            conn.execute("PRAGMA query_only=ON")
+            self._reader_local.conn = conn
+
+            with self._reader_conns_lock:
+                self._reader_conns.append(conn)
+
+        return conn
+
+    @classmethod
+    def _check_table_name(cls, table_name):
+        """Raises ValueError if the table name is not a valid identifier."""
 
         if not table_name.isidentifier():
-            raise ValueError("Invalid table name")
+            raise ValueError(f"Invalid table name: {table_name}")
+
+    @classmethod
+    def _insert_query(cls, table_name, data):
+        """Returns the INSERT statement for a row of the given table."""
 
-        cursor = self.conn.cursor()
+        cls._check_table_name(table_name)
         placeholders = ",".join(["?" for i in range(len(data))])
-        query = f"INSERT OR REPLACE INTO {table_name} VALUES ({placeholders})"
-        cursor.execute(query, data)
-        self.conn.commit()
-        cursor.close()
 
-    def create_table_if_not_exists(self, table_name, columns):
-        """Create a table if it doesn't exist."""
+        return f"INSERT OR REPLACE INTO {table_name} VALUES ({placeholders})"
 
-        cursor = self.conn.cursor()
+    @classmethod
+    def _create_table_query(cls, table_name, columns):
+        """Returns the CREATE TABLE statement for the given columns."""
 
-        if not table_name.isidentifier():
-            raise ValueError("Invalid table name")
+        cls._check_table_name(table_name)
 
         for column_name, column_type in columns.items():
             if not column_name.isidentifier():
                 raise ValueError(f"Invalid column name: {column_name}")
-            if not column_type.upper() in {"INTEGER", "TEXT", "REAL", "BLOB", "NUMERIC", "INTEGER PRIMARY KEY"}:
+            if not column_type.upper() in VALID_COLUMN_TYPES:
                 raise ValueError(f"Invalid data type for column {column_name}: {column_type}")
 
         columns_def = ", ".join([f"{name} {dtype}" for name, dtype in columns.items()])
-        query = f"CREATE TABLE IF NOT EXISTS {table_name} ({columns_def})"
 
-        cursor.execute(query)
-        self.conn.commit()
+        return f"CREATE TABLE IF NOT EXISTS {table_name} ({columns_def})"
+
+    def _read(self, query, params):
+        """Runs a query on a reader connection and returns all the rows."""
+
+        cursor = self._reader_conn().execute(query, params)
+
+        try:
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def _read_one(self, query, params):
+        """Runs a query on a reader connection and returns the first row."""
+
+        cursor = self._reader_conn().execute(query, params)
+
+        try:
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+
+    def _open_cursor(self, query, params):
+        """Runs a query on a read-only connection of its own (the writer connection
+        for in-memory databases) and returns the cursor. The cursor and its
+        connection must only be used from the thread that opened them."""
+
+        if self.db_path == MEMORY_DB_PATH:
+            return self.conn.execute(query, params)
+
+        conn = self._connect()
+
+        try:
+            conn.execute("PRAGMA query_only=ON")
+            return conn.execute(query, params)
+        except Exception:
+            conn.close()
+            raise
+
+    def _close_cursor(self, cursor):
+        """Closes a cursor opened by _open_cursor and its connection."""
+
+        conn = cursor.connection
         cursor.close()
+
+        if conn is not self.conn:
+            conn.close()
+
+    @classmethod
+    def _fetch_many(cls, cursor, size):
+        """Fetches the next rows of an open cursor, closing it when exhausted."""
+
+        rows = cursor.fetchmany(size)
+
+        if len(rows) < size:
+            cursor.close()
+
+        return rows
+
+    def _write(self, query, params=()):
+        """Runs a single write statement in its own transaction."""
+
+        with self._write_lock:
+            cursor = self.conn.execute(query, params)
+            cursor.close()
+
+    def _write_script(self, script):
+        """Runs a script of statements separated by semicolons."""
+
+        with self._write_lock:
+            self.conn.executescript(script)
+
+    def _transaction(self, func, args):
+        """Calls func with the writer connection inside a transaction."""
+
+        with self._write_lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+
+            try:
+                result = func(self.conn, *args)
+                self.conn.execute("COMMIT")
+            except Exception:
+                if self.conn.in_transaction:
+                    self.conn.execute("ROLLBACK")
+                raise
+
+        return result
+
+    def _call_reader(self, func, args):
+        """Calls func with the connection of the current reader thread."""
+
+        return func(self._reader_conn(), *args)
+
+    def _write_batch(self, batch):
+        """Runs a batch of (query, params) statements in a single transaction.
+        Returns a list with the number of modified rows of each statement or
+        the exception raised by it. If the transaction can not be committed
+        the exception is propagated and no statement is applied."""
+
+        def execute_batch(conn):
+            results = []
+
+            for query, params in batch:
+                try:
+                    cursor = conn.execute(query, params)
+                    results.append(cursor.rowcount)
+                    cursor.close()
+                except sqlite3.Error as ex:
+                    results.append(ex)
+
+            return results
+
+        return self._transaction(execute_batch, ())
+
+    def execute_query(self, query, params=()):
+        """Execute the provided SQL query on the database and return the result.
+        Blocks the event loop: the query method should be used in async handlers."""
+
+        with self._write_lock:
+            cursor = self.conn.cursor()
+            cursor.execute(query, params)
+            result = cursor.fetchall()
+            cursor.close()
+
+        return result
+
+    def fetch_all_rows(self, table_name):
+        """Fetches all rows of the given table"""
+
+        self._check_table_name(table_name)
+
+        return self.execute_query(f"SELECT * FROM {table_name}")
+
+    def insert_data(self, table_name, data):
+        """Insert the provided data into the specified table"""
+
+        self._write(self._insert_query(table_name, data), data)
+
+    def create_table_if_not_exists(self, table_name, columns):
+        """Create a table if it doesn't exist."""
+
+        self._write(self._create_table_query(table_name, columns))
+
+    async def query(self, query, params=()):
+        """Runs the given SQL query on a reader connection
+        in the executor and returns all the rows."""
+
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(
+            self._get_reader_executor(), self._read, query, params)
+
+    async def fetch_one(self, query, params=()):
+        """Runs the given SQL query and returns the first row (None if there are no rows)."""
+
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(
+            self._get_reader_executor(), self._read_one, query, params)
+
+    async def fetch_page(self, query, params=(), page_size=None, offset=0):
+        """Runs the given SQL query and returns at most page_size rows
+        (the default page size if not set) starting at the given offset."""
+
+        page_size = int(page_size or self._page_size)
+        paged_query = "SELECT * FROM ({}) LIMIT ? OFFSET ?".format(query.strip().rstrip(";"))
+        paged_params = tuple(params) + (page_size, int(offset))
+
+        return await self.query(paged_query, paged_params)
+
+    async def iterate(self, query, params=(), page_size=None):
+        """Runs the given SQL query and yields its rows, fetching them
+        from the cursor one page of page_size rows at a time. The cursor
+        is opened, read and closed in a single dedicated thread."""
+
+        loop = asyncio.get_running_loop()
+        page_size = int(page_size or self._page_size)
+
+        if self.db_path == MEMORY_DB_PATH:
+            executor = self._get_writer_executor()
+        else:
+            executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="sqlite-iterator")
+
+        try:
+            cursor = await loop.run_in_executor(executor, self._open_cursor, query, params)
+
+            try:
+                while True:
+                    rows = await loop.run_in_executor(executor, self._fetch_many, cursor, page_size)
+
+                    for row in rows:
+                        yield row
+
+                    if len(rows) < page_size:
+                        break
+            finally:
+                await loop.run_in_executor(executor, self._close_cursor, cursor)
+        finally:
+            if executor is not self._writer_executor:
+                executor.shutdown(wait=False)
+
+    async def fetch_rows(self, table_name):
+        """Fetches all rows of the given table without blocking the event loop."""
+
+        self._check_table_name(table_name)
+
+        return await self.query(f"SELECT * FROM {table_name}")
+
+    async def execute(self, query, params=()):
+        """Queues a write statement to be committed together with the other statements
+        received within the commit delay. Returns the number of modified rows once
+        the transaction has been committed."""
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((query, params, future))
+
+        if len(self._pending) >= self._max_batch_size or self._commit_delay == 0:
+            self._commit_pending()
+        elif self._commit_handle is None:
+            self._commit_handle = loop.call_later(self._commit_delay / 1000.0, self._commit_pending)
+
+        return await future
+
+    async def insert(self, table_name, data):
+        """Inserts the provided data into the specified table using group
+        commit and applies the retention policy of the table (if any)."""
+
+        await self.execute(self._insert_query(table_name, data), data)
+
+        if table_name in self._retention:
+            await self.apply_retention(table_name)
+
+    @classmethod
+    def _prune(cls, conn, table_name, max_rows, max_age, batch_size):
+        """Deletes up to batch_size of the oldest rows of the given
+        table that exceed the retention limits. Returns the number
+        of deleted rows."""
+
+        delete_query = (
+            f"DELETE FROM {table_name} WHERE rowid IN "
+            f"(SELECT rowid FROM {table_name} WHERE timestamp < ? ORDER BY timestamp LIMIT ?)")
+
+        deleted = 0
+
+        if max_age is not None:
+            cutoff = datetime.datetime.now() - datetime.timedelta(seconds=max_age)
+            cursor = conn.execute(delete_query, (cutoff.isoformat(sep=" "), batch_size))
+            deleted += cursor.rowcount
+
+        if max_rows is not None and deleted < batch_size:
+            row = conn.execute(
+                f"SELECT timestamp FROM {table_name} ORDER BY timestamp DESC LIMIT 1 OFFSET ?",
+                (max_rows - 1,)).fetchone()
+
+            if row is not None:
+                cursor = conn.execute(delete_query, (row[0], batch_size - deleted))
+                deleted += cursor.rowcount
+
+        return deleted
+
+    async def apply_retention(self, table_name, force=False):
+        """Deletes a batch of the rows of the given table that exceed its retention
+        policy. Unless force is set, it runs at most once every RETENTION_INTERVAL_SECS
+        (or right away if the previous run did not delete all the expired rows).
+        Returns the number of deleted rows."""
+
+        policy = self._retention.get(table_name)
+
+        if policy is None:
+            return 0
+
+        now = time.monotonic()
+        last_run = self._retention_last_run.get(table_name)
+
+        if not force and last_run is not None and now - last_run < self.RETENTION_INTERVAL_SECS:
+            return 0
+
+        self._retention_last_run[table_name] = now
+
+        deleted = await self.run_in_transaction(
+            self._prune, table_name, policy["max_rows"], policy["max_age"], self.RETENTION_BATCH_SIZE)
+
+        if deleted >= self.RETENTION_BATCH_SIZE:
+            self._retention_last_run.pop(table_name, None)
+
+        return deleted
+
+    async def create_table(self, table_name, columns):
+        """Creates a table if it doesn't exist without blocking the event loop."""
+
+        query = self._create_table_query(table_name, columns)
+        loop = asyncio.get_running_loop()
+
+        await loop.run_in_executor(self._get_writer_executor(), self._write, query)
+
+    async def execute_script(self, script):
+        """Runs a script of statements separated by semicolons (e.g. a
+        schema) with the writer connection in the writer executor."""
+
+        loop = asyncio.get_running_loop()
+
+        await loop.run_in_executor(self._get_writer_executor(), self._write_script, script)
+
+    async def run_in_transaction(self, func, *args):
+        """Calls func(connection, *args) in the writer executor inside a
+        transaction that is rolled back if func raises an exception.
+        Returns the value returned by func."""
+
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(
+            self._get_writer_executor(), self._transaction, func, args)
+
+    async def run_in_reader(self, func, *args):
+        """Calls func(connection, *args) with a reader connection
+        in the reader executor and returns its result."""
+
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(
+            self._get_reader_executor(), self._call_reader, func, args)
+
+    def _commit_pending(self):
+        """Starts committing the pending write statements in the writer executor."""
+
+        if self._commit_handle is not None:
+            self._commit_handle.cancel()
+            self._commit_handle = None
+
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._commit(batch))
+        self._commit_tasks.add(task)
+        task.add_done_callback(self._commit_tasks.discard)
+
+    async def _commit(self, batch):
+        """Commits a batch of write statements and resolves their futures."""
+
+        loop = asyncio.get_running_loop()
+        statements = [(query, params) for query, params, _ in batch]
+
+        try:
+            results = await loop.run_in_executor(
+                self._get_writer_executor(), self._write_batch, statements)
+        except Exception as ex:
+            results = [ex] * len(batch)
+
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def flush(self):
+        """Commits the pending write statements without waiting for the commit delay."""
+
+        self._commit_pending()
+
+        if self._commit_tasks:
+            await asyncio.gather(*self._commit_tasks, return_exceptions=True)
+
+    async def close(self):
+        """Commits the pending statements and closes all connections."""
+
+        await self.flush()
+
+        loop = asyncio.get_running_loop()
+
+        for executor in (self._reader_executor, self._writer_executor):
+            if executor is not None:
+                await loop.run_in_executor(None, executor.shutdown)
+
+        self._reader_executor = None
+        self._writer_executor = None
+
+        with self._reader_conns_lock:
+            for conn in self._reader_conns:
+                conn.close()
+            self._reader_conns = []
+
+        self._reader_local = threading.local()
+        self.conn.close()
@@ -9,7 +9,7 @@ import asyncio
 import json
 import logging
 import time
-from urllib.parse import urlparse
+from urllib.parse import urlencode, urlparse
 
 import aiocoap
 import reactivex
@@ -323,6 +323,78 @@ class CoAPClient(BaseProtocolClient):
         finally:
             await coap_client.shutdown()
 
+    def is_supported_thing_operation(self, td, op):
+        """Returns True if any of the Thing-level Forms for the given
+        operation is supported in this Protocol Binding client."""
+
+        return self._pick_coap_href(td, td.get_thing_forms(), op=op) is not None
+
+    async def _request_multiple_properties(self, href, code, payload=b"", timeout=None):
+        """Sends a request to the Thing-level Form to read or write multiple
+        Properties and returns the dict of values in the response."""
+
+        coap_client = await aiocoap.Context.create_client_context()
+        if self._credentials:
+            with open(self._credentials, "rb") as file:
+                coap_client.client_credentials.load_from_dict(json.load(file))
+
+        try:
+            msg = aiocoap.Message(code=code, payload=payload, uri=href)
+            request = coap_client.request(await self.sign_request(msg))
+
+            try:
+                response = await asyncio.wait_for(request.response, timeout=timeout)
+            except asyncio.TimeoutError:
+                raise ClientRequestTimeout
+
+            self._assert_success(response)
+
+            return json.loads(response.payload).get("values") if response.payload else None
+        finally:
+            await coap_client.shutdown()
+
+    async def read_multiple_properties(self, td, names, timeout=None):
+        """Reads the values of the given Properties on a remote Thing in a single request.
+        Returns a dict of values indexed by Property name."""
+
+        href = self._pick_coap_href(
+            td, td.get_thing_forms(),
+            op=InteractionVerbs.READ_MULTIPLE_PROPERTIES)
+
+        if href is None:
+            return await super().read_multiple_properties(td, names, timeout=timeout)
+
+        href = "{}&{}".format(href, urlencode({"names": ",".join(names)}))
+
+        return await self._request_multiple_properties(href, aiocoap.Code.GET, timeout=timeout)
+
+    async def read_all_properties(self, td, timeout=None):
+        """Reads the values of all the readable Properties on a remote Thing in a single request.
+        Returns a dict of values indexed by Property name."""
+
+        href = self._pick_coap_href(
+            td, td.get_thing_forms(),
+            op=InteractionVerbs.READ_ALL_PROPERTIES)
+
+        if href is None:
+            return await super().read_all_properties(td, timeout=timeout)
+
+        return await self._request_multiple_properties(href, aiocoap.Code.GET, timeout=timeout)
+
+    async def write_multiple_properties(self, td, values, timeout=None):
+        """Updates the values of the Properties in the given dict on a remote Thing in a single request."""
+
+        href = self._pick_coap_href(
+            td, td.get_thing_forms(),
+            op=InteractionVerbs.WRITE_MULTIPLE_PROPERTIES)
+
+        if href is None:
+            return await super().write_multiple_properties(td, values, timeout=timeout)
+
+        payload = json.dumps({"values": values}).encode("utf-8")
+
+        await self._request_multiple_properties(href, aiocoap.Code.PUT, payload=payload, timeout=timeout)
+
     def on_property_change(self, td, name):
         """Subscribes to property changes on a remote Thing.
         Returns an Observable"""
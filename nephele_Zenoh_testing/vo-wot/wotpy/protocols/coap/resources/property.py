@@ -13,6 +13,7 @@ import aiocoap.error
 import aiocoap.resource
 
 from wotpy.protocols.coap.resources.utils import parse_request_opt_query
+from wotpy.wot.enums import InteractionTypes
 
 JSON_CONTENT_FORMAT = 50
 
@@ -39,7 +40,7 @@ async def get_thing_property(server, request):
     if not url_name_thing or not url_name_prop:
         raise aiocoap.error.BadRequest("Missing query arguments")
 
-    exposed_thing = server.exposed_thing_set.find_by_thing_name(url_name_thing)
+    exposed_thing = server.routing_registry.find_thing(url_name_thing)
 
     if not exposed_thing:
         raise aiocoap.error.NotFound("Thing not found")
@@ -48,13 +49,13 @@ async def get_thing_property(server, request):
     if not valid_creds:
         raise aiocoap.error.Unauthorized("Authentication required")
 
-    try:
-        return next(
-            exposed_thing.properties[key] for key in exposed_thing.properties
-            if exposed_thing.properties[key].url_name == url_name_prop)
-    except StopIteration:
+    route = server.routing_registry.resolve(url_name_thing, url_name_prop, InteractionTypes.PROPERTY)
+
+    if not route:
         raise aiocoap.error.NotFound("Property not found")
 
+    return exposed_thing.properties[route.name]
+
 
 class PropertyResource(aiocoap.resource.ObservableResource):
     """CoAP resource that implements the Property read, write and observe verbs."""
@@ -108,7 +109,7 @@ class PropertyResource(aiocoap.resource.ObservableResource):
             raise aiocoap.error.BadRequest()
 
         query = parse_request_opt_query(request)
-        exposed_thing = self._server.exposed_thing_set.find_by_thing_name(query.get("thing"))
+        exposed_thing = self._server.routing_registry.find_thing(query.get("thing"))
 
         try:
             await exposed_thing.handle_write_property(
@@ -119,3 +120,70 @@ class PropertyResource(aiocoap.resource.ObservableResource):
         response = aiocoap.Message(code=aiocoap.Code.CHANGED)
 
         return response
+
+
+class MultiplePropertiesResource(aiocoap.resource.Resource):
+    """CoAP resource that implements the verbs to read or write multiple Properties at once."""
+
+    def __init__(self, server):
+        super().__init__()
+        self._server = server
+
+    async def _get_exposed_thing(self, request):
+        """Returns the ExposedThing identified by the request arguments."""
+
+        url_name_thing = parse_request_opt_query(request).get("thing")
+
+        if not url_name_thing:
+            raise aiocoap.error.BadRequest("Missing query arguments")
+
+        exposed_thing = self._server.routing_registry.find_thing(url_name_thing)
+
+        if not exposed_thing:
+            raise aiocoap.error.NotFound("Thing not found")
+
+        valid_creds = await self._server._check_credentials(exposed_thing.title, request)
+        if not valid_creds:
+            raise aiocoap.error.Unauthorized("Authentication required")
+
+        return exposed_thing
+
+    async def render_get(self, request):
+        """Returns a CoAP response with the values of the Properties in the comma-separated
+        names query argument (or all the readable Properties if missing)."""
+
+        exposed_thing = await self._get_exposed_thing(request)
+        names = parse_request_opt_query(request).get("names")
+
+        try:
+            if names is None:
+                values = await exposed_thing.read_all_properties()
+            else:
+                values = await exposed_thing.read_multiple_properties(
+                    [name for name in names.split(",") if name])
+        except ValueError as ex:
+            raise aiocoap.error.NotFound(str(ex))
+
+        payload = json.dumps({"values": values}).encode("utf-8")
+        response = aiocoap.Message(code=aiocoap.Code.CONTENT, payload=payload)
+        response.opt.content_format = JSON_CONTENT_FORMAT
+
+        return response
+
+    async def render_put(self, request):
+        """Updates the Properties with the values retrieved from the CoAP request payload."""
+
+        exposed_thing = await self._get_exposed_thing(request)
+        request_payload = json.loads(request.payload)
+
+        if not isinstance(request_payload.get("values"), dict):
+            raise aiocoap.error.BadRequest()
+
+        try:
+            await exposed_thing.handle_write_multiple_properties(request_payload.get("values"))
+        except ValueError as ex:
+            raise aiocoap.error.NotFound(str(ex))
+        except TypeError as ex:
+            raise aiocoap.error.MethodNotAllowed(str(ex))
+
+        return aiocoap.Message(code=aiocoap.Code.CHANGED)
@@ -18,7 +18,7 @@ from wotpy.protocols.coap.authenticator import BaseAuthenticator
 from wotpy.protocols.coap.enums import CoAPSchemes
 from wotpy.protocols.coap.resources.action import ActionResource
 from wotpy.protocols.coap.resources.event import EventResource
-from wotpy.protocols.coap.resources.property import PropertyResource
+from wotpy.protocols.coap.resources.property import PropertyResource, MultiplePropertiesResource
 from wotpy.protocols.enums import Protocols, InteractionVerbs
 from wotpy.protocols.server import BaseProtocolServer
 from wotpy.utils.utils import get_main_ipv4_address
@@ -147,6 +147,26 @@ class CoAPServer(BaseProtocolServer):
 
         return intrct_type_map[interaction.interaction_type](interaction, hostname)
 
+    def build_thing_forms(self, hostname, thing):
+        """Builds and returns the CoAP Thing-level Forms to read
+        and write multiple Properties in a single request."""
+
+        href = "{}://{}:{}/properties?thing={}".format(
+            self.scheme, hostname.rstrip("/").lstrip("/"), self.port, thing.url_name)
+
+        form = Form(
+            interaction=thing,
+            protocol=self.protocol,
+            href=href,
+            content_type=MediaTypes.JSON,
+            op=[
+                InteractionVerbs.READ_ALL_PROPERTIES,
+                InteractionVerbs.READ_MULTIPLE_PROPERTIES,
+                InteractionVerbs.WRITE_MULTIPLE_PROPERTIES
+            ])
+
+        return [form]
+
     def build_base_url(self, hostname, thing):
         """Returns the base URL for the given Thing in the context of this server."""
 
@@ -171,6 +191,10 @@ class CoAPServer(BaseProtocolServer):
             ("property",),
             PropertyResource(self))
 
+        root.add_resource(
+            ("properties",),
+            MultiplePropertiesResource(self))
+
         root.add_resource(
             ("action",),
             ActionResource(self, clear_ms=self._action_clear_ms))
@@ -12,17 +12,27 @@ from tornado.web import HTTPError
 APPLICATION_JSON = "application/json"
 
 
-def get_exposed_thing(server, thing_name):
+def get_exposed_thing(server, thing_name, status_code=500):
     """Utility function to retrieve an ExposedThing
     from the HTTPServer or raise an HTTPError."""
 
     try:
         return server.get_exposed_thing(thing_name)
     except ValueError:
-        raise HTTPError(log_message="Unknown Thing: {}".format(thing_name))
+        raise HTTPError(status_code, log_message="Unknown Thing: {}".format(thing_name))
 
 
-def get_argument(req_handler, name, default=None):
+def get_route(server, thing_name, name, kind):
+    """Utility function to resolve the Route to an Interaction
+    from the HTTPServer or raise an HTTPError."""
+
+    try:
+        return server.resolve_route(thing_name, name, kind)
+    except ValueError:
+        raise HTTPError(log_message="Unknown Interaction: {}/{}".format(thing_name, name))
+
+
+def get_argument(req_handler, name, default=None, status_code=500):
     """Returns an argument extracted from the request.
     Interprets the body as JSON if the Content-Type is application/json.
     Reverts to the default Tornado get_argument otherwise."""
@@ -33,10 +43,10 @@ def get_argument(req_handler, name, default=None):
     try:
         parsed_body = json.loads(req_handler.request.body)
     except Exception as ex:
-        raise HTTPError(log_message="Error decoding JSON: {}".format(ex))
+        raise HTTPError(status_code, log_message="Error decoding JSON: {}".format(ex))
 
     if not isinstance(parsed_body, dict):
-        raise HTTPError(log_message="Not a JSON object: {}".format(parsed_body))
+        raise HTTPError(status_code, log_message="Not a JSON object: {}".format(parsed_body))
 
     return parsed_body.get(name, default)
 
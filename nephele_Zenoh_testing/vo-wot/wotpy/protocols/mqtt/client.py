@@ -595,6 +595,109 @@ class MQTTClient(BaseProtocolClient):
             await self._disconnect_client(broker_read, ref_id)
             broker_obsv != broker_read and (await self._disconnect_client(broker_obsv, ref_id))
 
+    def is_supported_thing_operation(self, td, op):
+        """Returns True if any of the Thing-level Forms for the given
+        operation is supported in this Protocol Binding client."""
+
+        return self._pick_mqtt_href(td, td.get_thing_forms(), op=op) is not None
+
+    async def _request_multiple_properties(self, href, request_data, timeout=None,
+                                           qos_publish=QOS_2, qos_subscribe=QOS_1):
+        """Publishes a request to read or write multiple Properties and
+        waits for the response with the same ID. Returns the response values."""
+
+        timeout = timeout if timeout else self._timeout_default
+        ref_id = uuid.uuid4().hex
+
+        parsed_href = self._parse_href(href)
+        broker_url = parsed_href["broker_url"]
+
+        topic_request = parsed_href["topic"]
+        topic_response = PropertyMQTTHandler.to_responses_topic(topic_request)
+
+        request_data = dict(request_data, id=uuid.uuid4().hex)
+
+        try:
+            await self._init_client(broker_url, ref_id)
+            await self._subscribe(broker_url, topic_response, qos_subscribe)
+
+            request_payload = json.dumps(request_data).encode()
+
+            await self._publish(broker_url, topic_request, request_payload, qos_publish)
+
+            ini = time.time()
+
+            while True:
+                self._logr.debug(
+                    "Checking multiple Properties response topic: {}".format(topic_response))
+
+                if timeout and (time.time() - ini) > timeout:
+                    self._logr.warning(
+                        "Timeout on multiple Properties request: {}".format(topic_response))
+                    raise ClientRequestTimeout
+
+                msg_match = self._next_match(
+                    broker_url, topic_response,
+                    lambda item: item[1].get("id") == request_data.get("id"))
+
+                if not msg_match:
+                    await self._wait_on_message(broker_url, topic_response)
+                    continue
+
+                msg_id, msg_data, msg_time = msg_match
+
+                if msg_data.get("error", None) is not None:
+                    raise Exception(msg_data.get("error"))
+                else:
+                    return msg_data.get("values")
+        finally:
+            await self._disconnect_client(broker_url, ref_id)
+
+    async def read_multiple_properties(self, td, names, timeout=None, **kwargs):
+        """Reads the values of the given Properties on a remote Thing in a single message.
+        Returns a dict of values indexed by Property name."""
+
+        href = self._pick_mqtt_href(
+            td, td.get_thing_forms(),
+            op=InteractionVerbs.READ_MULTIPLE_PROPERTIES)
+
+        if href is None:
+            return await super().read_multiple_properties(td, names, timeout=timeout)
+
+        return await self._request_multiple_properties(
+            href, {"action": "readmultiple", "names": list(names)},
+            timeout=timeout, **kwargs)
+
+    async def read_all_properties(self, td, timeout=None, **kwargs):
+        """Reads the values of all the readable Properties on a remote Thing in a single message.
+        Returns a dict of values indexed by Property name."""
+
+        href = self._pick_mqtt_href(
+            td, td.get_thing_forms(),
+            op=InteractionVerbs.READ_ALL_PROPERTIES)
+
+        if href is None:
+            return await super().read_all_properties(td, timeout=timeout)
+
+        return await self._request_multiple_properties(
+            href, {"action": "readall"},
+            timeout=timeout, **kwargs)
+
+    async def write_multiple_properties(self, td, values, timeout=None, **kwargs):
+        """Updates the values of the Properties in the given dict on a remote Thing in a single message.
+        Unlike write_property, this coroutine waits for the response of the remote Thing."""
+
+        href = self._pick_mqtt_href(
+            td, td.get_thing_forms(),
+            op=InteractionVerbs.WRITE_MULTIPLE_PROPERTIES)
+
+        if href is None:
+            return await super().write_multiple_properties(td, values, timeout=timeout)
+
+        await self._request_multiple_properties(
+            href, {"action": "writemultiple", "values": values},
+            timeout=timeout, **kwargs)
+
     def _build_subscribe(self, broker_url, topic, next_item_builder, qos):
         """Builds the subscribe function that should be passed when
         constructing an Observable to listen for messages on an MQTT topic."""
@@ -23,6 +23,9 @@ from wotpy.protocols.ws.messages import \
 from wotpy.protocols.ws.schemas import \
     SCHEMA_PARAMS_READ_PROPERTY, \
     SCHEMA_PARAMS_WRITE_PROPERTY, \
+    SCHEMA_PARAMS_READ_ALL_PROPERTIES, \
+    SCHEMA_PARAMS_READ_MULTIPLE_PROPERTIES, \
+    SCHEMA_PARAMS_WRITE_MULTIPLE_PROPERTIES, \
     SCHEMA_PARAMS_DISPOSE, \
     SCHEMA_PARAMS_INVOKE_ACTION, \
     SCHEMA_PARAMS_ON_PROPERTY_CHANGE, \
@@ -167,6 +170,66 @@ class WebsocketHandler(websocket.WebSocketHandler):
         res = WebsocketMessageResponse(result=None, msg_id=req.id)
         self.write_message(res.to_json())
 
+    async def _handle_read_all_properties(self, req):
+        """Handler for the 'read_all_properties' method."""
+
+        params = req.params
+
+        try:
+            validate(params, SCHEMA_PARAMS_READ_ALL_PROPERTIES)
+        except ValidationError as ex:
+            self._write_error(str(ex), WebsocketErrors.INVALID_METHOD_PARAMS, msg_id=req.id)
+            return
+
+        try:
+            values = await self.exposed_thing.read_all_properties()
+        except Exception as ex:
+            self._write_error(str(ex), WebsocketErrors.INTERNAL_ERROR, msg_id=req.id)
+            return
+
+        res = WebsocketMessageResponse(result=values, msg_id=req.id)
+        self.write_message(res.to_json())
+
+    async def _handle_read_multiple_properties(self, req):
+        """Handler for the 'read_multiple_properties' method."""
+
+        params = req.params
+
+        try:
+            validate(params, SCHEMA_PARAMS_READ_MULTIPLE_PROPERTIES)
+        except ValidationError as ex:
+            self._write_error(str(ex), WebsocketErrors.INVALID_METHOD_PARAMS, msg_id=req.id)
+            return
+
+        try:
+            values = await self.exposed_thing.read_multiple_properties(params["names"])
+        except Exception as ex:
+            self._write_error(str(ex), WebsocketErrors.INTERNAL_ERROR, msg_id=req.id)
+            return
+
+        res = WebsocketMessageResponse(result=values, msg_id=req.id)
+        self.write_message(res.to_json())
+
+    async def _handle_write_multiple_properties(self, req):
+        """Handler for the 'write_multiple_properties' method."""
+
+        params = req.params
+
+        try:
+            validate(params, SCHEMA_PARAMS_WRITE_MULTIPLE_PROPERTIES)
+        except ValidationError as ex:
+            self._write_error(str(ex), WebsocketErrors.INVALID_METHOD_PARAMS, msg_id=req.id)
+            return
+
+        try:
+            await self.exposed_thing.handle_write_multiple_properties(params["values"])
+        except Exception as ex:
+            self._write_error(str(ex), WebsocketErrors.INTERNAL_ERROR, msg_id=req.id)
+            return
+
+        res = WebsocketMessageResponse(result=None, msg_id=req.id)
+        self.write_message(res.to_json())
+
     async def _handle_invoke_action(self, req):
         """Handler for the 'invoke_action' method."""
 
@@ -276,6 +339,9 @@ class WebsocketHandler(websocket.WebSocketHandler):
         handler_map = {
             WebsocketMethods.READ_PROPERTY: self._handle_get_property,
             WebsocketMethods.WRITE_PROPERTY: self._handle_set_property,
+            WebsocketMethods.READ_ALL_PROPERTIES: self._handle_read_all_properties,
+            WebsocketMethods.READ_MULTIPLE_PROPERTIES: self._handle_read_multiple_properties,
+            WebsocketMethods.WRITE_MULTIPLE_PROPERTIES: self._handle_write_multiple_properties,
             WebsocketMethods.INVOKE_ACTION: self._handle_invoke_action,
             WebsocketMethods.ON_PROPERTY_CHANGE: self._handle_on_property_change,
             WebsocketMethods.ON_TD_CHANGE: self._handle_on_td_change,
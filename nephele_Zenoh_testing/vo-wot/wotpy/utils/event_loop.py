@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Functions to select and tune the event loop that runs the WoT runtime.
+"""
+
+import asyncio
+import concurrent.futures
+import importlib
+
+from wotpy.utils.enums import EnumListMixin
+
+
+class EventLoopPolicies(EnumListMixin):
+    """Enumeration of the supported event loop implementations."""
+
+    ASYNCIO = "asyncio"
+    UVLOOP = "uvloop"
+
+
+def set_event_loop_policy(policy):
+    """Installs the event loop policy with the given name.
+    Must be called before the event loop is created.
+    Raises ImportError if uvloop is selected but it is not installed."""
+
+    if policy not in EventLoopPolicies.list():
+        raise ValueError("Invalid event loop policy: {}".format(policy))
+
+    if policy == EventLoopPolicies.UVLOOP:
+        uvloop = importlib.import_module("uvloop")
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    else:
+        asyncio.set_event_loop_policy(asyncio.DefaultEventLoopPolicy())
+
+
+def new_event_loop(executor_size=None, slow_callback_duration=None):
+    """Creates a new event loop with the current policy and sets it as the current loop.
+    The default executor (used by run_in_executor) is limited to executor_size threads.
+    If slow_callback_duration (in ms) is given the loop runs in debug mode and logs
+    the callbacks that block it for longer than that."""
+
+    loop = asyncio.new_event_loop()
+
+    if executor_size is not None:
+        if executor_size < 1:
+            raise ValueError("Invalid executor size: {}".format(executor_size))
+
+        loop.set_default_executor(concurrent.futures.ThreadPoolExecutor(
+            max_workers=executor_size, thread_name_prefix="wotpy-loop"))
+
+    if slow_callback_duration is not None:
+        loop.set_debug(True)
+        loop.slow_callback_duration = slow_callback_duration / 1000.0
+
+    asyncio.set_event_loop(loop)
+
+    return loop
@@ -7,6 +7,8 @@ Dictionaries and classes defined under the W3C WoT Scripting API specification.
 .. autosummary::
     :toctree: _wot
 
+    wotpy.wot.catalogue
+    wotpy.wot.cluster
     wotpy.wot.consumed
     wotpy.wot.dictionaries
     wotpy.wot.exposed
@@ -15,6 +17,7 @@ Dictionaries and classes defined under the W3C WoT Scripting API specification.
     wotpy.wot.events
     wotpy.wot.form
     wotpy.wot.interaction
+    wotpy.wot.routing
     wotpy.wot.servient
     wotpy.wot.td
     wotpy.wot.thing
@@ -0,0 +1,210 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Classes that cache the serialized documents served by the TD catalogue of a servient.
+"""
+
+import gzip
+import hashlib
+import json
+
+from wotpy.wot.td import ThingDescription
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ENCODING_GZIP = "gzip"
+ENCODING_BROTLI = "br"
+ENCODING_IDENTITY = "identity"
+
+
+def is_brotli_supported():
+    """Returns True if the optional brotli package is installed."""
+
+    return brotli is not None
+
+
+def parse_accept_encoding(header):
+    """Returns the set of content codings accepted by the given Accept-Encoding header."""
+
+    accepted = set()
+
+    for item in (header or "").split(","):
+        parts = [part.strip() for part in item.split(";")]
+        coding = parts[0].lower()
+
+        if not coding:
+            continue
+
+        quality = next((part[2:] for part in parts[1:] if part.startswith("q=")), "1")
+
+        try:
+            if float(quality) <= 0:
+                continue
+        except ValueError:
+            continue
+
+        accepted.add(coding)
+
+    return accepted
+
+
+class EncodedDocument:
+    """JSON document serialized once, with a strong ETag and
+    compressed variants that are built the first time they are requested."""
+
+    GZIP_LEVEL = 6
+    BROTLI_QUALITY = 5
+
+    def __init__(self, doc):
+        self._body = json.dumps(doc).replace("</", "<\\/").encode("utf8")
+        self._digest = hashlib.sha256(self._body).hexdigest()[:32]
+        self._variants = {ENCODING_IDENTITY: self._body}
+
+    @property
+    def body(self):
+        """Returns the uncompressed JSON document as bytes."""
+
+        return self._body
+
+    def etag(self, encoding=ENCODING_IDENTITY):
+        """Returns the strong ETag of the given encoded representation."""
+
+        if encoding == ENCODING_IDENTITY:
+            return '"{}"'.format(self._digest)
+
+        return '"{}-{}"'.format(self._digest, encoding)
+
+    @property
+    def etags(self):
+        """Returns the ETags of all the possible representations."""
+
+        return [self.etag(encoding) for encoding in (ENCODING_IDENTITY, ENCODING_GZIP, ENCODING_BROTLI)]
+
+    def negotiate(self, accept_encoding):
+        """Returns the best encoding for the given Accept-Encoding header."""
+
+        accepted = parse_accept_encoding(accept_encoding)
+
+        if is_brotli_supported() and (ENCODING_BROTLI in accepted or "*" in accepted):
+            return ENCODING_BROTLI
+
+        if ENCODING_GZIP in accepted or "*" in accepted:
+            return ENCODING_GZIP
+
+        return ENCODING_IDENTITY
+
+    def encode(self, encoding):
+        """Returns the document compressed with the given encoding."""
+
+        if encoding not in self._variants:
+            if encoding == ENCODING_GZIP:
+                self._variants[encoding] = gzip.compress(self._body, compresslevel=self.GZIP_LEVEL, mtime=0)
+            elif encoding == ENCODING_BROTLI and is_brotli_supported():
+                self._variants[encoding] = brotli.compress(self._body, quality=self.BROTLI_QUALITY)
+            else:
+                raise ValueError("Unsupported encoding: {}".format(encoding))
+
+        return self._variants[encoding]
+
+
+class TDCatalogue:
+    """Cache of the serialized TD documents of the enabled ExposedThings of a servient.
+    Documents are only rebuilt when a Thing is modified, its base URL changes
+    or the set of enabled Things changes, and each change of the served
+    content increments the version of the catalogue."""
+
+    def __init__(self, servient):
+        self._servient = servient
+        self._version = 0
+        self._state = None
+        self._things = {}
+        self._catalogues = {}
+
+    @property
+    def version(self):
+        """Returns the version of the catalogue as of the last refresh."""
+
+        return self._version
+
+    def _thing_state(self, exp_thing):
+        """Returns the values that determine the TD document of the given ExposedThing."""
+
+        return exp_thing.thing.revision, self._servient.get_thing_base_url(exp_thing)
+
+    def refresh(self):
+        """Increments the version and discards the cached documents if the
+        content of the catalogue has changed. Returns the current version."""
+
+        state = tuple(
+            (exp_thing.thing.url_name, exp_thing.thing.title, id(exp_thing.thing)) + self._thing_state(exp_thing)
+            for exp_thing in self._servient.enabled_exposed_things)
+
+        if state == self._state:
+            return self._version
+
+        self._state = state
+        self._version += 1
+        self._catalogues = {}
+
+        names = {item[0] for item in state}
+        self._things = {key: val for key, val in self._things.items() if key in names}
+
+        return self._version
+
+    def _thing_doc(self, exp_thing, include_empty_base=False):
+        """Returns the TD document of the given ExposedThing including its base URL."""
+
+        td_doc = ThingDescription.from_thing(exp_thing.thing).to_dict()
+        base_url = self._servient.get_thing_base_url(exp_thing)
+
+        if base_url or include_empty_base:
+            td_doc.update({"base": base_url})
+
+        return td_doc
+
+    def thing_document(self, thing_url_name):
+        """Returns the EncodedDocument with the TD of the
+        given ExposedThing or None if it can't be found."""
+
+        self.refresh()
+
+        exp_thing = self._servient.exposed_thing_set.find_by_thing_name(thing_url_name)
+
+        if exp_thing is None:
+            return None
+
+        state = (id(exp_thing.thing),) + self._thing_state(exp_thing)
+        cached = self._things.get(exp_thing.thing.url_name)
+
+        if cached and cached[0] == state:
+            return cached[1]
+
+        document = EncodedDocument(self._thing_doc(exp_thing))
+        self._things[exp_thing.thing.url_name] = (state, document)
+
+        return document
+
+    def catalogue_document(self, expanded=False):
+        """Returns the EncodedDocument of the whole catalogue, which contains either the
+        expanded TDs or the URL paths of the TDs of the enabled ExposedThings."""
+
+        self.refresh()
+
+        if expanded not in self._catalogues:
+            doc = {}
+
+            for exp_thing in self._servient.enabled_exposed_things:
+                if expanded:
+                    val = self._thing_doc(exp_thing, include_empty_base=True)
+                else:
+                    val = "/{}".format(exp_thing.thing.url_name)
+
+                doc[exp_thing.thing.title] = val
+
+            self._catalogues[expanded] = EncodedDocument(doc)
+
+        return self._catalogues[expanded]
@@ -109,6 +109,8 @@ class ThingFragment(WotBaseDict):
         if name_camel in self.Meta.fields_readonly:
             raise AttributeError("Can't set attribute {}".format(name))
 
+        self._dict = None
+
         if name_camel in self.Meta.fields_str:
             self._init[name_camel] = value
             return
@@ -7,7 +7,11 @@ ExposedThing and related entities.
 .. autosummary::
     :toctree: _exposed
 
+    wotpy.wot.exposed.action_engine
+    wotpy.wot.exposed.change_policy
+    wotpy.wot.exposed.event_dispatcher
     wotpy.wot.exposed.interaction_map
+    wotpy.wot.exposed.property_store
     wotpy.wot.exposed.thing
     wotpy.wot.exposed.thing_set
 """
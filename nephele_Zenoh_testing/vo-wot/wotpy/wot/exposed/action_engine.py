@@ -0,0 +1,346 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Classes that execute the Action handlers of an ExposedThing.
+"""
+
+import asyncio
+import collections
+import concurrent.futures
+import inspect
+import time
+
+from wotpy.utils.enums import EnumListMixin
+from wotpy.utils.utils import to_camel
+
+
+class ActionExecutionModes(EnumListMixin):
+    """Enumeration of the places where an Action handler can be executed."""
+
+    LOOP = "loop"
+    THREAD = "thread"
+    PROCESS = "process"
+
+
+class ActionRejectPolicies(EnumListMixin):
+    """Enumeration of the policies applied to new invocations when the wait queue is full."""
+
+    REJECT = "reject"
+    DROP_OLDEST = "dropOldest"
+
+
+class ActionRejectedException(Exception):
+    """Exception raised when an Action invocation is rejected because the wait queue is full."""
+
+    pass
+
+
+async def _await(awaitable):
+    """Awaits the given awaitable and returns its result."""
+
+    return await awaitable
+
+
+def _call_handler(handler, params, loop=None):
+    """Calls an Action handler outside of the event loop of the servient.
+    Coroutines are scheduled on the given loop (the loop of the servient in
+    thread mode) so that they can use the ExposedThing safely, or run to
+    completion in a new event loop if no loop is given (process mode)."""
+
+    result = handler(params)
+
+    if not inspect.isawaitable(result):
+        return result
+
+    if loop is None:
+        return asyncio.run(_await(result))
+
+    return asyncio.run_coroutine_threadsafe(_await(result), loop).result()
+
+
+class ActionExecutionPolicy:
+    """Policy that defines how the invocations of an Action are executed.
+    Handlers run on the event loop, in a pool of threads or in a pool of processes.
+    At most max_concurrency invocations run at the same time and up to
+    queue_size invocations wait for a free slot (no limits by default).
+    When the queue is full the new invocation is rejected, or the oldest
+    waiting invocation is rejected to make room for the new one."""
+
+    FIELDS = ("mode", "max_concurrency", "queue_size", "reject_policy")
+
+    def __init__(self, mode=ActionExecutionModes.LOOP, max_concurrency=None,
+                 queue_size=None, reject_policy=ActionRejectPolicies.REJECT):
+        if mode not in ActionExecutionModes.list():
+            raise ValueError("Invalid execution mode: {}".format(mode))
+
+        if reject_policy not in ActionRejectPolicies.list():
+            raise ValueError("Invalid reject policy: {}".format(reject_policy))
+
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("Invalid max concurrency: {}".format(max_concurrency))
+
+        if queue_size is not None and queue_size < 0:
+            raise ValueError("Invalid queue size: {}".format(queue_size))
+
+        self.mode = mode
+        self.max_concurrency = max_concurrency
+        self.queue_size = queue_size
+        self.reject_policy = reject_policy
+
+    @classmethod
+    def build(cls, policy):
+        """Builds an ActionExecutionPolicy from a dict with camelCase or snake_case keys
+        (e.g. the executionPolicy of an Action in the TD). Returns policy objects as is."""
+
+        if policy is None or isinstance(policy, cls):
+            return policy
+
+        fields_camel = {to_camel(name): name for name in cls.FIELDS}
+        unknown = [key for key in policy if to_camel(key) not in fields_camel]
+
+        if unknown:
+            raise ValueError("Unknown execution policy fields: {}".format(unknown))
+
+        return cls(**{fields_camel[to_camel(key)]: val for key, val in policy.items()})
+
+    def to_dict(self):
+        """Returns the camelCase dict representation of this policy."""
+
+        return {
+            to_camel(name): getattr(self, name)
+            for name in self.FIELDS
+            if getattr(self, name) is not None
+        }
+
+
+class ActionPools:
+    """Pools of threads and processes shared by the Action handlers of a servient.
+    Each pool is created the first time an Action needs it."""
+
+    def __init__(self, thread_pool_size=None, process_pool_size=None):
+        self._thread_pool_size = thread_pool_size
+        self._process_pool_size = process_pool_size
+        self._thread_pool = None
+        self._process_pool = None
+
+    @property
+    def thread_pool(self):
+        """Returns the pool of threads used by the Actions in thread mode."""
+
+        if self._thread_pool is None:
+            self._thread_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._thread_pool_size, thread_name_prefix="wotpy-action")
+
+        return self._thread_pool
+
+    @property
+    def process_pool(self):
+        """Returns the pool of processes used by the Actions in process mode."""
+
+        if self._process_pool is None:
+            self._process_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._process_pool_size)
+
+        return self._process_pool
+
+    def executor(self, mode):
+        """Returns the pool for the given execution mode (None for the event loop)."""
+
+        if mode == ActionExecutionModes.THREAD:
+            return self.thread_pool
+
+        if mode == ActionExecutionModes.PROCESS:
+            return self.process_pool
+
+        return None
+
+    def shutdown(self, wait=False):
+        """Shuts down the pools that have been created."""
+
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown(wait=wait, cancel_futures=True)
+
+        self._thread_pool = None
+        self._process_pool = None
+
+
+class ActionExecutor:
+    """Runs the invocations of an Action according to its execution policy,
+    queuing the invocations that exceed the concurrency limit.
+    Keeps metrics of the queue and the execution time of the invocations."""
+
+    def __init__(self, policy=None, pools=None):
+        self._policy = policy or ActionExecutionPolicy()
+        self._pools = pools
+        self._running = 0
+        self._waiting = collections.deque()
+        self._invocations = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._max_queue_depth = 0
+        self._total_time = 0.0
+        self._last_time = None
+        self._max_time = None
+
+    @property
+    def policy(self):
+        """Returns the ActionExecutionPolicy of this executor."""
+
+        return self._policy
+
+    @policy.setter
+    def policy(self, policy):
+        """Sets the ActionExecutionPolicy of this executor.
+        The new limits apply to the waiting invocations."""
+
+        self._policy = policy or ActionExecutionPolicy()
+
+        while self._waiting and self._has_free_slot():
+            self._grant_slot()
+
+        self._reject_overflow()
+
+    @property
+    def running(self):
+        """Returns the number of invocations that are being executed."""
+
+        return self._running
+
+    @property
+    def queue_depth(self):
+        """Returns the number of invocations waiting for a free slot."""
+
+        return len(self._waiting)
+
+    @property
+    def metrics(self):
+        """Returns a dict with the metrics of the invocations of the Action.
+        Execution times are expressed in milliseconds."""
+
+        finished = self._completed + self._failed
+
+        return {
+            "mode": self._policy.mode,
+            "running": self._running,
+            "queue_depth": len(self._waiting),
+            "max_queue_depth": self._max_queue_depth,
+            "invocations": self._invocations,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "last_execution_time": self._last_time,
+            "max_execution_time": self._max_time,
+            "mean_execution_time": self._total_time / finished if finished else None
+        }
+
+    def _has_free_slot(self):
+        """Returns True if a new invocation can start running."""
+
+        limit = self._policy.max_concurrency
+
+        return limit is None or self._running < limit
+
+    def _grant_slot(self):
+        """Hands a free slot to the oldest waiting invocation."""
+
+        waiter = self._waiting.popleft()
+
+        if not waiter.done():
+            self._running += 1
+            waiter.set_result(None)
+
+    def _reject_waiter(self, waiter):
+        """Rejects a waiting invocation."""
+
+        self._rejected += 1
+
+        if not waiter.done():
+            waiter.set_exception(ActionRejectedException("Action invocation dropped from the queue"))
+
+    def _reject_overflow(self):
+        """Rejects the oldest waiting invocations that do not fit in the queue."""
+
+        queue_size = self._policy.queue_size
+
+        while queue_size is not None and len(self._waiting) > queue_size:
+            self._reject_waiter(self._waiting.popleft())
+
+    async def _acquire(self):
+        """Waits until the invocation can start running.
+        Raises ActionRejectedException if the wait queue is full."""
+
+        if not self._waiting and self._has_free_slot():
+            self._running += 1
+            return
+
+        queue_size = self._policy.queue_size
+
+        if queue_size is not None and len(self._waiting) >= queue_size:
+            if self._policy.reject_policy != ActionRejectPolicies.DROP_OLDEST or not self._waiting:
+                self._rejected += 1
+                raise ActionRejectedException("Action invocation queue is full")
+
+            self._reject_waiter(self._waiting.popleft())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiting.append(waiter)
+        self._max_queue_depth = max(self._max_queue_depth, len(self._waiting))
+
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled() and waiter.exception() is None:
+                self._release()
+            elif waiter in self._waiting:
+                self._waiting.remove(waiter)
+
+            raise
+
+    def _release(self):
+        """Frees the slot of a finished invocation."""
+
+        self._running -= 1
+
+        while self._waiting and self._has_free_slot():
+            self._grant_slot()
+
+    async def _execute(self, handler, params):
+        """Runs the handler on the event loop or in the pool of the execution mode."""
+
+        executor = self._pools.executor(self._policy.mode) if self._pools else None
+
+        if executor is None:
+            result = handler(params)
+            return await result if inspect.isawaitable(result) else result
+
+        loop = asyncio.get_running_loop()
+        handler_loop = loop if self._policy.mode == ActionExecutionModes.THREAD else None
+
+        return await loop.run_in_executor(executor, _call_handler, handler, params, handler_loop)
+
+    async def submit(self, handler, params):
+        """Executes the handler with the given parameters when there is a free slot.
+        Raises ActionRejectedException if the invocation is rejected."""
+
+        self._invocations += 1
+
+        await self._acquire()
+
+        started = time.perf_counter()
+
+        try:
+            result = await self._execute(handler, params)
+            self._completed += 1
+            return result
+        except BaseException:
+            self._failed += 1
+            raise
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self._total_time += elapsed
+            self._last_time = elapsed
+            self._max_time = elapsed if self._max_time is None else max(self._max_time, elapsed)
+            self._release()
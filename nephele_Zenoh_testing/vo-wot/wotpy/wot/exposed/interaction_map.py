@@ -8,9 +8,10 @@ Classes that represent Interaction instances accessed on a ExposedThing.
 from collections import UserDict
 
 from reactivex.scheduler.eventloop import IOLoopScheduler
-from slugify import slugify
 from tornado import ioloop
 
+from wotpy.wot.exposed.event_dispatcher import EventDispatcher
+
 
 class ExposedThingInteractionDict(UserDict):
     """A dictionary that provides lazy access to the objects that implement
@@ -24,7 +25,9 @@ class ExposedThingInteractionDict(UserDict):
         """Takes a case-insensitive URL-safe interaction name and returns
         the actual name in the interaction dict."""
 
-        return next((key for key in self.interaction_dict.keys() if slugify(key) == slugify(name)), None)
+        name_normalized = self._exposed_thing.thing.normalize_interaction_name(name)
+
+        return name_normalized if name_normalized in self.interaction_dict else None
 
     def __getitem__(self, name):
         """Lazily build and return an object that implements the Interaction interface."""
@@ -129,6 +132,62 @@ class ExposedThingProperty:
 
         await self._exposed_thing.write_property(self._name, value)
 
+    @property
+    def sample(self):
+        """Returns the PropertySample (value, version and timestamp)
+        of the last write of this Property or None if never written."""
+
+        return self._exposed_thing.property_store.sample(self._name)
+
+    @property
+    def version(self):
+        """Returns the version of the last write of this Property (0 if never written)."""
+
+        sample = self.sample
+
+        return sample.version if sample else 0
+
+    def since(self, version):
+        """Returns the list of PropertySamples from the history
+        of this Property that were written after the given version."""
+
+        return self._exposed_thing.property_store.since(self._name, version)
+
+    def last(self, count):
+        """Returns the list of the last count PropertySamples from the history of this Property."""
+
+        return self._exposed_thing.property_store.last(self._name, count)
+
+    @property
+    def history_size(self):
+        """Returns the maximum number of samples kept in the history of this Property."""
+
+        return self._exposed_thing.property_store.history_size(self._name)
+
+    @history_size.setter
+    def history_size(self, size):
+        """Sets the maximum number of samples kept in the history of this Property."""
+
+        self._exposed_thing.property_store.set_history_size(self._name, size)
+
+    @property
+    def change_policy(self):
+        """Returns the PropertyChangePolicy that filters the changes published by this Property."""
+
+        return self._exposed_thing.get_property_change_policy(self._name)
+
+    @change_policy.setter
+    def change_policy(self, policy):
+        """Sets the PropertyChangePolicy (or dict) that filters the changes published by this Property."""
+
+        self._exposed_thing.set_property_change_policy(self._name, policy)
+
+    @property
+    def subscriber_count(self):
+        """Returns the number of subscribers to the changes of this property."""
+
+        return self._exposed_thing.subscriber_count(EventDispatcher.Kinds.PROPERTY_CHANGE, self._name)
+
     def subscribe(self, *args, **kwargs):
         """Subscribe to an stream of events emitted when the property value changes."""
 
@@ -164,6 +223,25 @@ class ExposedThingAction:
         result = await self._exposed_thing.invoke_action(self._name, input_value)
         return result
 
+    @property
+    def execution_policy(self):
+        """Returns the ActionExecutionPolicy that defines how this Action is executed."""
+
+        return self._exposed_thing.get_action_execution_policy(self._name)
+
+    @execution_policy.setter
+    def execution_policy(self, policy):
+        """Sets the ActionExecutionPolicy (or dict) that defines how this Action is executed."""
+
+        self._exposed_thing.set_action_execution_policy(self._name, policy)
+
+    @property
+    def metrics(self):
+        """Returns a dict with the queue depth, the execution times
+        and the invocation counters of this Action."""
+
+        return self._exposed_thing.action_metrics(self._name)
+
 
 class ExposedThingEvent:
     """The ThingEvent interface implementation for ExposedThing objects."""
@@ -181,6 +259,12 @@ class ExposedThingEvent:
 
         return getattr(self._exposed_thing.thing.events[self._name], name)
 
+    @property
+    def subscriber_count(self):
+        """Returns the number of subscribers to the emissions of this event."""
+
+        return self._exposed_thing.subscriber_count(EventDispatcher.Kinds.EVENT, self._name)
+
     def subscribe(self, *args, **kwargs):
         """Subscribe to an stream of emissions of this event."""
 
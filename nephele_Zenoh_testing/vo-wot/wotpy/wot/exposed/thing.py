@@ -5,17 +5,17 @@
 Classes that represent Things exposed by a servient.
 """
 import asyncio
+import time
 
 import reactivex
 from reactivex.scheduler.eventloop import IOLoopScheduler
-from reactivex.subject import Subject
-from reactivex import operators as ops
 from tornado import ioloop
 
 from wotpy.utils.enums import EnumListMixin
-from wotpy.utils.utils import flatten, to_camel
+from wotpy.utils.utils import to_camel
+from wotpy.wot.cluster import ClusterMessageTypes
 from wotpy.wot.dictionaries.interaction import PropertyFragmentDict, ActionFragmentDict, EventFragmentDict
-from wotpy.wot.enums import DefaultThingEvent, TDChangeMethod, TDChangeType
+from wotpy.wot.enums import TDChangeMethod, TDChangeType
 from wotpy.wot.events import \
     EmittedEvent, \
     PropertyChangeEmittedEvent, \
@@ -24,10 +24,14 @@ from wotpy.wot.events import \
     PropertyChangeEventInit, \
     ActionInvocationEventInit, \
     ThingDescriptionChangeEventInit
+from wotpy.wot.exposed.action_engine import ActionExecutionPolicy, ActionExecutor
+from wotpy.wot.exposed.change_policy import PropertyChangePolicy, PropertyChangeFilter
+from wotpy.wot.exposed.event_dispatcher import EventDispatcher
 from wotpy.wot.exposed.interaction_map import \
     ExposedThingEventDict, \
     ExposedThingActionDict, \
     ExposedThingPropertyDict
+from wotpy.wot.exposed.property_store import PropertyStore
 from wotpy.wot.interaction import Property, Action, Event
 from wotpy.wot.td import ThingDescription
 from wotpy.wot.thing import Thing
@@ -45,18 +49,19 @@ class ExposedThing:
         INVOKE_ACTION = "invoke_action"
         OBSERVE = "observe"
 
-    class InteractionStateKeys(EnumListMixin):
-        """Enumeration of interaction state keys."""
-
-        PROPERTY_VALUES = "property_values"
-
     def __init__(self, servient, thing):
         self._servient = servient
         self._thing = thing
 
-        self._interaction_states = {
-            self.InteractionStateKeys.PROPERTY_VALUES: {}
-        }
+        self._property_store = PropertyStore(
+            history_size=getattr(servient, "property_history_size", None))
+
+        self._change_policies = {}
+        self._change_filters = {}
+        self._pending_changes = {}
+
+        self._execution_policies = {}
+        self._action_executors = {}
 
         self._handlers_global = {
             self.HandlerKeys.RETRIEVE_PROPERTY: self._default_retrieve_property_handler,
@@ -70,7 +75,11 @@ class ExposedThing:
             self.HandlerKeys.INVOKE_ACTION: {}
         }
 
-        self._events_stream = Subject()
+        self._event_dispatcher = EventDispatcher()
+
+        self._property_dict = ExposedThingPropertyDict(exposed_thing=self)
+        self._action_dict = ExposedThingActionDict(exposed_thing=self)
+        self._event_dict = ExposedThingEventDict(exposed_thing=self)
 
     def __str__(self):
         return "<{}> {}".format(self.__class__.__name__, self.title)
@@ -98,16 +107,201 @@ class ExposedThing:
         return self._thing.__setattr__(name, value)
 
     def _set_property_value(self, prop, value):
-        """Sets a Property value."""
+        """Sets a Property value and records it in the Property history."""
 
-        prop_values = self.InteractionStateKeys.PROPERTY_VALUES
-        self._interaction_states[prop_values][prop] = value
+        version = self._property_store.write(prop.name, value, data_type=prop.type)
+        self._broadcast(ClusterMessageTypes.VALUE, prop.name, value)
+
+        return version
 
     def _get_property_value(self, prop):
         """Returns a Property value."""
 
-        prop_values = self.InteractionStateKeys.PROPERTY_VALUES
-        return self._interaction_states[prop_values].get(prop, None)
+        return self._property_store.read(prop.name)
+
+    def _change_filter(self, prop):
+        """Returns the PropertyChangeFilter of the given Property or None if
+        its writes are not filtered. The policy set on this ExposedThing takes
+        precedence over the servient configuration and the changePolicy of the TD."""
+
+        if prop.name in self._change_filters:
+            return self._change_filters[prop.name]
+
+        servient_policies = getattr(self._servient, "property_change_policies", None) or {}
+
+        policy = self._change_policies.get(prop.name)
+        policy = policy or PropertyChangePolicy.build(servient_policies.get(prop.name))
+        policy = policy or PropertyChangePolicy.build(prop.change_policy)
+
+        change_filter = PropertyChangeFilter(policy) if policy else None
+        self._change_filters[prop.name] = change_filter
+
+        return change_filter
+
+    def _reset_change_filter(self, name):
+        """Discards the state of the change filter of the given Property."""
+
+        self._change_filters.pop(name, None)
+
+        pending = self._pending_changes.pop(name, None)
+
+        if pending:
+            pending[0].cancel()
+
+    def _publish_property_change(self, name, value):
+        """Writes a Property change to the database and emits the change event."""
+
+        self._write_property_to_db(name, value)
+        self._emit_property_change_event(name, value)
+        self._broadcast(ClusterMessageTypes.CHANGE, name, value)
+
+    def _publish_pending_change(self, name):
+        """Publishes the last change of a Property that was deferred by its minimum interval."""
+
+        _handle, value = self._pending_changes.pop(name)
+        change_filter = self._change_filters.get(name)
+
+        if change_filter:
+            change_filter.published(value, time.monotonic())
+
+        self._publish_property_change(name, value)
+
+    def _filter_property_change(self, prop, value):
+        """Publishes, defers or suppresses a Property write according to its change policy."""
+
+        change_filter = self._change_filter(prop)
+
+        if change_filter is None:
+            self._publish_property_change(prop.name, value)
+            return
+
+        now = time.monotonic()
+        decision, delay = change_filter.evaluate(value, now)
+
+        if decision == PropertyChangeFilter.DEFER:
+            pending = self._pending_changes.get(prop.name)
+
+            if pending:
+                self._pending_changes[prop.name] = (pending[0], value)
+            else:
+                handle = asyncio.get_running_loop().call_later(delay, self._publish_pending_change, prop.name)
+                self._pending_changes[prop.name] = (handle, value)
+
+            return
+
+        pending = self._pending_changes.pop(prop.name, None)
+
+        if pending:
+            pending[0].cancel()
+
+        if decision == PropertyChangeFilter.PUBLISH:
+            change_filter.published(value, now)
+            self._publish_property_change(prop.name, value)
+
+    def get_property_change_policy(self, name):
+        """Returns the PropertyChangePolicy that applies to the given Property (None if unfiltered)."""
+
+        change_filter = self._change_filter(self.thing.properties[name])
+
+        return change_filter.policy if change_filter else None
+
+    def set_property_change_policy(self, name, policy):
+        """Sets the change policy (a PropertyChangePolicy or a dict) of the given Property.
+        Setting None reverts to the policy of the servient configuration or the TD."""
+
+        if name not in self.thing.properties:
+            raise ValueError("Unknown property: {}".format(name))
+
+        if policy is None:
+            self._change_policies.pop(name, None)
+        else:
+            self._change_policies[name] = PropertyChangePolicy.build(policy)
+
+        self._reset_change_filter(name)
+
+    def _execution_policy(self, action):
+        """Returns the ActionExecutionPolicy of the given Action. The policy set on this
+        ExposedThing takes precedence over the servient configuration and the executionPolicy of the TD."""
+
+        servient_policies = getattr(self._servient, "action_execution_policies", None) or {}
+
+        policy = self._execution_policies.get(action.name)
+        policy = policy or ActionExecutionPolicy.build(servient_policies.get(action.name))
+        policy = policy or ActionExecutionPolicy.build(action.execution_policy)
+
+        return policy or ActionExecutionPolicy()
+
+    def _action_executor(self, action):
+        """Returns the ActionExecutor that runs the invocations of the given Action."""
+
+        if action.name not in self._action_executors:
+            self._action_executors[action.name] = ActionExecutor(
+                policy=self._execution_policy(action),
+                pools=getattr(self._servient, "action_pools", None))
+
+        return self._action_executors[action.name]
+
+    def get_action_execution_policy(self, name):
+        """Returns the ActionExecutionPolicy that applies to the given Action."""
+
+        return self._action_executor(self.thing.actions[name]).policy
+
+    def set_action_execution_policy(self, name, policy):
+        """Sets the execution policy (an ActionExecutionPolicy or a dict) of the given Action.
+        Setting None reverts to the policy of the servient configuration or the TD."""
+
+        if name not in self.thing.actions:
+            raise ValueError("Unknown action: {}".format(name))
+
+        if policy is None:
+            self._execution_policies.pop(name, None)
+        else:
+            self._execution_policies[name] = ActionExecutionPolicy.build(policy)
+
+        action = self.thing.actions[name]
+        self._action_executor(action).policy = self._execution_policy(action)
+
+    def action_metrics(self, name):
+        """Returns a dict with the queue depth, the execution times
+        and the invocation counters of the given Action."""
+
+        return self._action_executor(self.thing.actions[name]).metrics
+
+    def _cluster_follower(self):
+        """Returns the ServientCluster of the servient if this worker forwards
+        the operations with side effects to the leader worker (None otherwise)."""
+
+        cluster = getattr(self._servient, "cluster", None)
+
+        return cluster if cluster is not None and not cluster.is_leader else None
+
+    def _broadcast(self, msg_type, name, value):
+        """Publishes a Property value, change or Event to the
+        followers if this worker is the leader of a cluster."""
+
+        cluster = getattr(self._servient, "cluster", None)
+
+        if cluster is not None and cluster.is_leader:
+            cluster.broadcast(msg_type, self, name, value)
+
+    def apply_cluster_message(self, msg_type, name, value):
+        """Applies a Property value, change or Event published by the leader
+        worker of the cluster. Nothing is written to the databases, the
+        leader already did it."""
+
+        if msg_type == ClusterMessageTypes.VALUE:
+            prop = self.thing.properties.get(name)
+
+            if prop is not None:
+                self._property_store.write(name, value, data_type=prop.type)
+        elif msg_type == ClusterMessageTypes.CHANGE:
+            event_init = PropertyChangeEventInit(name=name, value=value)
+            self._event_dispatcher.dispatch(PropertyChangeEmittedEvent(init=event_init))
+        elif msg_type == ClusterMessageTypes.INVOCATION:
+            event_init = ActionInvocationEventInit(action_name=name, return_value=value)
+            self._event_dispatcher.dispatch(ActionInvocationEmittedEvent(init=event_init))
+        elif msg_type == ClusterMessageTypes.EVENT:
+            self._event_dispatcher.dispatch(EmittedEvent(name=name, init=value))
 
     def _set_handler(self, handler_type, handler, interaction=None):
         """Sets the currently defined handler for the given handler type."""
@@ -193,30 +387,33 @@ class ExposedThing:
     def properties(self):
         """Returns a dictionary of ThingProperty items."""
 
-        return ExposedThingPropertyDict(exposed_thing=self)
+        return self._property_dict
 
     @property
     def actions(self):
         """Returns a dictionary of ThingAction items."""
 
-        return ExposedThingActionDict(exposed_thing=self)
+        return self._action_dict
 
     @property
     def events(self):
         """Returns a dictionary of ThingEvent items."""
 
-        return ExposedThingEventDict(exposed_thing=self)
+        return self._event_dict
 
     def _write_property_to_db(self, name, value):
         """Writes property to database if InfluxDB is enabled."""
 
         if self._servient._influxdb_enabled:
-            if isinstance(value, dict):
-                flat_dict = self.flatten(value)
-                for key, val in flat_dict.items():
-                    self._servient.influxdb.write_point(key, val)
-            else:
-                self._servient.influxdb.write_point(name, value)
+            schema = self.thing.properties[name].interaction_fragment.to_dict()
+            self._servient.influxdb.write_property(self.title, name, value, schema=schema)
+
+    async def _wait_for_database(self):
+        """Waits until InfluxDB (if enabled) can take new points
+        without blocking the loop on the backpressure policy."""
+
+        if self._servient._influxdb_enabled:
+            await self._servient.influxdb.wait_for_capacity()
 
     def _emit_property_change_event(self, name, value):
         """Emits a property change event and writes it to database
@@ -226,9 +423,9 @@ class ExposedThing:
         emitted_event = PropertyChangeEmittedEvent(init=event_init)
 
         if self._servient._influxdb_enabled:
-            self._servient.influxdb.write_point("event", str(emitted_event))
+            self._servient.influxdb.log_event(self.title, emitted_event)
 
-        self._events_stream.on_next(emitted_event)
+        self._event_dispatcher.dispatch(emitted_event)
 
     async def read_property(self, name):
         """Takes the Property name as the name argument, then requests from
@@ -239,13 +436,18 @@ class ExposedThing:
         proprty = self.thing.properties[name]
 
         handler = self._handlers.get(self.HandlerKeys.RETRIEVE_PROPERTY, {}).get(proprty, None)
+        cluster = self._cluster_follower()
+
+        if handler and cluster:
+            return await cluster.forward(ClusterMessageTypes.READ, self, name)
 
         if handler:
             value = await handler()
         else:
             value = await self._default_retrieve_property_handler(name)
 
-        self._write_property_to_db(name, value)
+        if cluster is None:
+            self._write_property_to_db(name, value)
 
         return value
 
@@ -268,6 +470,13 @@ class ExposedThing:
         Returns a Future that resolves on success or rejects with an Error."""
 
         proprty = self.thing.properties[name]
+        cluster = self._cluster_follower()
+
+        if cluster:
+            await cluster.forward(ClusterMessageTypes.WRITE, self, name, value)
+            return
+
+        await self._wait_for_database()
 
         handler = self._handlers.get(self.HandlerKeys.UPDATE_PROPERTY, {}).get(proprty, None)
 
@@ -276,29 +485,80 @@ class ExposedThing:
         else:
             await self._default_update_property_handler(name, value)
 
-        self._write_property_to_db(name, value)
-        self._emit_property_change_event(name, value)
+        self._filter_property_change(proprty, value)
+
+    async def read_multiple_properties(self, names):
+        """Takes a list of Property names and reads their values concurrently.
+        Returns a Future that resolves with a dict of values indexed by Property name."""
+
+        for name in names:
+            if name not in self.thing.properties:
+                raise ValueError("Unknown property: {}".format(name))
+
+        values = await asyncio.gather(*[self.read_property(name) for name in names])
+
+        return dict(zip(names, values))
+
+    async def read_all_properties(self):
+        """Reads the values of all the readable Properties.
+        Returns a Future that resolves with a dict of values indexed by Property name."""
+
+        names = [name for name, prop in self.thing.properties.items() if not prop.write_only]
+
+        return await self.read_multiple_properties(names)
+
+    async def write_multiple_properties(self, values):
+        """Takes a dict of values indexed by Property name and writes them.
+        Fails before updating any Property if some of them is unknown
+        (ValueError) or non-writable (TypeError)."""
+
+        for name in values:
+            if name not in self.thing.properties:
+                raise ValueError("Unknown property: {}".format(name))
+
+            if not self.properties[name].writable:
+                raise TypeError("Property is non-writable: {}".format(name))
+
+        for name, value in values.items():
+            await self.write_property(name, value)
+
+    async def handle_write_multiple_properties(self, values):
+        """Function that gets called from protocol servers to handle external requests
+        to write multiple Properties."""
+
+        await self.write_multiple_properties(values)
 
     async def invoke_action(self, name, input_value=None):
         """Invokes an Action with the given parameters and yields with the invocation result."""
 
         action = self.thing.actions[name]
+        cluster = self._cluster_follower()
+
+        if cluster:
+            return await cluster.forward(ClusterMessageTypes.INVOKE, self, name, input_value)
 
         handler = self._get_handler(
             handler_type=self.HandlerKeys.INVOKE_ACTION,
             interaction=action)
 
-        result = await handler({
+        started = time.perf_counter()
+
+        result = await self._action_executor(action).submit(handler, {
             "input": input_value
         })
 
+        latency = (time.perf_counter() - started) * 1000
+
+        await self._wait_for_database()
+
         event_init = ActionInvocationEventInit(action_name=name, return_value=result)
         emitted_event = ActionInvocationEmittedEvent(init=event_init)
 
         if self._servient._influxdb_enabled:
-            self._servient.influxdb.write_point("action", str(emitted_event))
+            self._servient.influxdb.log_action_invocation(self.title, name, result, latency=latency)
 
-        self._events_stream.on_next(emitted_event)
+        self._event_dispatcher.dispatch(emitted_event)
+        self._broadcast(ClusterMessageTypes.INVOCATION, name, result)
 
         return result
 
@@ -310,11 +570,7 @@ class ExposedThing:
             # noinspection PyUnresolvedReferences
             return reactivex.throw(Exception("Unknown event"))
 
-        def event_filter(item):
-            return item.name == name
-
-        # noinspection PyUnresolvedReferences
-        return self._events_stream.pipe(ops.filter(event_filter))
+        return self._event_dispatcher.observable(EventDispatcher.Kinds.EVENT, name)
 
     def on_property_change(self, name):
         """Returns an Observable for the Property specified in the name argument,
@@ -330,22 +586,42 @@ class ExposedThing:
             # noinspection PyUnresolvedReferences
             return reactivex.throw(Exception("Property is not observable"))
 
-        def property_change_filter(item):
-            return item.name == DefaultThingEvent.PROPERTY_CHANGE and \
-                   item.data.name == name
-
-        # noinspection PyUnresolvedReferences
-        return self._events_stream.pipe(ops.filter(property_change_filter))
+        return self._event_dispatcher.observable(EventDispatcher.Kinds.PROPERTY_CHANGE, name)
 
     def on_td_change(self):
         """Returns an Observable, allowing subscribing to and unsubscribing
         from notifications to the Thing Description."""
 
-        def td_change_filter(item):
-            return item.name == DefaultThingEvent.DESCRIPTION_CHANGE
+        return self._event_dispatcher.observable(EventDispatcher.Kinds.DESCRIPTION_CHANGE)
 
-        # noinspection PyUnresolvedReferences
-        return self._events_stream.pipe(ops.filter(td_change_filter))
+    def on_action_invocation(self, name):
+        """Returns an Observable of the invocations of the Action specified in the name argument."""
+
+        if name not in self.thing.actions:
+            # noinspection PyUnresolvedReferences
+            return reactivex.throw(Exception("Unknown action"))
+
+        return self._event_dispatcher.observable(EventDispatcher.Kinds.ACTION_INVOCATION, name)
+
+    @property
+    def property_store(self):
+        """Returns the store with the values and the recent history of the Properties."""
+
+        return self._property_store
+
+    @property
+    def subscriber_counts(self):
+        """Returns a dict with the number of subscribers to each
+        event, property and action grouped by the kind of emission
+        (event, propertychange, actioninvocation, descriptionchange)."""
+
+        return self._event_dispatcher.subscriber_counts
+
+    def subscriber_count(self, kind, name=None):
+        """Returns the number of subscribers to the given kind
+        of emission of the interaction with the given name."""
+
+        return self._event_dispatcher.subscriber_count(kind, name)
 
     def expose(self):
         """Start serving external requests for the Thing, so that
@@ -366,12 +642,19 @@ class ExposedThing:
         if not self.thing.find_interaction(name=event_name):
             raise ValueError("Unknown event: {}".format(event_name))
 
+        cluster = self._cluster_follower()
+
+        if cluster:
+            cluster.notify(ClusterMessageTypes.EMIT, self, event_name, payload)
+            return
+
         event = EmittedEvent(name=event_name, init=payload)
 
         if self._servient._influxdb_enabled:
-            self._servient.influxdb.write_point("event", str(event))
+            self._servient.influxdb.log_event(self.title, event)
 
-        self._events_stream.on_next(event)
+        self._event_dispatcher.dispatch(event)
+        self._broadcast(ClusterMessageTypes.EVENT, event_name, payload)
 
     def add_property(self, name, property_init, value=None):
         """Adds a Property defined by the argument and updates the Thing Description.
@@ -383,7 +666,13 @@ class ExposedThing:
         prop = Property(thing=self._thing, name=name, init_dict=property_init)
 
         self._thing.add_interaction(prop)
-        self._set_property_value(prop, value)
+        self._servient.refresh_interaction_forms(self, prop)
+        self._property_store.remove(name)
+        self._change_policies.pop(name, None)
+        self._reset_change_filter(name)
+
+        if value is not None:
+            self._set_property_value(prop, value)
 
         event_data = ThingDescriptionChangeEventInit(
             td_change_type=TDChangeType.PROPERTY,
@@ -395,16 +684,22 @@ class ExposedThing:
         event = ThingDescriptionChangeEmittedEvent(init=event_data)
 
         if self._servient._influxdb_enabled:
-            self._servient.influxdb.write_point("event", str(event))
+            self._servient.influxdb.log_event(self.title, event)
 
-        self._events_stream.on_next(event)
+        self._event_dispatcher.dispatch(event)
 
     def remove_property(self, name):
         """Removes the Property specified by the name argument,
         updates the Thing Description and returns the object."""
 
+        prop = self._thing.find_interaction(name=name)
         self._thing.remove_interaction(name=name)
 
+        if prop:
+            self._property_store.remove(prop.name)
+            self._change_policies.pop(prop.name, None)
+            self._reset_change_filter(prop.name)
+
         event_data = ThingDescriptionChangeEventInit(
             td_change_type=TDChangeType.PROPERTY,
             method=TDChangeMethod.REMOVE,
@@ -413,9 +708,9 @@ class ExposedThing:
         event = ThingDescriptionChangeEmittedEvent(init=event_data)
 
         if self._servient._influxdb_enabled:
-            self._servient.influxdb.write_point("event", str(event))
+            self._servient.influxdb.log_event(self.title, event)
 
-        self._events_stream.on_next(event)
+        self._event_dispatcher.dispatch(event)
 
     def add_action(self, name, action_init, action_handler=None):
         """Adds an Action to the Thing object as defined by the action
@@ -427,6 +722,10 @@ class ExposedThing:
         action = Action(thing=self._thing, name=name, init_dict=action_init)
 
         self._thing.add_interaction(action)
+        self._servient.refresh_interaction_forms(self, action)
+
+        self._execution_policies.pop(name, None)
+        self._action_executors.pop(name, None)
 
         event_data = ThingDescriptionChangeEventInit(
             td_change_type=TDChangeType.ACTION,
@@ -438,9 +737,9 @@ class ExposedThing:
         event = ThingDescriptionChangeEmittedEvent(init=event_data)
 
         if self._servient._influxdb_enabled:
-            self._servient.influxdb.write_point("event", str(event))
+            self._servient.influxdb.log_event(self.title, event)
 
-        self._events_stream.on_next(event)
+        self._event_dispatcher.dispatch(event)
 
         if action_handler:
             self.set_action_handler(name, action_handler)
@@ -451,6 +750,9 @@ class ExposedThing:
 
         self._thing.remove_interaction(name=name)
 
+        self._execution_policies.pop(name, None)
+        self._action_executors.pop(name, None)
+
         event_data = ThingDescriptionChangeEventInit(
             td_change_type=TDChangeType.ACTION,
             method=TDChangeMethod.REMOVE,
@@ -459,9 +761,9 @@ class ExposedThing:
         event = ThingDescriptionChangeEmittedEvent(init=event_data)
 
         if self._servient._influxdb_enabled:
-            self._servient.influxdb.write_point("event", str(event))
+            self._servient.influxdb.log_event(self.title, event)
 
-        self._events_stream.on_next(event)
+        self._event_dispatcher.dispatch(event)
 
     def add_event(self, name, event_init):
         """Adds an event to the Thing object as defined by the event argument
@@ -473,6 +775,7 @@ class ExposedThing:
         event = Event(thing=self._thing, name=name, init_dict=event_init)
 
         self._thing.add_interaction(event)
+        self._servient.refresh_interaction_forms(self, event)
 
         event_data = ThingDescriptionChangeEventInit(
             td_change_type=TDChangeType.EVENT,
@@ -484,9 +787,9 @@ class ExposedThing:
         event = ThingDescriptionChangeEmittedEvent(init=event_data)
 
         if self._servient._influxdb_enabled:
-            self._servient.influxdb.write_point("event", str(event))
+            self._servient.influxdb.log_event(self.title, event)
 
-        self._events_stream.on_next(event)
+        self._event_dispatcher.dispatch(event)
 
     def remove_event(self, name):
         """Removes the event specified by the name argument,
@@ -502,10 +805,10 @@ class ExposedThing:
         event = ThingDescriptionChangeEmittedEvent(init=event_data)
 
         if self._servient._influxdb_enabled:
-            self._servient.influxdb.write_point("event", str(event))
+            self._servient.influxdb.log_event(self.title, event)
 
 
-        self._events_stream.on_next(event)
+        self._event_dispatcher.dispatch(event)
 
     def set_action_handler(self, name, action_handler):
         """Takes name as string argument and action_handler as argument of type ActionHandler.
@@ -11,8 +11,11 @@ import uuid
 
 from slugify import slugify
 
+from wotpy.codecs.enums import MediaTypes
 from wotpy.utils.utils import to_camel
+from wotpy.wot.dictionaries.link import FormDict
 from wotpy.wot.dictionaries.thing import ThingFragment
+from wotpy.wot.form import Form
 from wotpy.wot.interaction import Property, Action, Event
 
 
@@ -49,11 +52,20 @@ class Thing:
 
     def __init__(self, thing_fragment=None, **kwargs):
         self._thing_fragment = thing_fragment if thing_fragment else ThingFragment(**kwargs)
+        self._fragment_doc = None
+        self._revision = 0
+        self._id = None
+        self._title = None
+        self._url_name = None
         self._security  = []
         self._security_definitions = {}
         self._properties = {}
         self._actions = {}
         self._events = {}
+        self._name_index = {}
+        self._url_name_index = {}
+        self._td_forms = []
+        self._autogenerated_forms = []
         self._init_fragment_data()
 
     def __getattr__(self, name):
@@ -70,14 +82,43 @@ class Thing:
         if name_camel not in self.THING_FRAGMENT_WRITABLE_FIELDS:
             return super().__setattr__(name, value)
 
-        return self._thing_fragment.__setattr__(name, value)
+        self._thing_fragment.__setattr__(name, value)
+        self._update_fragment_fields()
+
+        if name_camel == "forms":
+            self._update_td_forms()
+
+        self.invalidate_fragment()
+
+    def _update_fragment_fields(self):
+        """Copies the fields that are read on every request from the private ThingFragment."""
+
+        self._id = self._thing_fragment.id
+        self._title = self._thing_fragment.title
+        self._url_name = slugify(self._title)
+
+    def _update_td_forms(self):
+        """Builds the Thing-level Forms declared in the private ThingFragment."""
+
+        self._td_forms = [
+            Form(
+                interaction=self,
+                protocol=None,
+                href=form_dict.href,
+                content_type=MediaTypes.JSON,
+                op=form_dict.op)
+            for form_dict in (FormDict(item) for item in self._thing_fragment.forms or [])
+        ]
 
     def _init_fragment_data(self):
         """Adds the data declared in the ThingFragment to the instance private dicts."""
 
+        self._update_fragment_fields()
         self._security = self._thing_fragment.security
         self._security_definitions = self._thing_fragment.security_definitions
 
+        self._update_td_forms()
+
         for name, prop_fragment in self._thing_fragment.properties.items():
             prop = Property(thing=self, name=name, init_dict=prop_fragment)
             self.add_interaction(prop)
@@ -91,8 +132,21 @@ class Thing:
             self.add_interaction(event)
 
     @property
-    def thing_fragment(self):
-        """The ThingFragment dictionary of this Thing."""
+    def revision(self):
+        """Number that changes each time the ThingFragment of this Thing is modified."""
+
+        return self._revision
+
+    def invalidate_fragment(self):
+        """Discards the cached ThingFragment after this Thing
+        or any of its Interactions or Forms is modified."""
+
+        self._fragment_doc = None
+        self._revision += 1
+
+    def _build_fragment_doc(self):
+        """Returns the ThingFragment document built from the
+        private ThingFragment and the current Interactions."""
 
         def interaction_to_json(intrct):
             """Returns the JSON serialization of an Interaction instance."""
@@ -106,6 +160,12 @@ class Thing:
             return ret
 
         doc = self._thing_fragment.to_dict()
+        doc.pop("forms", None)
+
+        if self.forms:
+            doc.update({
+                "forms": [form.form_dict.to_dict() for form in self.forms]
+            })
 
         doc.update({
             "properties": {
@@ -128,25 +188,35 @@ class Thing:
             }
         })
 
-        return ThingFragment(doc)
+        return doc
+
+    @property
+    def thing_fragment(self):
+        """The ThingFragment dictionary of this Thing.
+        The document is only rebuilt after this Thing has been modified."""
+
+        if self._fragment_doc is None:
+            self._fragment_doc = self._build_fragment_doc()
+
+        return ThingFragment(self._fragment_doc)
 
     @property
     def id(self):
         """Thing ID."""
 
-        return self.thing_fragment.id
+        return self._id
 
     @property
     def title(self):
         """Thing title."""
 
-        return self.thing_fragment.title
+        return self._title
 
     @property
     def url_name(self):
         """Returns the URL-safe name of this Thing."""
 
-        return slugify(self.title)
+        return self._url_name
 
     @property
     def security(self):
@@ -178,6 +248,42 @@ class Thing:
 
         return self._events
 
+    @property
+    def forms(self):
+        """Sequence of Thing-level forms (e.g. to read or write multiple Properties at once)."""
+
+        return self._td_forms + self._autogenerated_forms
+
+    def clean_forms(self):
+        """Removes all autogenerated Thing-level Forms."""
+
+        self._autogenerated_forms = []
+        self.invalidate_fragment()
+
+    def add_form(self, form):
+        """Add a new autogenerated Thing-level Form."""
+
+        assert form.interaction is self
+
+        existing = next((True for item in self._autogenerated_forms if item.id == form.id), False)
+
+        if existing:
+            raise ValueError("Duplicate Form: {}".format(form))
+
+        self._autogenerated_forms.append(form)
+        self.invalidate_fragment()
+
+    def remove_form(self, form):
+        """Remove an existing autogenerated Thing-level Form."""
+
+        try:
+            pop_idx = self._autogenerated_forms.index(form)
+            self._autogenerated_forms.pop(pop_idx)
+        except ValueError:
+            return
+
+        self.invalidate_fragment()
+
     @property
     def interactions(self):
         """Sequence of interactions linked to this thing."""
@@ -191,10 +297,29 @@ class Thing:
         """Finds an existing Interaction by name.
         The name argument may be the original name or the URL-safe version."""
 
-        def is_match(intrct):
-            return intrct.name == name or intrct.url_name == name
+        return self._name_index.get(name) or self._url_name_index.get(name)
+
+    def find_interaction_by_url_name(self, url_name, interaction_type=None):
+        """Finds an existing Interaction by its URL-safe name,
+        optionally restricted to the given interaction type."""
+
+        interaction = self._url_name_index.get(url_name)
+
+        if interaction is None:
+            return None
+
+        if interaction_type is not None and interaction.interaction_type != interaction_type:
+            return None
+
+        return interaction
+
+    def normalize_interaction_name(self, name):
+        """Takes a case-insensitive URL-safe interaction name and returns the actual
+        name of the Interaction whose URL-safe name matches (None if not found)."""
+
+        interaction = self.find_interaction(name) or self._url_name_index.get(slugify(name))
 
-        return next((intrct for intrct in self.interactions if is_match(intrct)), None)
+        return interaction.name if interaction else None
 
     def add_interaction(self, interaction):
         """Add a new Interaction."""
@@ -219,6 +344,9 @@ class Thing:
             if isinstance(interaction, klass))
 
         interaction_dict_map[interaction_class][interaction.name] = interaction
+        self._name_index[interaction.name] = interaction
+        self._url_name_index[interaction.url_name] = interaction
+        self.invalidate_fragment()
 
     def remove_interaction(self, name):
         """Removes an existing Interaction by name.
@@ -232,3 +360,6 @@ class Thing:
         self._properties.pop(interaction.name, None)
         self._actions.pop(interaction.name, None)
         self._events.pop(interaction.name, None)
+        self._name_index.pop(interaction.name, None)
+        self._url_name_index.pop(interaction.url_name, None)
+        self.invalidate_fragment()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from wotpy.cli.cli import setup_event_loop
+from wotpy.utils.profiling import disable_startup_profiler, enable_startup_profiler, startup_phase
+
+
+def test_setup_event_loop():
+    """The event loop is tuned with the VO descriptor and the command line options take precedence."""
+
+    previous_loop = asyncio.get_event_loop_policy().get_event_loop()
+    config = {"eventLoop": {"executorSize": 2, "slowCallbackDuration": 50}}
+
+    loop = setup_event_loop(config, slow_callback_duration=200)
+
+    try:
+        assert asyncio.get_event_loop_policy().get_event_loop() is loop
+        assert loop.get_debug()
+        assert loop.slow_callback_duration == pytest.approx(0.2)
+
+        async def thread_names():
+            futures = [
+                loop.run_in_executor(None, lambda: threading.current_thread().name)
+                for _ in range(10)
+            ]
+
+            return set(await asyncio.gather(*futures))
+
+        names = loop.run_until_complete(thread_names())
+
+        assert 1 <= len(names) <= 2
+        assert all(name.startswith("wotpy-loop") for name in names)
+    finally:
+        asyncio.set_event_loop(previous_loop)
+        loop.close()
+
+    default_loop = setup_event_loop({})
+
+    try:
+        assert not default_loop.get_debug()
+    finally:
+        asyncio.set_event_loop(previous_loop)
+        default_loop.close()
+
+    with pytest.raises(ValueError):
+        setup_event_loop({"eventLoop": {"policy": "unknown"}})
+
+
+def test_spool_path_per_worker(tmp_path):
+    """Relative spool paths are resolved against the SQLite database and
+    the workers other than the leader get their own spool file."""
+
+    from wotpy.cli.default_servient import DefaultServient
+
+    database_config = {"persistentDB": {"dbFilePath": str(tmp_path / "vo.db")}}
+
+    leader_path = DefaultServient._spool_path("spool.jsonl", database_config, worker_id=0)
+    worker_path = DefaultServient._spool_path("spool.jsonl", database_config, worker_id=2)
+
+    assert leader_path == str(tmp_path / "spool.jsonl")
+    assert worker_path == str(tmp_path / "spool.worker2.jsonl")
+    assert DefaultServient._spool_path("/var/spool.jsonl", database_config, worker_id=1) == "/var/spool.worker1.jsonl"
+
+
+def test_lazy_imports():
+    """The CLI and the servient do not import the bindings, databases and generic functions until needed."""
+
+    heavy_modules = ["pmdarima", "aiocoap", "amqtt", "influxdb_client", "wotpy.protocols.mqtt.client"]
+
+    code = (
+        "import json, sys\n"
+        "import wotpy.cli.cli\n"
+        "from wotpy.wot.servient import Servient\n"
+        "Servient(catalogue_port=None)\n"
+        "print(json.dumps([name for name in {} if name in sys.modules]))\n"
+    ).format(heavy_modules)
+
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env = dict(os.environ, PYTHONPATH=root)
+    output = subprocess.check_output([sys.executable, "-c", code], env=env, cwd=root)
+
+    assert json.loads(output.decode().strip().splitlines()[-1]) == []
+
+
+def test_startup_profiler():
+    """The startup profiler records the time of each phase without charging nested phases to the enclosing one."""
+
+    assert disable_startup_profiler() is None
+
+    with startup_phase("ignored"):
+        pass
+
+    profiler = enable_startup_profiler()
+
+    try:
+        with startup_phase("outer"):
+            time.sleep(0.05)
+
+            with startup_phase("inner"):
+                time.sleep(0.1)
+
+        with startup_phase("outer"):
+            time.sleep(0.05)
+    finally:
+        assert disable_startup_profiler() is profiler
+
+    phases = profiler.phases
+
+    assert list(phases.keys()) == ["outer", "inner"]
+    assert 0.1 <= phases["outer"]["time"] < 0.2
+    assert phases["inner"]["time"] >= 0.1
+
+    report = profiler.report()
+
+    assert "outer" in report and "inner" in report and "total" in report
+
+    started = time.perf_counter() - 0.2
+    profiler = enable_startup_profiler(started=started)
+    disable_startup_profiler()
+
+    assert list(profiler.phases.keys()) == ["module imports"]
+    assert profiler.phases["module imports"]["time"] >= 0.2
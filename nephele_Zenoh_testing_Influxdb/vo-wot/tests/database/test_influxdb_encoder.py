@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import numpy as np
+
+from wotpy.database.influxdb_encoder import encode_fields
+
+
+def test_encode_scalars():
+    """Scalar values are stored in the value field. Integers are stored
+    as floats only if the data schema declares a number."""
+
+    assert encode_fields(True) == {"value": True}
+    assert encode_fields(10) == {"value": 10}
+    assert encode_fields(1.5) == {"value": 1.5}
+    assert encode_fields("on") == {"value": "on"}
+    assert encode_fields(None) == {}
+    assert encode_fields(float("nan")) == {}
+
+    assert isinstance(encode_fields(True)["value"], bool)
+    assert isinstance(encode_fields(10)["value"], int)
+    assert isinstance(encode_fields(10, schema={"type": "integer"})["value"], int)
+    assert isinstance(encode_fields(10, schema={"type": "number"})["value"], float)
+
+
+def test_encode_nested_dict():
+    """Nested dicts are flattened into dot-separated typed fields."""
+
+    value = {
+        "battery": {"level": 87, "charging": False},
+        "cpu": [0.5, 0.25],
+        "name": "tb2",
+        "unset": None
+    }
+
+    assert encode_fields(value) == {
+        "battery.level": 87,
+        "battery.charging": False,
+        "cpu.0": 0.5,
+        "cpu.1": 0.25,
+        "name": "tb2"
+    }
+
+
+def test_encode_arrays():
+    """Lists and NumPy arrays are expanded into indexed fields."""
+
+    assert encode_fields([1, 2]) == {"value.0": 1, "value.1": 2}
+    assert encode_fields([[1, 2], [3]]) == {"value.0.0": 1, "value.0.1": 2, "value.1.0": 3}
+
+    fields = encode_fields({"pose": np.array([1.0, 2.0]), "count": np.int64(3)})
+
+    assert fields == {"pose.0": 1.0, "pose.1": 2.0, "count": 3}
+    assert [type(val) for val in fields.values()] == [float, float, int]
+
+
+def test_encode_schema():
+    """The data schema of nested dicts and arrays decides which integers are stored as floats."""
+
+    schema = {
+        "type": "object",
+        "properties": {
+            "level": {"type": "number"},
+            "cycles": {"type": "integer"},
+            "cells": {"type": "array", "items": {"type": "number"}}
+        }
+    }
+
+    fields = encode_fields({"level": 90, "cycles": 3, "cells": [4, 4.5], "other": 1}, schema=schema)
+
+    assert fields == {"level": 90.0, "cycles": 3, "cells.0": 4.0, "cells.1": 4.5, "other": 1}
+    assert [type(val) for val in fields.values()] == [float, int, float, float, int]
+
+
+def test_encode_empty_values(caplog):
+    """Empty dicts and lists are dropped with a warning."""
+
+    assert encode_fields({"pose": [], "battery": {"level": 87}}) == {"battery.level": 87}
+    assert "pose" in caplog.text
+
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from wotpy.database.influxdb_event_log import EventLogPolicy, InfluxDBEventLog
+from wotpy.wot.enums import TDChangeMethod, TDChangeType
+from wotpy.wot.events import \
+    EmittedEvent, \
+    PropertyChangeEmittedEvent, \
+    PropertyChangeEventInit, \
+    ThingDescriptionChangeEmittedEvent, \
+    ThingDescriptionChangeEventInit
+
+
+def test_structured_entries():
+    """Events and action invocations are written with tags and typed fields."""
+
+    influxdb = MagicMock()
+    event_log = InfluxDBEventLog(influxdb)
+
+    event_log.log_event("thing", EmittedEvent(name="lowBattery", init={"level": 5}))
+    event_log.log_event("thing", PropertyChangeEmittedEvent(
+        init=PropertyChangeEventInit(name="level", value=5)))
+    event_log.log_event("thing", ThingDescriptionChangeEmittedEvent(
+        init=ThingDescriptionChangeEventInit(
+            td_change_type=TDChangeType.PROPERTY, method=TDChangeMethod.ADD, name="level")))
+    event_log.log_action_invocation("thing", "dock", {"ok": True}, latency=12.5)
+
+    calls = [(call.args, call.kwargs["tags"]) for call in influxdb.write_event.call_args_list]
+
+    assert calls == [
+        (("thing", "event", {"lowBattery": {"level": 5}, "count": 1}), {"event": "lowBattery"}),
+        (("thing", "event", {"count": 1}), {"event": "propertychange", "property": "level"}),
+        (("thing", "event", {"interaction": "level"}),
+         {"event": "descriptionchange", "type": TDChangeType.PROPERTY, "method": TDChangeMethod.ADD}),
+        (("thing", "action", {"dock": {"ok": True}, "count": 1, "latency": 12.5}), {"action": "dock"})
+    ]
+
+
+def test_sampling_and_rate_limit():
+    """Entries are sampled and rate limited per interaction."""
+
+    influxdb = MagicMock()
+    event_log = InfluxDBEventLog(influxdb, interactions={
+        "sampled": {"sampleEvery": 3},
+        "limited": {"maxRate": 2},
+        "propertychange": {"enabled": False}
+    })
+
+    for _ in range(9):
+        event_log.log_event("thing", EmittedEvent(name="sampled", init=1))
+        event_log.log_event("thing", EmittedEvent(name="limited", init=1))
+        event_log.log_event("thing", EmittedEvent(name="other", init=1))
+        event_log.log_event("thing", PropertyChangeEmittedEvent(
+            init=PropertyChangeEventInit(name="level", value=1)))
+
+    logged = [call.kwargs["tags"]["event"] for call in influxdb.write_event.call_args_list]
+
+    assert logged.count("sampled") == 3
+    assert logged.count("limited") == 2
+    assert logged.count("other") == 9
+    assert logged.count("propertychange") == 0
+    assert event_log.stats == {"logged": 14, "skipped": 22}
+
+
+def test_invalid_policy():
+    """Invalid sampling or rate limiting settings are rejected."""
+
+    with pytest.raises(ValueError):
+        EventLogPolicy(sample_every=0)
+
+    with pytest.raises(ValueError):
+        EventLogPolicy(max_rate=0)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from wotpy.database.influxdb_spool import InfluxDBSpool
+
+
+def test_spool_replay(tmp_path):
+    """Spooled points are replayed in batches and removed afterwards."""
+
+    spool = InfluxDBSpool(str(tmp_path / "spool.jsonl"))
+    spool.append("a", ["m value=1i 1", "m value=2i 2"])
+    spool.append("b", ["m value=3i 3"])
+
+    assert not spool.is_empty
+
+    batches = []
+    spool.replay(batches.append, batch_size=2)
+
+    assert batches == [[("a", "m value=1i 1"), ("a", "m value=2i 2")], [("b", "m value=3i 3")]]
+    assert spool.is_empty
+    assert spool.stats == {"spooled": 3, "replayed": 3, "dropped": 0}
+
+
+def test_spool_failed_replay(tmp_path):
+    """Entries are kept when the replay fails and new entries can be appended meanwhile."""
+
+    spool = InfluxDBSpool(str(tmp_path / "spool.jsonl"))
+    spool.append("a", ["m value=1i 1"])
+
+    def write_batch(batch):
+        spool.append("a", ["m value=2i 2"])
+        raise ConnectionError
+
+    with pytest.raises(ConnectionError):
+        spool.replay(write_batch, batch_size=10)
+
+    batches = []
+
+    while not spool.is_empty:
+        spool.replay(batches.append, batch_size=10)
+
+    assert batches == [[("a", "m value=1i 1")], [("a", "m value=2i 2")]]
+
+
+def test_spool_skips_corrupt_entries(tmp_path):
+    """Incomplete entries left by an interrupted write are skipped."""
+
+    path = tmp_path / "spool.jsonl"
+    spool = InfluxDBSpool(str(path))
+    spool.append("a", ["m value=1i 1"])
+
+    with open(str(path), "ab") as spool_file:
+        spool_file.write(b'{"bucket": "a", "li')
+
+    batches = []
+    spool.replay(batches.append, batch_size=10)
+
+    assert batches == [[("a", "m value=1i 1")]]
+
+
+def test_spool_max_size(tmp_path):
+    """Points that do not fit in the spool are dropped."""
+
+    spool = InfluxDBSpool(str(tmp_path / "spool.jsonl"), max_size=100)
+    spool.append("a", ["m value=1i 1"])
+    spool.append("a", ["m value=2i 2"] * 10)
+
+    assert spool.stats == {"spooled": 1, "replayed": 0, "dropped": 10}
+
+
+def test_spool_max_size_includes_replay(tmp_path):
+    """The entries moved to the replay file count towards the size of the spool."""
+
+    spool = InfluxDBSpool(str(tmp_path / "spool.jsonl"), max_size=100)
+    spool.append("a", ["m value=1i 1"])
+
+    def failing_write(batch):
+        raise ConnectionError
+
+    with pytest.raises(ConnectionError):
+        spool.replay(failing_write, batch_size=10)
+
+    spool.append("a", ["m value=2i 2"])
+    spool.append("a", ["m value=3i 3"])
+
+    assert spool.stats == {"spooled": 2, "replayed": 0, "dropped": 1}
+    assert spool.size <= 100
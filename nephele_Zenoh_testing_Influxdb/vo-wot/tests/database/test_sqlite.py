@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+import asyncio
+import datetime
+import sqlite3
+import threading
+
+import pytest
+
+from tests.utils import run_test_coroutine
+from wotpy.database.sqlite_database import SQLiteDatabase
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    """Returns a database in a temporary directory."""
+
+    db = SQLiteDatabase(str(tmp_path / "vo.db"), commit_delay=20)
+
+    yield db
+
+    db.conn.close()
+
+
+def test_sqlite_pragmas(sqlite_db):
+    """The database is opened in WAL mode with the configured synchronous level."""
+
+    assert sqlite_db.execute_query("PRAGMA journal_mode") == [("wal",)]
+    assert sqlite_db.execute_query("PRAGMA synchronous") == [(1,)]
+
+    with pytest.raises(ValueError):
+        SQLiteDatabase(sqlite_db.db_path, synchronous="SOMETIMES")
+
+
+def test_sqlite_group_commit(sqlite_db):
+    """Inserts received within the commit delay are committed in a single transaction."""
+
+    batches = []
+    write_batch = sqlite_db._write_batch
+
+    def _write_batch(batch):
+        batches.append(len(batch))
+        return write_batch(batch)
+
+    sqlite_db._write_batch = _write_batch
+
+    async def test_coroutine():
+        await sqlite_db.create_table("items", {"id": "INTEGER PRIMARY KEY", "name": "TEXT"})
+
+        await asyncio.gather(*[
+            sqlite_db.insert("items", (idx, "item{}".format(idx)))
+            for idx in range(10)
+        ])
+
+        assert batches == [10]
+        assert sqlite_db.pending == 0
+
+        rows = await sqlite_db.fetch_rows("items")
+
+        assert len(rows) == 10
+
+        await sqlite_db.close()
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_sqlite_group_commit_errors(sqlite_db):
+    """A failed statement does not prevent the rest of the batch from being committed."""
+
+    async def test_coroutine():
+        results = await asyncio.gather(
+            sqlite_db.insert("vo_status", (1, "2024-01-01 00:00:00", 1)),
+            sqlite_db.execute("INSERT INTO unknown_table VALUES (?)", (1,)),
+            sqlite_db.insert("vo_status", (2, "2024-01-01 00:00:01", 0)),
+            return_exceptions=True)
+
+        assert isinstance(results[1], sqlite3.OperationalError)
+        assert len(await sqlite_db.query("SELECT * FROM vo_status")) == 2
+
+        await sqlite_db.close()
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_sqlite_flush(sqlite_db):
+    """Pending statements are committed on flush and visible to the sync API."""
+
+    async def test_coroutine():
+        loop = asyncio.get_running_loop()
+        task = loop.create_task(sqlite_db.insert("observer", (1, "10.0.0.1")))
+
+        await asyncio.sleep(0)
+
+        assert sqlite_db.pending == 1
+
+        await sqlite_db.flush()
+        await task
+
+        assert sqlite_db.fetch_all_rows("observer") == [(1, "10.0.0.1")]
+
+        await sqlite_db.close()
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_sqlite_parameterized_queries(sqlite_db):
+    """Query values are passed as parameters and single rows or pages can be fetched."""
+
+    async def test_coroutine():
+        for idx in range(7):
+            await sqlite_db.insert("observer", (idx, "10.0.0.{}".format(idx)))
+
+        row = await sqlite_db.fetch_one("SELECT ip FROM observer WHERE id = ?", (3,))
+        assert row == ("10.0.0.3",)
+
+        row = await sqlite_db.fetch_one("SELECT ip FROM observer WHERE ip = ?", ("' OR 1=1 --",))
+        assert row is None
+
+        page = await sqlite_db.fetch_page("SELECT id FROM observer ORDER BY id;", page_size=3, offset=3)
+        assert page == [(3,), (4,), (5,)]
+
+        page = await sqlite_db.fetch_page("SELECT id FROM observer WHERE id > ?", (1,), page_size=10)
+        assert len(page) == 5
+
+        await sqlite_db.close()
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_sqlite_iterate(sqlite_db):
+    """Rows are streamed from the cursor one page at a time."""
+
+    fetches = []
+    threads = set()
+    fetch_many = sqlite_db._fetch_many
+
+    def _fetch_many(cursor, size):
+        rows = fetch_many(cursor, size)
+        fetches.append(len(rows))
+        threads.add(threading.get_ident())
+        return rows
+
+    sqlite_db._fetch_many = _fetch_many
+
+    async def test_coroutine():
+        for idx in range(5):
+            await sqlite_db.insert("redirect_ip", (idx, "10.0.0.{}".format(idx)))
+
+        rows = [row async for row in sqlite_db.iterate(
+            "SELECT id FROM redirect_ip ORDER BY id", page_size=2)]
+
+        assert rows == [(idx,) for idx in range(5)]
+        assert fetches == [2, 2, 1]
+        assert len(threads) == 1
+
+        async for row in sqlite_db.iterate("SELECT id FROM redirect_ip", page_size=2):
+            break
+
+        await sqlite_db.close()
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_sqlite_retention(tmp_path):
+    """The oldest rows exceeding the maximum age or number of rows are deleted after inserting."""
+
+    retention = {"vo_status": {"max_rows": 5, "max_age": 3600}}
+    sqlite_db = SQLiteDatabase(str(tmp_path / "vo.db"), retention=retention)
+
+    now = datetime.datetime.now()
+
+    def timestamp(seconds_ago):
+        return (now - datetime.timedelta(seconds=seconds_ago)).isoformat(sep=" ")
+
+    async def test_coroutine():
+        for idx in range(3):
+            await sqlite_db.execute(
+                "INSERT INTO vo_status VALUES (?, ?, ?)", (idx, timestamp(7200 + idx), 1))
+
+        for idx in range(3, 10):
+            await sqlite_db.insert("vo_status", (idx, timestamp(10 - idx), 1))
+
+        rows = await sqlite_db.query("SELECT id FROM vo_status ORDER BY id")
+        assert rows == [(idx,) for idx in range(3, 10)]
+
+        assert await sqlite_db.apply_retention("vo_status") == 0
+        assert await sqlite_db.apply_retention("vo_status", force=True) == 2
+
+        rows = await sqlite_db.query("SELECT id FROM vo_status ORDER BY id")
+        assert rows == [(idx,) for idx in range(5, 10)]
+
+        await sqlite_db.close()
+
+    run_test_coroutine(test_coroutine)
+
+    with pytest.raises(ValueError):
+        sqlite_db.set_retention("vo_status", max_rows=0)
@@ -6,6 +6,7 @@ from tests.protocols.helpers import \
     client_test_on_event, \
     client_test_read_property, \
     client_test_write_property, \
+    client_test_multiple_properties, \
     client_test_invoke_action, \
     client_test_invoke_action_error, \
     client_test_on_property_change_error
@@ -24,6 +25,12 @@ def test_write_property(http_servient):
     client_test_write_property(http_servient, HTTPClient)
 
 
+def test_multiple_properties(http_servient):
+    """The HTTP client can read and write multiple properties at once."""
+
+    client_test_multiple_properties(http_servient, HTTPClient)
+
+
 def test_invoke_action(http_servient):
     """The HTTP client can invoke actions."""
 
@@ -116,6 +116,37 @@ def test_property_set_json(http_server):
     _test_property_set(http_server, body, prop_value, headers=JSON_HEADERS)
 
 
+def test_multiple_properties_errors(http_server):
+    """Requests for multiple Properties of unknown Things fail with 404
+    and requests with unknown Properties or invalid values with 400."""
+
+    exposed_thing = next(http_server.exposed_things)
+    prop_name = next(iter(exposed_thing.thing.properties.keys()))
+    base_url = "http://localhost:{}".format(http_server.port)
+    href = "{}/{}/properties".format(base_url, exposed_thing.thing.url_name)
+
+    async def fetch_code(url, **kwargs):
+        http_client = tornado.httpclient.AsyncHTTPClient()
+        response = await http_client.fetch(url, raise_error=False, **kwargs)
+        return response.code
+
+    async def test_coroutine():
+        assert await fetch_code("{}/{}/properties".format(base_url, Faker().pystr())) == 404
+        assert await fetch_code("{}?names={}".format(href, Faker().pystr())) == 400
+        assert await fetch_code("{}?names={}".format(href, prop_name)) == 200
+
+        bodies = [
+            json.dumps({"values": {Faker().pystr(): 1}}),
+            json.dumps({"values": [1]}),
+            "{"
+        ]
+
+        for body in bodies:
+            assert await fetch_code(href, method="PUT", body=body, headers=JSON_HEADERS) == 400
+
+    run_test_coroutine(test_coroutine)
+
+
 def test_property_subscribe(http_server):
     """Properties exposed in an HTTP server can be subscribed to with an HTTP GET request."""
 
@@ -13,6 +13,7 @@ from tests.protocols.helpers import \
     client_test_on_event, \
     client_test_read_property, \
     client_test_write_property, \
+    client_test_multiple_properties, \
     client_test_invoke_action, \
     client_test_invoke_action_error
 from tests.protocols.mqtt.broker import is_test_broker_online, BROKER_SKIP_REASON
@@ -36,6 +37,12 @@ def test_write_property(mqtt_servient):
     client_test_write_property(mqtt_servient, MQTTClient)
 
 
+def test_multiple_properties(mqtt_servient):
+    """Multiple Properties may be read and written in a single message using the MQTT binding client."""
+
+    client_test_multiple_properties(mqtt_servient, MQTTClient)
+
+
 def test_invoke_action(mqtt_servient):
     """Actions may be invoked using the MQTT binding client."""
 
@@ -15,6 +15,7 @@ from tests.protocols.helpers import \
     client_test_on_event, \
     client_test_read_property, \
     client_test_write_property, \
+    client_test_multiple_properties, \
     client_test_invoke_action, \
     client_test_invoke_action_error, \
     client_test_on_property_change_error
@@ -51,6 +52,12 @@ def test_write_property(websocket_servient):
     client_test_write_property(websocket_servient, WebsocketClient)
 
 
+def test_multiple_properties(websocket_servient):
+    """The Websockets client can read and write multiple properties at once."""
+
+    client_test_multiple_properties(websocket_servient, WebsocketClient)
+
+
 def test_invoke_action(websocket_servient):
     """The Websockets client can invoke actions."""
 
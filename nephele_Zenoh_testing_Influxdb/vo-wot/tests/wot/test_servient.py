@@ -2,9 +2,13 @@
 # -*- coding: utf-8 -*-
 
 import asyncio
+import gzip
 import json
+import os
 import random
+import tempfile
 import uuid
+from unittest.mock import MagicMock
 
 import pytest
 import tornado.httpclient
@@ -16,8 +20,10 @@ from wotpy.protocols.enums import Protocols
 from wotpy.protocols.ws.client import WebsocketClient
 from wotpy.protocols.ws.server import WebsocketServer
 from wotpy.protocols.http.server import HTTPServer
+from wotpy.wot.cluster import ClusterException, ClusterMessageTypes, ServientCluster
 from wotpy.wot.constants import WOT_TD_CONTEXT_URL_V1_1
 from wotpy.wot.consumed.thing import ConsumedThing
+from wotpy.wot.enums import InteractionTypes
 from wotpy.wot.servient import Servient
 from wotpy.wot.td import ThingDescription
 from wotpy.wot.wot import WoT
@@ -123,6 +129,47 @@ def test_servient_td_catalogue(servient):
     run_test_coroutine(test_coroutine)
 
 
+def test_servient_td_catalogue_cache(servient):
+    """The TD catalogue serves cached documents with ETags, compression and a version."""
+
+    async def test_coroutine():
+        wot = WoT(servient=servient)
+        exposed_thing = wot.produce(json.dumps(TD_DICT_01))
+        exposed_thing.expose()
+
+        http_client = tornado.httpclient.AsyncHTTPClient()
+        thing_url = "http://localhost:{}/{}".format(servient.catalogue_port, exposed_thing.thing.url_name)
+
+        res = await http_client.fetch(thing_url, decompress_response=False, headers={"Accept-Encoding": "gzip"})
+
+        assert res.headers["Content-Encoding"] == "gzip"
+        assert json.loads(gzip.decompress(res.body))["id"] == TD_DICT_01["id"]
+
+        etag = res.headers["Etag"]
+        version = int(res.headers["X-Catalogue-Version"])
+
+        res = await http_client.fetch(thing_url, headers={"If-None-Match": etag}, raise_error=False)
+
+        assert res.code == 304
+        assert int(res.headers["X-Catalogue-Version"]) == version
+
+        exposed_thing.add_property(uuid.uuid4().hex, {"type": "string"})
+
+        res = await http_client.fetch(thing_url, headers={"If-None-Match": etag}, raise_error=False)
+
+        assert res.code == 200
+        assert res.headers["Etag"] != etag
+        assert int(res.headers["X-Catalogue-Version"]) > version
+        assert len(json.loads(res.body)["properties"]) == 2
+
+        res = await http_client.fetch(
+            "http://localhost:{}/unknown-thing".format(servient.catalogue_port), raise_error=False)
+
+        assert res.code == 404
+
+    run_test_coroutine(test_coroutine)
+
+
 def test_servient_start_stop():
     """The servient and contained ExposedThings can be started and stopped."""
 
@@ -310,3 +357,324 @@ def test_clients_config():
     servient = Servient(clients_config={Protocols.HTTP: {"connect_timeout": connect_timeout}})
 
     assert servient.clients[Protocols.HTTP].connect_timeout == connect_timeout
+
+
+def test_expose_many():
+    """ExposedThings can be enabled in a batch and Forms are only generated for the changed Things."""
+
+    servient = Servient(catalogue_port=None)
+    servient.add_server(HTTPServer(port=find_free_port()))
+
+    wot = WoT(servient=servient)
+    titles = [uuid.uuid4().hex for _ in range(3)]
+
+    for title in titles:
+        wot.produce(json.dumps({
+            "@context": [WOT_TD_CONTEXT_URL_V1_1],
+            "id": uuid.uuid4().urn,
+            "title": title,
+            "securityDefinitions": {"nosec_sc": {"scheme": "nosec"}},
+            "security": "nosec_sc",
+            "properties": {"status": {"type": "string"}}
+        }))
+
+    exp_things = [servient.get_exposed_thing(title) for title in titles]
+    version = servient.td_catalogue.refresh()
+
+    servient.expose_many(titles[:2])
+
+    assert servient.td_catalogue.refresh() == version + 1
+    assert [bool(item.thing.properties["status"].forms) for item in exp_things] == [True, True, False]
+    assert len(exp_things[0].thing.forms) == 1
+
+    forms_first = exp_things[0].thing.properties["status"].forms
+
+    exp_things[2].expose()
+
+    assert len(exp_things[2].thing.properties["status"].forms) == len(forms_first)
+    assert exp_things[0].thing.properties["status"].forms[0] is forms_first[0]
+
+    exp_things[0].add_property("level", {"type": "number"})
+
+    assert len(exp_things[0].thing.properties["level"].forms) == len(forms_first)
+    assert exp_things[0].thing.properties["status"].forms[0] is forms_first[0]
+
+    servient.disable_exposed_thing(titles[0])
+
+    assert not exp_things[0].thing.properties["level"].forms
+    assert len(exp_things[1].thing.properties["status"].forms) == len(forms_first)
+
+    with pytest.raises(ValueError):
+        servient.expose_many([titles[1], uuid.uuid4().hex])
+
+
+def test_routing_registry():
+    """The servers of a servient resolve requests with the routing registry of the servient."""
+
+    servient = Servient(catalogue_port=None)
+    http_server = HTTPServer(port=find_free_port())
+    ws_server = WebsocketServer(port=find_free_port())
+    servient.add_server(http_server)
+    servient.add_server(ws_server)
+
+    assert http_server.routing_registry is servient.routing_registry
+    assert ws_server.routing_registry is servient.routing_registry
+
+    wot = WoT(servient=servient)
+    title = "Thing {}".format(uuid.uuid4().hex)
+
+    exposed_thing = wot.produce(json.dumps({
+        "@context": [WOT_TD_CONTEXT_URL_V1_1],
+        "id": uuid.uuid4().urn,
+        "title": title,
+        "securityDefinitions": {"nosec_sc": {"scheme": "nosec"}},
+        "security": "nosec_sc",
+        "properties": {"Status": {"type": "string"}},
+        "actions": {"Reset": {"input": {"type": "number"}}}
+    }))
+
+    assert servient.routing_registry.find_thing(title) is None
+
+    exposed_thing.expose()
+
+    url_name = exposed_thing.thing.url_name
+    route = http_server.resolve_route(url_name, "status", InteractionTypes.PROPERTY)
+
+    assert route.exposed_thing is exposed_thing
+    assert route.interaction is exposed_thing.thing.properties["Status"]
+    assert route.schema.type == "string"
+    assert route.security == ["nosec_sc"]
+    assert ws_server.resolve_route(title, "Status", InteractionTypes.PROPERTY) is route
+    assert ws_server.get_exposed_thing(url_name) is exposed_thing
+
+    action_route = http_server.resolve_route(title, "Reset", InteractionTypes.ACTION)
+
+    assert action_route.schema.type == "number"
+
+    with pytest.raises(ValueError):
+        http_server.resolve_route(title, "Status", InteractionTypes.ACTION)
+
+    exposed_thing.add_event("Alarm", {"data": {"type": "string"}})
+
+    assert http_server.resolve_route(title, "alarm", InteractionTypes.EVENT).name == "Alarm"
+
+    exposed_thing.remove_property("Status")
+
+    with pytest.raises(ValueError):
+        http_server.resolve_route(title, "Status", InteractionTypes.PROPERTY)
+
+    exposed_thing.destroy()
+
+    assert servient.routing_registry.find_thing(url_name) is None
+    assert not len(servient.routing_registry)
+
+    with pytest.raises(ValueError):
+        ws_server.get_exposed_thing(title)
+
+
+def test_cluster():
+    """Workers of a cluster share the HTTP port, the Property values and
+    the Events, and the handlers only run on the leader worker."""
+
+    port = find_free_port()
+    socket_path = os.path.join(tempfile.mkdtemp(), "cluster.sock")
+    title = uuid.uuid4().hex
+
+    td_str = json.dumps({
+        "@context": [WOT_TD_CONTEXT_URL_V1_1],
+        "id": uuid.uuid4().urn,
+        "title": title,
+        "securityDefinitions": {"nosec_sc": {"scheme": "nosec"}},
+        "security": "nosec_sc",
+        "properties": {"level": {"type": "number", "observable": True}},
+        "actions": {"increase": {"input": {"type": "number"}}},
+        "events": {"alarm": {"data": {"type": "string"}}}
+    })
+
+    servients = []
+    handler_workers = []
+
+    for worker_id in range(2):
+        servient = Servient(catalogue_port=None, cluster=ServientCluster(worker_id, socket_path))
+        servient.add_server(HTTPServer(port=port, reuse_port=True))
+        servients.append(servient)
+
+    async def test_coroutine():
+        leader_wot, follower_wot = [await servient.start() for servient in servients]
+        leader, follower = [wot.produce(td_str) for wot in (leader_wot, follower_wot)]
+
+        for worker_id, exp_thing in enumerate((leader, follower)):
+            async def increase(params, worker_id=worker_id, exp_thing=exp_thing):
+                handler_workers.append(worker_id)
+                value = await exp_thing.properties["level"].read() + params["input"]
+                await exp_thing.properties["level"].write(value)
+                return value
+
+            exp_thing.set_action_handler("increase", increase)
+            exp_thing.expose()
+
+        await leader.properties["level"].write(10)
+        await asyncio.sleep(0.1)
+
+        assert await follower.properties["level"].read() == 10
+
+        changes = []
+        events = []
+        follower.on_property_change("level").subscribe(lambda item: changes.append(item.data.value))
+        follower.on_event("alarm").subscribe(lambda item: events.append(item.data))
+
+        assert await follower.actions["increase"].invoke(5) == 15
+        assert await leader.properties["level"].read() == 15
+        assert await follower.properties["level"].read() == 15
+        assert handler_workers == [0]
+
+        await follower.properties["level"].write(20)
+
+        assert await leader.properties["level"].read() == 20
+
+        follower.emit_event("alarm", "overheat")
+        await asyncio.sleep(0.1)
+
+        assert changes == [15, 20]
+        assert events == ["overheat"]
+
+        http_client = tornado.httpclient.AsyncHTTPClient()
+        url = "http://localhost:{}/{}/property/level".format(port, leader.thing.url_name)
+
+        for _ in range(5):
+            response = await http_client.fetch(url)
+            assert json.loads(response.body)["value"] == 20
+
+        for servient in servients:
+            await servient.shutdown()
+
+        assert not os.path.exists(socket_path)
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_cluster_reconnect():
+    """Followers receive messages larger than the stream buffer
+    and reconnect to a restarted leader worker."""
+
+    socket_path = os.path.join(tempfile.mkdtemp(), "cluster.sock")
+
+    td_str = json.dumps({
+        "@context": [WOT_TD_CONTEXT_URL_V1_1],
+        "id": uuid.uuid4().urn,
+        "title": uuid.uuid4().hex,
+        "securityDefinitions": {"nosec_sc": {"scheme": "nosec"}},
+        "security": "nosec_sc",
+        "properties": {"blob": {"type": "string", "observable": True}}
+    })
+
+    def build_servient(worker_id):
+        cluster = ServientCluster(worker_id, socket_path, min_backoff=0.01, max_backoff=0.05)
+        return Servient(catalogue_port=None, cluster=cluster)
+
+    async def start_thing(servient):
+        exp_thing = (await servient.start()).produce(td_str)
+        exp_thing.expose()
+        return exp_thing
+
+    async def test_coroutine():
+        leader_servient, follower_servient = build_servient(0), build_servient(1)
+        leader = await start_thing(leader_servient)
+        follower = await start_thing(follower_servient)
+
+        large_value = "x" * (256 * 1024)
+        await follower.properties["blob"].write(large_value)
+
+        assert await leader.properties["blob"].read() == large_value
+        assert await follower.properties["blob"].read() == large_value
+
+        await leader_servient.shutdown()
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(ClusterException):
+            await follower.properties["blob"].write("lost")
+
+        leader_servient = build_servient(0)
+        leader = await start_thing(leader_servient)
+
+        for _ in range(100):
+            if leader_servient.cluster.followers:
+                break
+            await asyncio.sleep(0.02)
+
+        await follower.properties["blob"].write("restored")
+
+        assert await leader.properties["blob"].read() == "restored"
+
+        await follower_servient.shutdown()
+        await leader_servient.shutdown()
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_cluster_forward_timeout():
+    """Operations forwarded to a leader that does not reply in time fail
+    and their pending requests are discarded."""
+
+    socket_path = os.path.join(tempfile.mkdtemp(), "cluster.sock")
+
+    td_str = json.dumps({
+        "@context": [WOT_TD_CONTEXT_URL_V1_1],
+        "id": uuid.uuid4().urn,
+        "title": uuid.uuid4().hex,
+        "securityDefinitions": {"nosec_sc": {"scheme": "nosec"}},
+        "security": "nosec_sc",
+        "actions": {"wait": {}}
+    })
+
+    leader_servient = Servient(catalogue_port=None, cluster=ServientCluster(0, socket_path))
+    follower_cluster = ServientCluster(1, socket_path, request_timeout=0.1)
+    follower_servient = Servient(catalogue_port=None, cluster=follower_cluster)
+
+    async def test_coroutine():
+        leader_wot = await leader_servient.start()
+        follower_wot = await follower_servient.start()
+
+        async def wait(params):
+            await asyncio.sleep(1)
+
+        leader = leader_wot.produce(td_str)
+        leader.set_action_handler("wait", wait)
+        leader.expose()
+
+        follower = follower_wot.produce(td_str)
+        follower.expose()
+
+        with pytest.raises(ClusterException):
+            await follower.actions["wait"].invoke()
+
+        assert not follower_cluster._pending
+
+        await follower_servient.shutdown()
+        await leader_servient.shutdown()
+
+    run_test_coroutine(test_coroutine)
+
+
+def test_cluster_broadcast_slow_follower():
+    """The leader disconnects the followers whose write buffer is full
+    instead of queuing more messages for them."""
+
+    cluster = ServientCluster(0, "cluster.sock", max_buffer_size=1024)
+    exposed_thing = MagicMock(title="thing")
+
+    slow_writer = MagicMock()
+    slow_writer.is_closing.return_value = False
+    slow_writer.transport.get_write_buffer_size.return_value = 2048
+
+    writer = MagicMock()
+    writer.is_closing.return_value = False
+    writer.transport.get_write_buffer_size.return_value = 0
+
+    cluster._followers.update({slow_writer, writer})
+    cluster.broadcast(ClusterMessageTypes.VALUE, exposed_thing, "level", 1)
+
+    assert cluster.followers == 1
+    assert slow_writer.close.called
+    assert not slow_writer.write.called
+    assert writer.write.called
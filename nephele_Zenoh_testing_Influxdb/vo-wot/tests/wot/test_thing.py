@@ -16,7 +16,8 @@ from wotpy.wot.constants import WOT_TD_CONTEXT_URL_V1_1
 from wotpy.wot.dictionaries.thing import ThingFragment
 from wotpy.wot.td import ThingDescription
 from wotpy.wot.form import Form
-from wotpy.wot.interaction import Action
+from wotpy.wot.enums import InteractionTypes
+from wotpy.wot.interaction import Action, Property
 from wotpy.wot.thing import Thing
 
 TD_DICT = {
@@ -88,6 +89,34 @@ def test_find_interaction():
     assert thing.find_interaction(slugify(interaction_02.name)) is interaction_02
 
 
+def test_find_interaction_by_url_name():
+    """Interactions may be retrieved by URL-safe name and type on a Thing."""
+
+    thing_fragment = ThingFragment(TD_DICT)
+    thing = Thing(thing_fragment=thing_fragment)
+
+    action = Action(thing=thing, name="My_Action")
+    prop = Property(thing=thing, name="myProperty", type="string")
+
+    thing.add_interaction(action)
+    thing.add_interaction(prop)
+
+    assert thing.find_interaction_by_url_name("my-action") is action
+    assert thing.find_interaction_by_url_name("my-action", InteractionTypes.ACTION) is action
+    assert thing.find_interaction_by_url_name("my-action", InteractionTypes.PROPERTY) is None
+    assert thing.find_interaction_by_url_name("myproperty", InteractionTypes.PROPERTY) is prop
+    assert thing.find_interaction_by_url_name("My_Action") is None
+
+    assert thing.normalize_interaction_name("MY-ACTION") == action.name
+    assert thing.normalize_interaction_name("myProperty") == prop.name
+    assert thing.normalize_interaction_name("unknown") is None
+
+    thing.remove_interaction(action.name)
+
+    assert thing.find_interaction_by_url_name("my-action") is None
+    assert thing.normalize_interaction_name("my-action") is None
+
+
 def test_remove_interaction():
     """Interactions may be removed from a Thing by name."""
 
@@ -163,3 +192,40 @@ def test_duplicated_forms():
 
     with pytest.raises(ValueError):
         interaction.add_form(form_06)
+
+
+def test_thing_fragment_cache():
+    """The ThingFragment and the TD of a Thing are rebuilt only after it is modified."""
+
+    thing_fragment = ThingFragment(TD_DICT)
+    thing = Thing(thing_fragment=thing_fragment)
+    interaction = Action(thing=thing, name="my_interaction")
+    thing.add_interaction(interaction)
+
+    assert thing.id == TD_DICT["id"]
+    assert thing.url_name == slugify(TD_DICT["title"])
+
+    td = ThingDescription.from_thing(thing)
+    revision = thing.revision
+
+    assert ThingDescription.from_thing(thing) is td
+    assert td.to_str() is td.to_str()
+    assert not td.actions["my_interaction"].forms
+
+    form = Form(interaction=interaction, protocol=Protocols.HTTP, href="/href", content_type="application/json")
+    interaction.add_form(form)
+
+    assert thing.revision > revision
+    assert ThingDescription.from_thing(thing) is not td
+    assert len(thing.thing_fragment.actions["my_interaction"].forms) == 1
+
+    id_updated = uuid.uuid4().urn
+    thing.id = id_updated
+
+    assert thing.id == id_updated
+    assert thing.thing_fragment.id == id_updated
+    assert ThingDescription.from_thing(thing).id == id_updated
+
+    thing.remove_interaction(interaction.name)
+
+    assert not thing.thing_fragment.actions
@@ -6,28 +6,38 @@ Default Servient class
 """
 
 import logging
+import os
 import ssl
 import urllib.parse
 
+from wotpy.database.database_schema import STATUS_TABLES
+from wotpy.database.enums import InfluxDBLayout, InfluxDBWriteMode
+from wotpy.database.sqlite_database import DEFAULT_DB_PATH, MEMORY_DB_PATH
 from wotpy.utils.utils import dict_merge
-from wotpy.protocols.http.client import HTTPClient
-from wotpy.protocols.http.server import HTTPServer
-from wotpy.protocols.coap.client import CoAPClient
-from wotpy.protocols.coap.server import CoAPServer
-from wotpy.protocols.mqtt.client import MQTTClient
-from wotpy.protocols.mqtt.server import MQTTServer
-from wotpy.protocols.ws.client import WebsocketClient
-from wotpy.protocols.ws.server import WebsocketServer
+from wotpy.wot.cluster import ServientCluster, default_socket_path
 from wotpy.wot.servient import Servient
 
 
 class DefaultServient(Servient):
-    """Servient with preconfigured values."""
+    """Servient with preconfigured values.
+    Only the protocol bindings enabled in the config are imported."""
 
     DEFAULT_CONFIG = {
         "type": "VO",
         "deploymentType": "A",
         "catalogue": 9090,
+        "propertyHistorySize": 100,
+        "propertyChangePolicies": {},
+        "actionExecutionPolicies": {},
+        "actionThreadPoolSize": None,
+        "actionProcessPoolSize": None,
+        "workers": 1,
+        "clusterSocketPath": None,
+        "eventLoop": {
+            "policy": None,
+            "executorSize": None,
+            "slowCallbackDuration": None
+        },
         "bindingNB": {
             "bindingModeNB": ["U", "H"],
             "hostname": None,
@@ -84,16 +94,66 @@ class DefaultServient(Servient):
                 "address": "http://localhost:8086",
                 "dbUser": "my-username",
                 "dbPass": "my-password",
-                "dbToken": "my-token"
+                "dbToken": "my-token",
+                "writeMode": "sync",
+                "batchSize": 500,
+                "flushInterval": 1000,
+                "maxQueueSize": 10000,
+                "backpressure": "block",
+                "layout": "bucket-per-key",
+                "bucket": None,
+                "spoolFilePath": "influxdb_spool.jsonl",
+                "spoolMaxSize": 67108864,
+                "reconnectMinBackoff": 1000,
+                "reconnectMaxBackoff": 60000,
+                "eventLog": {
+                    "enabled": True,
+                    "sampleEvery": 1,
+                    "maxRate": None,
+                    "interactions": {}
+                }
             },
             "persistentDB": {
                 "SQLite": "enabled",
-                "dbFilePath": None
+                "dbFilePath": None,
+                "journalMode": "WAL",
+                "synchronous": "NORMAL",
+                "readerPoolSize": 4,
+                "commitDelay": 5,
+                "maxBatchSize": 256,
+                "statementCacheSize": 128,
+                "pageSize": 500,
+                "blobChunkSize": 262144,
+                "statusRetention": {
+                    "maxRows": 100000,
+                    "maxAge": 604800
+                }
             }
         }
     }
 
-    def __init__(self, config):
+    @classmethod
+    def _spool_path(cls, spool_path, database_config, worker_id=None):
+        """Returns the absolute path of the InfluxDB spool. Relative paths are
+        resolved against the directory of the SQLite database file. Workers other
+        than the leader get their own file so that they never replay the same spool."""
+
+        if spool_path is None:
+            return spool_path
+
+        if worker_id:
+            root, ext = os.path.splitext(spool_path)
+            spool_path = "{}.worker{}{}".format(root, worker_id, ext)
+
+        if os.path.isabs(spool_path):
+            return spool_path
+
+        db_path = database_config["persistentDB"]["dbFilePath"] or DEFAULT_DB_PATH
+        db_dir = os.path.dirname(os.path.abspath(db_path)) if db_path != MEMORY_DB_PATH else os.getcwd()
+
+        return os.path.join(db_dir, spool_path)
+
+    def __init__(self, config, worker_id=None):
         self._logr = logging.getLogger(__name__)
 
         default_config = dict(self.DEFAULT_CONFIG)
@@ -101,6 +161,14 @@ class DefaultServient(Servient):
         self.config = default_config
 
         vo_name = self.config["name"]
+        catalogue_port = int(self.config["catalogue"])
+
+        cluster = None
+        reuse_port = False
+        if int(self.config["workers"]) > 1:
+            socket_path = self.config["clusterSocketPath"] or default_socket_path(vo_name, catalogue_port)
+            cluster = ServientCluster(worker_id or ServientCluster.LEADER_ID, socket_path)
+            reuse_port = True
 
         servers = []
         server_bindings_north = self.config["bindingNB"]
@@ -121,6 +189,8 @@ class DefaultServient(Servient):
             credentials_dict_north[vo_name]["token"] = token_north
 
         if "H" in binding_modes_north:
+            from wotpy.protocols.http.server import HTTPServer
+
             port = int(server_bindings_north["ports"]["httpPort"])
             proxy_port = None
             if "httpProxyPort" in server_bindings_north["ports"]:
@@ -137,10 +207,13 @@ class DefaultServient(Servient):
 
             servers.append(HTTPServer(
                 port=port, security_scheme=security_scheme,
-                ssl_context=ssl_context, form_port=proxy_port
+                ssl_context=ssl_context, form_port=proxy_port,
+                reuse_port=reuse_port
             ))
 
         if "U" in binding_modes_north:
+            from wotpy.protocols.coap.server import CoAPServer
+
             port = int(server_bindings_north["ports"]["coapPort"])
 
             oscore_credentials_map_north = None
@@ -153,6 +226,8 @@ class DefaultServient(Servient):
                 oscore_credentials_map=oscore_credentials_map_north))
 
         if "M" in binding_modes_north:
+            from wotpy.protocols.mqtt.server import MQTTServer
+
             broker_url = server_bindings_north["brokerIP"]
 
             mqtt_ca_file_north = None
@@ -166,6 +241,8 @@ class DefaultServient(Servient):
             servers.append(MQTTServer(broker_url, ca_file=mqtt_ca_file_north))
 
         if "WS" in binding_modes_north:
+            from wotpy.protocols.ws.server import WebsocketServer
+
             port = int(server_bindings_north["ports"]["websocketPort"])
 
             ssl_context = None
@@ -178,10 +255,9 @@ class DefaultServient(Servient):
                 ssl_context.load_cert_chain(certfile=certfile, keyfile=keyfile)
 
             servers.append(WebsocketServer(
-                port=port, ssl_context=ssl_context
+                port=port, ssl_context=ssl_context, reuse_port=reuse_port
             ))
 
-        catalogue_port = int(self.config["catalogue"])
         server_bindings_south = self.config["bindingSB"]
         binding_modes_south = server_bindings_south["bindingModeSB"]\
             if server_bindings_south["bindingModeSB"] is not None else []
@@ -193,6 +269,8 @@ class DefaultServient(Servient):
 
         clients = []
         if "H" in binding_modes_south:
+            from wotpy.protocols.http.client import HTTPClient
+
             http_client = HTTPClient()
             credentials_dict_south = {}
             security_scheme_dict = {
@@ -212,6 +290,8 @@ class DefaultServient(Servient):
             clients.append(http_client)
 
         if "U" in binding_modes_south:
+            from wotpy.protocols.coap.client import CoAPClient
+
             oscore_credentials_map_south = None
             if server_bindings_south["OSCORECredentialsMap"] is not None:
                 oscore_credentials_map_south = server_bindings_south["OSCORECredentialsMap"]
@@ -232,12 +312,16 @@ class DefaultServient(Servient):
             clients.append(coap_client)
 
         if "M" in binding_modes_south:
+            from wotpy.protocols.mqtt.client import MQTTClient
+
             mqtt_ca_file_south = None
             if server_bindings_south["mqttCAFile"] is not None:
                 mqtt_ca_file_north = server_bindings_south["mqttCAFile"]
             clients.append(MQTTClient(ca_file=mqtt_ca_file_south))
 
         if "WS" in binding_modes_south:
+            from wotpy.protocols.ws.client import WebsocketClient
+
             ws_client = WebsocketClient()
             clients.append(ws_client)
 
@@ -248,14 +332,73 @@ class DefaultServient(Servient):
         influxdb_url = timeseries_db["address"]
         influxdb_token = timeseries_db["dbToken"]
 
+        influxdb_batch_options = None
+        if timeseries_db["writeMode"] == InfluxDBWriteMode.BATCH:
+            influxdb_batch_options = {
+                "batch_size": timeseries_db["batchSize"],
+                "flush_interval": timeseries_db["flushInterval"],
+                "max_queue_size": timeseries_db["maxQueueSize"],
+                "backpressure": timeseries_db["backpressure"]
+            }
+        elif timeseries_db["writeMode"] != InfluxDBWriteMode.SYNC:
+            raise ValueError(f"Invalid InfluxDB write mode: {timeseries_db['writeMode']}")
+
+        influxdb_layout = timeseries_db["layout"]
+        influxdb_bucket = timeseries_db["bucket"]
+        if influxdb_layout == InfluxDBLayout.BUCKET_PER_VO and influxdb_bucket is None:
+            influxdb_bucket = vo_name
+
+        influxdb_connection_options = {
+            "spool_path": self._spool_path(
+                timeseries_db["spoolFilePath"], database_config,
+                worker_id=cluster.worker_id if cluster else None),
+            "spool_max_size": timeseries_db["spoolMaxSize"],
+            "min_backoff": timeseries_db["reconnectMinBackoff"] / 1000,
+            "max_backoff": timeseries_db["reconnectMaxBackoff"] / 1000
+        }
+
+        event_log = timeseries_db["eventLog"]
+        influxdb_event_log_options = {
+            "default": {key: val for key, val in event_log.items() if key != "interactions"},
+            "interactions": event_log["interactions"] or {}
+        }
+
         persistent_db = database_config["persistentDB"]
         sqlite_enabled = (persistent_db["SQLite"] == "enabled")
         sqlite_db_path = persistent_db["dbFilePath"]
+        sqlite_options = {
+            "journal_mode": persistent_db["journalMode"],
+            "synchronous": persistent_db["synchronous"],
+            "reader_pool_size": persistent_db["readerPoolSize"],
+            "commit_delay": persistent_db["commitDelay"],
+            "max_batch_size": persistent_db["maxBatchSize"],
+            "statement_cache_size": persistent_db["statementCacheSize"],
+            "page_size": persistent_db["pageSize"],
+            "retention": {
+                table_name: {
+                    "max_rows": persistent_db["statusRetention"]["maxRows"],
+                    "max_age": persistent_db["statusRetention"]["maxAge"]
+                }
+                for table_name in STATUS_TABLES
+            }
+        }
+        blob_chunk_size = persistent_db["blobChunkSize"]
 
         self._logr.info("Creating servient with TD catalogue on: %s", catalogue_port)
         super().__init__(hostname=hostname, clients=clients, catalogue_port=catalogue_port,
             influxdb_enabled=influxdb_enabled, influxdb_token=influxdb_token,
-            influxdb_url=influxdb_url, sqlite_db_path=sqlite_db_path)
+            influxdb_url=influxdb_url, influxdb_batch_options=influxdb_batch_options,
+            influxdb_layout=influxdb_layout, influxdb_bucket=influxdb_bucket,
+            influxdb_connection_options=influxdb_connection_options,
+            influxdb_event_log_options=influxdb_event_log_options,
+            sqlite_db_path=sqlite_db_path, sqlite_options=sqlite_options,
+            blob_chunk_size=blob_chunk_size,
+            property_history_size=self.config["propertyHistorySize"],
+            property_change_policies=self.config["propertyChangePolicies"],
+            action_execution_policies=self.config["actionExecutionPolicies"],
+            action_thread_pool_size=self.config["actionThreadPoolSize"],
+            action_process_pool_size=self.config["actionProcessPoolSize"],
+            cluster=cluster)
 
         for server in servers:
             self.add_server(server)
@@ -5,33 +5,55 @@
 Class that handles InfluxDB database operations.
 """
 
-import json
+import asyncio
+import itertools
 import time
 
 import influxdb_client
 
-from influxdb_client import InfluxDBClient
+from influxdb_client import InfluxDBClient, WritePrecision
 from influxdb_client.client.write_api import SYNCHRONOUS
 
+from wotpy.database.enums import InfluxDBLayout, QueryOutputFormat
+from wotpy.database.influxdb_connection import InfluxDBConnectionManager, is_rejection
+from wotpy.database.influxdb_encoder import encode_fields
+from wotpy.database.influxdb_event_log import InfluxDBEventLog
+from wotpy.database.influxdb_writer import InfluxDBBatchWriter
+
 
 class InfluxDB:
-    """Class that handles InfluxDB database operations."""
+    """Class that handles InfluxDB database operations.
+    Two storage layouts are supported: one bucket per property key
+    (the default) or one bucket per VO with one measurement per property
+    and the Thing title and property name stored as tags.
+    When the connection manager is enabled the database is probed in the
+    background and points are spooled to disk while it is unreachable."""
+
+    DEFAULT_QUERY_TIMEOUT_SECS = 30
+    QUERY_CHUNK_SIZE = 1000
+
+    def __init__(self, url, org, token, batch_options=None,
+                 layout=InfluxDBLayout.BUCKET_PER_KEY, bucket=None,
+                 connection_options=None, event_log_options=None):
+        if layout not in InfluxDBLayout.list():
+            raise ValueError("Invalid InfluxDB layout: {}".format(layout))
 
-    def __init__(self, url, org, token):
         self.client = InfluxDBClient(url=url, org=org, token=token)
+        self.org = org
+        self.layout = layout
+        self.bucket = bucket
+        self.writer = None
+        self.connection = None
+        self._bucket_registry = set()
+        self._pending_buckets = set()
 
-    def is_reachable(self):
-        """Tries a certain number of times to connect to the InfluxDB database
-        and raises a ConnectionError if the connection cannot be established."""
+        if batch_options is not None:
+            self.writer = InfluxDBBatchWriter(self, **batch_options)
 
-        max_retries = 15
-        retry_interval = 10
-        for retry in range(max_retries):
-            if not self.client.ping():
-                if retry == max_retries - 1:
-                    return False
-                time.sleep(retry_interval)
-        return True
+        if connection_options is not None:
+            self.connection = InfluxDBConnectionManager(self, **connection_options)
+
+        self.event_log = InfluxDBEventLog(self, **(event_log_options or {}))
 
     def init_apis(self):
         """Initializes the InfluxDB APIs."""
@@ -40,25 +62,285 @@ class InfluxDB:
         self.write_api = self.client.write_api(write_options=SYNCHRONOUS)
         self.query_api = self.client.query_api()
 
+        if self.writer is not None:
+            self.writer.start()
+
+        if self.connection is not None:
+            self.connection.start()
+
+    async def shutdown(self):
+        """Stops the batch writer (if any) flushing the pending points
+        and the background connection manager (if any)."""
+
+        if self.writer is not None:
+            await self.writer.stop()
+
+        if self.connection is not None:
+            await self.connection.stop()
+
     def close_apis(self):
         """Closes the APIs when done."""
 
         self.write_api.close()
 
-    def write_point(self, key, value):
-        """Writes the value in the specified bucket creating the bucket if it
-        doesn't exist."""
+    def build_point(self, key, value, tags=None, schema=None):
+        """Builds a point for the given value timestamped at the current time.
+        The whole value is stored in a single point with one typed field per
+        nested key or array element, following the TD data schema if given.
+        Returns None if the value has no fields."""
+
+        fields = encode_fields(value, schema=schema)
+
+        if not fields:
+            return None
+
+        point = influxdb_client.Point(key)
+
+        for tag_key, tag_value in (tags or {}).items():
+            point.tag(tag_key, tag_value)
+
+        for field_key, field_value in fields.items():
+            point.field(field_key, field_value)
+
+        return point.time(time.time_ns(), WritePrecision.NS)
+
+    def thing_bucket(self, thing_title):
+        """Returns the bucket that stores the points of the given Thing
+        when using the bucket per VO layout."""
+
+        return self.bucket if self.bucket else thing_title
+
+    def ensure_bucket(self, bucket):
+        """Creates the bucket if it doesn't exist. Buckets are looked up
+        only the first time and are then kept in the bucket registry."""
+
+        if bucket in self._bucket_registry:
+            return
+
+        if not self.buckets_api.find_bucket_by_name(bucket):
+            self.buckets_api.create_bucket(bucket_name=bucket)
+
+        self._bucket_registry.add(bucket)
+
+    def resolve_buckets(self, thing_title, property_names):
+        """Populates the bucket registry with the buckets
+        that will be used to store the given Thing properties.
+        With the connection manager enabled the buckets are resolved
+        from the executor once the database is reachable."""
+
+        if self.layout == InfluxDBLayout.BUCKET_PER_VO:
+            buckets = {self.thing_bucket(thing_title)}
+        else:
+            buckets = set(property_names)
+
+        self._pending_buckets.update(buckets - self._bucket_registry)
+
+        if self.connection is None:
+            self.resolve_pending_buckets()
+
+    def resolve_pending_buckets(self):
+        """Resolves the buckets registered with resolve_buckets."""
+
+        while self._pending_buckets:
+            self.ensure_bucket(self._pending_buckets.pop())
+
+    def write_direct(self, bucket, records):
+        """Writes one or more records in the specified bucket creating
+        the bucket if it doesn't exist, without going through the spool."""
+
+        self.ensure_bucket(bucket)
+        self.write_api.write(bucket=bucket, record=records)
+
+    def write_records(self, bucket, records):
+        """Writes one or more records in the specified bucket creating the
+        bucket if it doesn't exist. With the connection manager enabled the
+        records are spooled while the database is unreachable."""
+
+        if self.connection is None:
+            self.write_direct(bucket, records)
+            return
+
+        if not self.connection.is_connected:
+            self.connection.store(bucket, records)
+            return
+
+        try:
+            self.write_direct(bucket, records)
+        except Exception as ex:
+            if is_rejection(ex):
+                self.connection.reject(bucket, records)
+                return
+
+            self.connection.mark_disconnected()
+            self.connection.store(bucket, records)
+
+    def write_point(self, key, value, bucket=None, tags=None, schema=None):
+        """Writes the value in the specified bucket (which defaults to the key)
+        creating the bucket if it doesn't exist. When the batch writer is
+        enabled the point is queued and written in the background instead."""
+
+        bucket = bucket if bucket else key
+        point = self.build_point(key, value, tags=tags, schema=schema)
+
+        if point is None:
+            return
 
-        if isinstance(value, list):
-            value = json.dumps(value)
+        if self.writer is not None:
+            self.writer.enqueue(bucket, point)
+        else:
+            self.write_records(bucket, point)
 
-        point = influxdb_client.Point(key).field("value", value)
+    async def wait_for_capacity(self):
+        """Waits until the batch writer (if enabled) has room for new points."""
 
-        if not self.buckets_api.find_bucket_by_name(key):
-            self.buckets_api.create_bucket(bucket_name=key)
-        self.write_api.write(bucket=key, record=point)
+        if self.writer is not None:
+            await self.writer.wait_for_capacity()
+
+    def write_property(self, thing_title, name, value, schema=None):
+        """Writes a property value as a single point following the storage layout:
+        in the bucket of the property or tagged in the bucket of the VO. The schema
+        is the TD data schema of the property, used to type the numeric fields."""
+
+        if self.layout == InfluxDBLayout.BUCKET_PER_VO:
+            self.write_point(
+                name, value, bucket=self.thing_bucket(thing_title),
+                tags={"thing": thing_title, "property": name}, schema=schema)
+        else:
+            self.write_point(name, value, schema=schema)
+
+    def write_event(self, thing_title, key, value, tags=None):
+        """Writes an event or action log entry following the storage layout."""
+
+        tags = dict(tags or {}, thing=thing_title)
+
+        if self.layout == InfluxDBLayout.BUCKET_PER_VO:
+            self.write_point(key, value, bucket=self.thing_bucket(thing_title), tags=tags)
+        else:
+            self.write_point(key, value, tags=tags)
+
+    def log_event(self, thing_title, event):
+        """Writes an emitted event to the structured event log."""
+
+        self.event_log.log_event(thing_title, event)
+
+    def log_action_invocation(self, thing_title, action_name, return_value, latency=None):
+        """Writes an action invocation to the structured event log."""
+
+        self.event_log.log_action_invocation(
+            thing_title, action_name, return_value, latency=latency)
+
+    def property_query(self, thing_title, name, start="-10m"):
+        """Returns the Flux query that selects the points of the given
+        property in a time range, following the storage layout."""
+
+        if self.layout == InfluxDBLayout.BUCKET_PER_VO:
+            return 'from(bucket:"{}")\
+            |> range(start: {})\
+            |> filter(fn: (r) => r._measurement == "{}" and r.thing == "{}")'.format(
+                self.thing_bucket(thing_title), start, name, thing_title)
+
+        return 'from(bucket:"{}")\
+        |> range(start: {})'.format(name, start)
 
     def execute_query(self, query):
         """Executes the input query and returns its output."""\
 
         return self.query_api.query(org="wot", query=query)
+
+    @staticmethod
+    async def _run_until(loop, deadline, future):
+        """Waits for a future of the executor raising asyncio.TimeoutError
+        if the deadline is reached. The future itself is not cancelled, so
+        it is only done once the executor thread has finished."""
+
+        if deadline is None:
+            return await future
+
+        return await asyncio.wait_for(asyncio.shield(future), timeout=max(deadline - loop.time(), 0))
+
+    @staticmethod
+    def _close_stream(records):
+        """Closes a stream of records, releasing its HTTP response."""
+
+        try:
+            records.close()
+        except AttributeError:
+            pass
+
+    async def query_stream(self, query, params=None, timeout=None, limit=None):
+        """Executes the input query in the executor and yields the resulting
+        FluxRecords as an async generator. Records are parsed in chunks so the
+        whole result is never kept in memory. Raises asyncio.TimeoutError if
+        the query takes longer than timeout seconds and stops after limit rows."""
+
+        loop = asyncio.get_running_loop()
+        timeout = timeout if timeout is not None else self.DEFAULT_QUERY_TIMEOUT_SECS
+        deadline = loop.time() + timeout if timeout else None
+
+        def start_query():
+            return self.query_api.query_stream(query, org=self.org, params=params)
+
+        def take_chunk(size):
+            return list(itertools.islice(records, size))
+
+        def close_started(future):
+            if not future.cancelled() and future.exception() is None:
+                self._close_stream(future.result())
+
+        pending = loop.run_in_executor(None, start_query)
+
+        try:
+            records = await self._run_until(loop, deadline, pending)
+        except BaseException:
+            # The stream is closed once the query started in the executor returns
+            pending.add_done_callback(close_started)
+            raise
+
+        count = 0
+
+        try:
+            while limit is None or count < limit:
+                size = self.QUERY_CHUNK_SIZE if limit is None else min(self.QUERY_CHUNK_SIZE, limit - count)
+                pending = loop.run_in_executor(None, take_chunk, size)
+                chunk = await self._run_until(loop, deadline, pending)
+
+                if not chunk:
+                    break
+
+                count += len(chunk)
+
+                for record in chunk:
+                    yield record
+        finally:
+            # The stream is closed once the executor thread is no longer reading from it
+            if pending.done():
+                self._close_stream(records)
+            else:
+                pending.add_done_callback(lambda _: self._close_stream(records))
+
+    async def query_columns(self, query, columns=("_time", "_value"), params=None,
+                            timeout=None, limit=None, output=QueryOutputFormat.NUMPY):
+        """Executes the input query without blocking the event loop and returns
+        the given columns of all the resulting records. The result is a dict
+        of NumPy arrays (the default) or a pyarrow Table."""
+
+        if output not in QueryOutputFormat.list():
+            raise ValueError("Invalid query output format: {}".format(output))
+
+        values = {column: [] for column in columns}
+
+        async for record in self.query_stream(query, params=params, timeout=timeout, limit=limit):
+            for column in columns:
+                values[column].append(record.values.get(column))
+
+        if output == QueryOutputFormat.ARROW:
+            try:
+                import pyarrow
+            except ImportError:
+                raise ImportError("The pyarrow package is required for arrow query results")
+
+            return pyarrow.table(values)
+
+        import numpy as np
+
+        return {column: np.array(column_values) for column, column_values in values.items()}
@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Classes that write a structured log of events and action invocations to InfluxDB.
+"""
+
+import time
+
+from wotpy.wot.events import \
+    PropertyChangeEmittedEvent, \
+    ActionInvocationEmittedEvent, \
+    ThingDescriptionChangeEmittedEvent
+
+
+class RateLimiter:
+    """Token bucket that allows up to rate entries per second
+    with bursts of up to rate entries (and at least one)."""
+
+    def __init__(self, rate):
+        self._rate = float(rate)
+        self._capacity = max(self._rate, 1.0)
+        self._tokens = self._capacity
+        self._last = time.monotonic()
+
+    def allow(self):
+        """Returns True if an entry can be logged now, consuming one token."""
+
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._last) * self._rate)
+        self._last = now
+
+        if self._tokens < 1:
+            return False
+
+        self._tokens -= 1
+
+        return True
+
+
+class EventLogPolicy:
+    """Sampling and rate limiting settings for the log entries of one interaction.
+    One of every sample_every entries is kept and at most max_rate entries
+    per second are written (no limit if max_rate is None)."""
+
+    def __init__(self, enabled=True, sample_every=1, max_rate=None):
+        self.enabled = bool(enabled)
+        self.sample_every = int(sample_every)
+        self.max_rate = float(max_rate) if max_rate is not None else None
+
+        if self.sample_every < 1:
+            raise ValueError("Event log sampling must be a positive integer")
+
+        if self.max_rate is not None and self.max_rate <= 0:
+            raise ValueError("Event log max rate must be positive")
+
+        self._count = 0
+        self._rate_limiter = RateLimiter(self.max_rate) if self.max_rate is not None else None
+
+    @classmethod
+    def from_dict(cls, config):
+        """Builds a policy from the camelCase dict used in the VO Descriptor."""
+
+        return cls(
+            enabled=config.get("enabled", True),
+            sample_every=config.get("sampleEvery", 1),
+            max_rate=config.get("maxRate", None))
+
+    def sample(self):
+        """Returns True if the next entry has to be logged."""
+
+        if not self.enabled:
+            return False
+
+        self._count += 1
+
+        if (self._count - 1) % self.sample_every != 0:
+            return False
+
+        return self._rate_limiter.allow() if self._rate_limiter is not None else True
+
+
+class InfluxDBEventLog:
+    """Writes emitted events, property changes, TD changes and action invocations
+    as structured points: the Thing title and the interaction name are stored as
+    tags and the payload (or action output and latency) as typed fields.
+    Payload fields are prefixed with the interaction name, so that different
+    events sharing the measurement never disagree on the type of a field.
+    Sampling and rate limiting can be configured for each interaction."""
+
+    def __init__(self, influxdb, default=None, interactions=None):
+        self._influxdb = influxdb
+        self._default_config = default or {}
+        self._interactions_config = interactions or {}
+        self._policies = {}
+
+        self._stats = {
+            "logged": 0,
+            "skipped": 0
+        }
+
+    @property
+    def stats(self):
+        """Returns a dict with the counters of logged and skipped entries."""
+
+        return dict(self._stats)
+
+    def _policy(self, thing_title, name):
+        """Returns the policy of the given interaction of the given Thing."""
+
+        key = (thing_title, name)
+
+        if key not in self._policies:
+            config = self._interactions_config.get(name, self._default_config)
+            self._policies[key] = EventLogPolicy.from_dict(config)
+
+        return self._policies[key]
+
+    def _write(self, thing_title, measurement, name, tags, fields):
+        """Writes an entry if allowed by the policy of the interaction."""
+
+        if not self._policy(thing_title, name).sample():
+            self._stats["skipped"] += 1
+            return
+
+        self._influxdb.write_event(thing_title, measurement, fields, tags=tags)
+        self._stats["logged"] += 1
+
+    def log_event(self, thing_title, event):
+        """Writes an emitted event to the log."""
+
+        if isinstance(event, PropertyChangeEmittedEvent):
+            self._write(
+                thing_title, "event", event.name,
+                tags={"event": event.name, "property": event.data.name},
+                fields={"count": 1})
+        elif isinstance(event, ThingDescriptionChangeEmittedEvent):
+            self._write(
+                thing_title, "event", event.name,
+                tags={
+                    "event": event.name,
+                    "type": event.data.td_change_type,
+                    "method": event.data.method
+                },
+                fields={"interaction": event.data.name})
+        elif isinstance(event, ActionInvocationEmittedEvent):
+            self.log_action_invocation(thing_title, event.data.action_name, event.data.return_value)
+        else:
+            self._write(
+                thing_title, "event", event.name,
+                tags={"event": event.name},
+                fields={event.name: event.data, "count": 1})
+
+    def log_action_invocation(self, thing_title, action_name, return_value, latency=None):
+        """Writes an action invocation to the log with its
+        output and its latency in milliseconds (if known)."""
+
+        fields = {action_name: return_value, "count": 1}
+
+        if latency is not None:
+            fields["latency"] = float(latency)
+
+        self._write(
+            thing_title, "action", action_name,
+            tags={"action": action_name},
+            fields=fields)
@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Class that stores binary content in chunks in the sqlite database.
+"""
+
+import asyncio
+import hashlib
+import uuid
+
+from wotpy.database.database_schema import BLOB_STORE_SCHEMA
+
+BLOB_BYTES_TYPES = (bytes, bytearray, memoryview)
+
+
+class SQLiteBlobStore:
+    """Stores named binary blobs (e.g. maps or rosbags) in BLOB chunks of the sqlite
+    database instead of base64 encoded TEXT rows. Content is written and read one
+    chunk at a time so whole blobs never need to be kept in memory, and ranges of
+    a blob only read the chunks they overlap. Blobs are addressed by the SHA-256
+    hash of their content, so blobs with the same content are stored only once.
+    Ranges are read with substr() on the chunks instead of Connection.blobopen,
+    which needs Python 3.11 and can not be shared by the reader pool threads."""
+
+    DEFAULT_CHUNK_SIZE = 256 * 1024
+
+    def __init__(self, sqlite_db, chunk_size=None):
+        self._sqlite_db = sqlite_db
+        self._chunk_size = int(chunk_size or self.DEFAULT_CHUNK_SIZE)
+        self._schema_created = False
+
+        if self._chunk_size <= 0:
+            raise ValueError("Blob chunk size must be positive")
+
+    @property
+    def chunk_size(self):
+        """Returns the size in bytes of the chunks of new blobs."""
+
+        return self._chunk_size
+
+    async def _ensure_schema(self):
+        """Creates the tables of the blob store if they do not exist."""
+
+        if self._schema_created:
+            return
+
+        await self._sqlite_db.execute_script(BLOB_STORE_SCHEMA)
+        self._schema_created = True
+
+    async def _iter_data(self, data):
+        """Yields the pieces of the given bytes, file-like
+        object or (async) iterable of bytes objects."""
+
+        if isinstance(data, BLOB_BYTES_TYPES):
+            view = memoryview(data)
+
+            for start in range(0, len(view), self._chunk_size):
+                yield view[start:start + self._chunk_size]
+        elif hasattr(data, "read"):
+            loop = asyncio.get_running_loop()
+
+            while True:
+                piece = await loop.run_in_executor(None, data.read, self._chunk_size)
+
+                if not piece:
+                    break
+
+                yield piece
+        elif hasattr(data, "__aiter__"):
+            async for piece in data:
+                yield piece
+        else:
+            for piece in data:
+                yield piece
+
+    @classmethod
+    def _write_chunk(cls, conn, key, idx, chunk, hasher):
+        """Writes a chunk of a blob that is being uploaded."""
+
+        hasher.update(chunk)
+        conn.execute(
+            "INSERT OR REPLACE INTO blob_chunk (key, idx, data) VALUES (?, ?, ?)",
+            (key, idx, chunk))
+
+    @classmethod
+    def _collect(cls, conn, content_hash):
+        """Removes the content with the given hash if no blob refers to it."""
+
+        referenced = conn.execute(
+            "SELECT 1 FROM blob WHERE hash = ? LIMIT 1", (content_hash,)).fetchone()
+
+        if referenced:
+            return
+
+        conn.execute("DELETE FROM blob_chunk WHERE key = ?", (content_hash,))
+        conn.execute("DELETE FROM blob_content WHERE hash = ?", (content_hash,))
+
+    def _commit_blob(self, conn, name, key, content_hash, size):
+        """Stores the uploaded chunks under their content hash
+        (unless that content already exists) and names the blob."""
+
+        exists = conn.execute(
+            "SELECT 1 FROM blob_content WHERE hash = ?", (content_hash,)).fetchone()
+
+        if exists:
+            conn.execute("DELETE FROM blob_chunk WHERE key = ?", (key,))
+        else:
+            conn.execute("UPDATE blob_chunk SET key = ? WHERE key = ?", (content_hash, key))
+            conn.execute(
+                "INSERT INTO blob_content (hash, size, chunk_size) VALUES (?, ?, ?)",
+                (content_hash, size, self._chunk_size))
+
+        previous = conn.execute("SELECT hash FROM blob WHERE name = ?", (name,)).fetchone()
+
+        conn.execute(
+            "INSERT OR REPLACE INTO blob (name, hash, size) VALUES (?, ?, ?)",
+            (name, content_hash, size))
+
+        if previous and previous[0] != content_hash:
+            self._collect(conn, previous[0])
+
+        return not exists
+
+    @classmethod
+    def _discard_chunks(cls, conn, key):
+        """Removes the chunks of an upload that did not complete."""
+
+        conn.execute("DELETE FROM blob_chunk WHERE key = ?", (key,))
+
+    async def put(self, name, data):
+        """Stores the given content under the given name, replacing any previous
+        blob with that name. The content can be a bytes-like object, a file-like
+        object opened in binary mode or an (async) iterable of bytes objects.
+        Returns a dict with the hash and the size of the blob and whether
+        its content was new or deduplicated."""
+
+        await self._ensure_schema()
+
+        key = "upload-{}".format(uuid.uuid4().hex)
+        hasher = hashlib.sha256()
+        buffer = bytearray()
+        size = 0
+        idx = 0
+
+        try:
+            async for piece in self._iter_data(data):
+                size += len(piece)
+
+                if not buffer and len(piece) == self._chunk_size:
+                    await self._sqlite_db.run_in_transaction(
+                        self._write_chunk, key, idx, piece, hasher)
+                    idx += 1
+                    continue
+
+                buffer.extend(piece)
+
+                while len(buffer) >= self._chunk_size:
+                    chunk = bytes(buffer[:self._chunk_size])
+                    del buffer[:self._chunk_size]
+                    await self._sqlite_db.run_in_transaction(
+                        self._write_chunk, key, idx, chunk, hasher)
+                    idx += 1
+
+            if buffer:
+                await self._sqlite_db.run_in_transaction(
+                    self._write_chunk, key, idx, bytes(buffer), hasher)
+
+            content_hash = hasher.hexdigest()
+
+            is_new = await self._sqlite_db.run_in_transaction(
+                self._commit_blob, name, key, content_hash, size)
+        except BaseException:
+            await asyncio.shield(self._sqlite_db.run_in_transaction(self._discard_chunks, key))
+            raise
+
+        return {
+            "name": name,
+            "hash": content_hash,
+            "size": size,
+            "deduplicated": not is_new
+        }
+
+    @classmethod
+    def _info(cls, conn, name):
+        """Returns the (hash, size, chunk size) of the given blob."""
+
+        return conn.execute(
+            "SELECT blob.hash, blob_content.size, blob_content.chunk_size "
+            "FROM blob JOIN blob_content ON blob.hash = blob_content.hash "
+            "WHERE blob.name = ?", (name,)).fetchone()
+
+    async def info(self, name):
+        """Returns a dict with the hash and size of the
+        given blob or None if there is no such blob."""
+
+        await self._ensure_schema()
+
+        row = await self._sqlite_db.run_in_reader(self._info, name)
+
+        if row is None:
+            return None
+
+        return {"name": name, "hash": row[0], "size": row[1]}
+
+    async def exists(self, name):
+        """Returns True if there is a blob with the given name."""
+
+        return (await self.info(name)) is not None
+
+    async def names(self, limit=None, offset=0):
+        """Returns the names of the stored blobs in alphabetical order. If limit
+        is set at most limit names are returned starting at the given offset."""
+
+        await self._ensure_schema()
+
+        query = "SELECT name FROM blob ORDER BY name"
+
+        if limit is None and not offset:
+            rows = await self._sqlite_db.query(query)
+        else:
+            rows = await self._sqlite_db.fetch_page(query, page_size=limit, offset=offset)
+
+        return [row[0] for row in rows]
+
+    @classmethod
+    def _read_chunk(cls, conn, content_hash, idx, start, length):
+        """Returns length bytes of a chunk starting at the given offset."""
+
+        row = conn.execute(
+            "SELECT substr(data, ?, ?) FROM blob_chunk WHERE key = ? AND idx = ?",
+            (start + 1, length, content_hash, idx)).fetchone()
+
+        if row is None:
+            raise ValueError("Blob content {} is incomplete".format(content_hash))
+
+        return bytes(row[0])
+
+    async def stream(self, name, offset=0, length=None):
+        """Yields the content of the given blob one chunk at a time, starting at
+        offset and up to length bytes (until the end of the blob if not set)."""
+
+        await self._ensure_schema()
+
+        row = await self._sqlite_db.run_in_reader(self._info, name)
+
+        if row is None:
+            raise ValueError("Unknown blob: {}".format(name))
+
+        content_hash, size, chunk_size = row
+
+        if offset < 0 or (length is not None and length < 0):
+            raise ValueError("Invalid blob range")
+
+        end = size if length is None else min(size, offset + length)
+        position = offset
+
+        while position < end:
+            idx, start = divmod(position, chunk_size)
+            read_length = min(chunk_size - start, end - position)
+
+            chunk = await self._sqlite_db.run_in_reader(
+                self._read_chunk, content_hash, idx, start, read_length)
+
+            yield chunk
+
+            position += read_length
+
+    async def read(self, name, offset=0, length=None):
+        """Returns the content of the given blob starting at offset and
+        up to length bytes (until the end of the blob if not set)."""
+
+        return b"".join([chunk async for chunk in self.stream(name, offset=offset, length=length)])
+
+    async def get(self, name):
+        """Returns the whole content of the given blob."""
+
+        return await self.read(name)
+
+    def _delete(self, conn, name):
+        """Removes the given blob and its content if no other blob refers to it."""
+
+        row = conn.execute("SELECT hash FROM blob WHERE name = ?", (name,)).fetchone()
+
+        if row is None:
+            return False
+
+        conn.execute("DELETE FROM blob WHERE name = ?", (name,))
+        self._collect(conn, row[0])
+
+        return True
+
+    async def delete(self, name):
+        """Removes the given blob. Returns False if there was no such blob."""
+
+        await self._ensure_schema()
+
+        return await self._sqlite_db.run_in_transaction(self._delete, name)
+
@@ -5,26 +5,21 @@
 Generic function definitions.
 """
 
+import asyncio
 import time
 import datetime
 
-import numpy as np
-import pmdarima as pm
 import tornado.httpclient
 
+DEFAULT_STATUS_WINDOW_SECS = 3600
 
-async def forecasting(exposed_thing, property_name):
-    servient = exposed_thing.servient
 
-    query = 'from(bucket:"{}")\
-    |> range(start: -10m)'.format((property_name)) #TODO change limit of query
-    tables = servient.influxdb.execute_query(query)
+def _fit_and_predict(arr):
+    """Fits an ARIMA model to the given values and predicts the next one.
+    pmdarima is imported here because it takes seconds to load."""
 
-    # Serialize to values
-    output = tables.to_values(columns=["_value"])
-    flat_list = [item for sublist in output for item in sublist]
+    import pmdarima as pm
 
-    arr = np.array(flat_list)
     model = pm.auto_arima(arr, start_p=1, start_q=1, test="adf",       # use adftest to find optimal "d"
                           max_p=3, max_q=3, # maximum p and q
                           m=1,              # frequency of series
@@ -40,32 +35,98 @@ async def forecasting(exposed_thing, property_name):
 
     return float(predicted_value[0])
 
+
+async def forecasting(exposed_thing, property_name):
+    """Queries the influxdb database and forecasts the next value
+    of the given property. Both the query and the model fitting
+    run in the executor so they do not block the event loop.
+    The in-memory history of the property is used if InfluxDB is disabled.
+    Returns None if there are no values to fit the model."""
+
+    servient = exposed_thing.servient
+    loop = asyncio.get_running_loop()
+
+    if servient.influxdb is None:
+        prop = exposed_thing.properties[property_name]
+        values = [sample.value for sample in prop.last(prop.history_size)]
+    else:
+        query = servient.influxdb.property_query(exposed_thing.title, property_name) #TODO change limit of query
+        columns = await servient.influxdb.query_columns(query, columns=["_value"])
+        values = columns["_value"]
+
+    if not len(values):
+        return None
+
+    return await loop.run_in_executor(None, _fit_and_predict, values)
+
 async def mean_value(exposed_thing, property_name, horizon):
     """Queries the influxdb database and averages the data
-    for the given property."""
+    for the last horizon values of the given property (all the values
+    if horizon is 0). The in-memory history of the property is used
+    instead if it holds enough samples."""
 
     servient = exposed_thing.servient
+    prop = exposed_thing.properties[property_name]
+
+    samples = prop.last(horizon if horizon > 0 else prop.history_size)
+
+    if (horizon > 0 and len(samples) >= horizon) or servient.influxdb is None:
+        return sum(sample.value for sample in samples) / len(samples) if samples else None
+
+    query = servient.influxdb.property_query(exposed_thing.title, property_name) #TODO change limit of query
+
+    if horizon > 0:
+        query = '{}\
+        |> tail(n:{})'.format(query, horizon)
+
+    query = '{}\
+        |> mean()'.format(query)
 
-    query = 'from(bucket:"{}")\
-        |> range(start: -10m)\
-        |> tail(n:{})\
-        |> mean()'.format(property_name, horizon) #TODO change limit of query
+    async for record in servient.influxdb.query_stream(query, limit=1):
+        return record.get_value()
 
-    tables = servient.influxdb.execute_query(query)
-    # Serialize to values
-    output = tables.to_values(columns=["_value"])
-    flat_list = [item for sublist in output for item in sublist]
-    return flat_list[0]
+def _status_since(window):
+    """Returns the timestamp of the start of a window of the given seconds."""
 
-async def vo_status(exposed_thing, id):
+    return datetime.datetime.fromtimestamp(time.time() - window).isoformat(sep=" ")
+
+
+async def _status_rows(sqlite_db, table_name, window, limit=None):
+    """Returns the rows of the given status table in the last window
+    seconds (at most limit rows, the most recent ones)."""
+
+    return await sqlite_db.query(
+        f"SELECT * FROM (SELECT * FROM {table_name} WHERE timestamp >= ? "
+        f"ORDER BY timestamp DESC LIMIT ?) ORDER BY timestamp",
+        (_status_since(window), limit or sqlite_db.page_size))
+
+
+async def _status_summary(sqlite_db, table_name, window):
+    """Returns the uptime statistics of the given status table in the last window seconds."""
+
+    checks, up = await sqlite_db.fetch_one(
+        f"SELECT COUNT(*), COALESCE(SUM(status), 0) FROM {table_name} WHERE timestamp >= ?",
+        (_status_since(window),))
+
+    return {
+        "window": window,
+        "checks": checks,
+        "up": up,
+        "down": checks - up,
+        "uptime": up / checks if checks else None
+    }
+
+
+async def vo_status(exposed_thing, id, window=DEFAULT_STATUS_WINDOW_SECS):
     """Attempts to access the catalogue port of the VO and if successful
     inserts a row containing an integer (0 for failure or 1 for success)
-    in the corresponding table. Returns all rows from the `vo_status` table."""
+    in the corresponding table. Returns the rows of the `vo_status` table
+    in the last window seconds."""
 
     servient = exposed_thing.servient
 
     timestamp = time.time()
-    datetime_format = datetime.datetime.fromtimestamp(timestamp)
+    datetime_format = datetime.datetime.fromtimestamp(timestamp).isoformat(sep=" ")
 
     try:
         http_client = tornado.httpclient.AsyncHTTPClient()
@@ -74,35 +135,50 @@ async def vo_status(exposed_thing, id):
     except Exception as exception:
         print(f"Connection to VO Error: {exception}")
         exposed_thing.emit_event("VO_Connection_Error")
-        servient.sqlite_db.insert_data("vo_status", (id, datetime_format, 0))
+        await servient.sqlite_db.insert("vo_status", (id, datetime_format, 0))
     else:
-        servient.sqlite_db.insert_data("vo_status", (id, datetime_format, 1))
+        await servient.sqlite_db.insert("vo_status", (id, datetime_format, 1))
 
-    return servient.sqlite_db.execute_query("SELECT * FROM vo_status")
+    return await _status_rows(servient.sqlite_db, "vo_status", window)
     # TODO initialize event on cli if status_vo is enabled
     # TODO change localhost
 
 
+async def vo_status_summary(exposed_thing, window=DEFAULT_STATUS_WINDOW_SECS):
+    """Returns the number of checks of the `vo_status` table in the last
+    window seconds, how many succeeded or failed and the uptime ratio."""
+
+    return await _status_summary(exposed_thing.servient.sqlite_db, "vo_status", window)
+
+
 # Deployment type A
-async def device_status(exposed_thing, device_catalogue_url, id):
+async def device_status(exposed_thing, device_catalogue_url, id, window=DEFAULT_STATUS_WINDOW_SECS):
     """Attempts to access the catalogue port of the device and if successful
     inserts a row containing an integer (0 for failure or 1 for success)
-    in the corresponding table. Returns all rows from the `device_status` table."""
+    in the corresponding table. Returns the rows of the `device_status` table
+    in the last window seconds."""
 
     servient = exposed_thing.servient
 
     timestamp = time.time()
-    datetime_format = datetime.datetime.fromtimestamp(timestamp)
+    datetime_format = datetime.datetime.fromtimestamp(timestamp).isoformat(sep=" ")
     try:
         http_client = tornado.httpclient.AsyncHTTPClient()
         await http_client.fetch(device_catalogue_url)
     except Exception as exception:
         print(f"Connection to Device Error: {exception}")
         exposed_thing.emit_event("Device_Connection_Error", f"Device_Connection_Error: {False}%")
-        servient.sqlite_db.insert_data("device_status", (id, datetime_format, 0))
+        await servient.sqlite_db.insert("device_status", (id, datetime_format, 0))
     else:
-        servient.sqlite_db.insert_data("device_status", (id, datetime_format, 1))
-    return servient.sqlite_db.execute_query("SELECT * FROM device_status")
+        await servient.sqlite_db.insert("device_status", (id, datetime_format, 1))
+    return await _status_rows(servient.sqlite_db, "device_status", window)
     # TODO initialize event on cli if status_device is enabled
     # TODO device must have an id or name
-    # TODO think of a way to implement this in deployment type B
\ No newline at end of file
+    # TODO think of a way to implement this in deployment type B
+
+
+async def device_status_summary(exposed_thing, window=DEFAULT_STATUS_WINDOW_SECS):
+    """Returns the number of checks of the `device_status` table in the last
+    window seconds, how many succeeded or failed and the uptime ratio."""
+
+    return await _status_summary(exposed_thing.servient.sqlite_db, "device_status", window)
@@ -16,6 +16,7 @@ import aiocoap.error
 import aiocoap.resource
 
 from wotpy.protocols.coap.resources.utils import parse_request_opt_query
+from wotpy.wot.enums import InteractionTypes
 
 JSON_CONTENT_FORMAT = 50
 
@@ -31,7 +32,7 @@ async def get_thing_action(server, request):
     if not url_name_thing or not url_name_action:
         raise aiocoap.error.BadRequest("Missing query arguments")
 
-    exposed_thing = server.exposed_thing_set.find_by_thing_name(url_name_thing)
+    exposed_thing = server.routing_registry.find_thing(url_name_thing)
 
     if not exposed_thing:
         raise aiocoap.error.NotFound("Thing not found")
@@ -40,13 +41,13 @@ async def get_thing_action(server, request):
     if not valid_creds:
         raise aiocoap.error.Unauthorized("Authentication required")
 
-    try:
-        return next(
-            exposed_thing.actions[key] for key in exposed_thing.actions
-            if exposed_thing.actions[key].url_name == url_name_action)
-    except StopIteration:
+    route = server.routing_registry.resolve(url_name_thing, url_name_action, InteractionTypes.ACTION)
+
+    if not route:
         raise aiocoap.error.NotFound("Action not found")
 
+    return exposed_thing.actions[route.name]
+
 
 class ActionResource(aiocoap.resource.ObservableResource):
     """CoAP resource to invoke Actions and observe those invocations."""
@@ -14,6 +14,7 @@ import aiocoap.error
 import aiocoap.resource
 
 from wotpy.protocols.coap.resources.utils import parse_request_opt_query
+from wotpy.wot.enums import InteractionTypes
 
 JSON_CONTENT_FORMAT = 50
 
@@ -29,7 +30,7 @@ async def get_thing_event(server, request):
     if not url_name_thing or not url_name_event:
         raise aiocoap.error.BadRequest("Missing query arguments")
 
-    exposed_thing = server.exposed_thing_set.find_by_thing_name(url_name_thing)
+    exposed_thing = server.routing_registry.find_thing(url_name_thing)
 
     if not exposed_thing:
         raise aiocoap.error.NotFound("Thing not found")
@@ -38,13 +39,13 @@ async def get_thing_event(server, request):
     if not valid_creds:
         raise aiocoap.error.Unauthorized("Authentication required")
 
-    try:
-        return next(
-            exposed_thing.events[key] for key in exposed_thing.events
-            if exposed_thing.events[key].url_name == url_name_event)
-    except StopIteration:
+    route = server.routing_registry.resolve(url_name_thing, url_name_event, InteractionTypes.EVENT)
+
+    if not route:
         raise aiocoap.error.NotFound("Event not found")
 
+    return exposed_thing.events[route.name]
+
 
 class EventResource(aiocoap.resource.ObservableResource):
     """CoAP resource to observe Event emissions."""
@@ -9,6 +9,7 @@ import asyncio
 import json
 import logging
 import time
+from urllib.parse import urlencode
 
 import tornado.httpclient
 import reactivex
@@ -199,6 +200,71 @@ class HTTPClient(BaseProtocolClient):
 
         return result
 
+    def is_supported_thing_operation(self, td, op):
+        """Returns True if any of the Thing-level Forms for the given
+        operation is supported in this Protocol Binding client."""
+
+        return self.pick_http_href(td, td.get_thing_forms(), op=op) is not None
+
+    async def _fetch_multiple_properties(self, href, method, body=None, timeout=None):
+        """Sends a request to the Thing-level Form to read or write multiple
+        Properties and returns the dict of values in the response."""
+
+        con_timeout = timeout if timeout else self._connect_timeout
+        req_timeout = timeout if timeout else self._request_timeout
+
+        http_client = tornado.httpclient.AsyncHTTPClient()
+
+        try:
+            http_request = tornado.httpclient.HTTPRequest(
+                href, method=method, body=body,
+                headers=self.JSON_HEADERS,
+                connect_timeout=con_timeout,
+                request_timeout=req_timeout,
+                validate_cert=False)
+        except HTTPTimeoutError:
+            raise ClientRequestTimeout
+
+        response = await http_client.fetch(await self.sign_request(http_request))
+
+        return json.loads(response.body).get("values") if response.body else None
+
+    async def read_multiple_properties(self, td, names, timeout=None):
+        """Reads the values of the given Properties on a remote Thing in a single request.
+        Returns a dict of values indexed by Property name."""
+
+        href = self.pick_http_href(td, td.get_thing_forms(), op=InteractionVerbs.READ_MULTIPLE_PROPERTIES)
+
+        if href is None:
+            return await super().read_multiple_properties(td, names, timeout=timeout)
+
+        href = "{}?{}".format(href, urlencode({"names": ",".join(names)}))
+
+        return await self._fetch_multiple_properties(href, "GET", timeout=timeout)
+
+    async def read_all_properties(self, td, timeout=None):
+        """Reads the values of all the readable Properties on a remote Thing in a single request.
+        Returns a dict of values indexed by Property name."""
+
+        href = self.pick_http_href(td, td.get_thing_forms(), op=InteractionVerbs.READ_ALL_PROPERTIES)
+
+        if href is None:
+            return await super().read_all_properties(td, timeout=timeout)
+
+        return await self._fetch_multiple_properties(href, "GET", timeout=timeout)
+
+    async def write_multiple_properties(self, td, values, timeout=None):
+        """Updates the values of the Properties in the given dict on a remote Thing in a single request."""
+
+        href = self.pick_http_href(td, td.get_thing_forms(), op=InteractionVerbs.WRITE_MULTIPLE_PROPERTIES)
+
+        if href is None:
+            return await super().write_multiple_properties(td, values, timeout=timeout)
+
+        body = json.dumps({"values": values})
+
+        await self._fetch_multiple_properties(href, "PUT", body=body, timeout=timeout)
+
     def on_event(self, td, name):
         """Subscribes to an event on a remote Thing.
         Returns an Observable."""
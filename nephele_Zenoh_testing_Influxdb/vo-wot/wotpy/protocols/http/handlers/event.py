@@ -11,6 +11,7 @@ import logging
 from tornado.web import RequestHandler
 
 import wotpy.protocols.http.handlers.utils as handler_utils
+from wotpy.wot.enums import InteractionTypes
 
 
 # noinspection PyAbstractClass,PyAttributeOutsideInit
@@ -26,12 +27,13 @@ class EventObserverHandler(RequestHandler):
         """Subscribes to the given Event and waits for the next emission (HTTP long-polling pattern).
         Returns the event emission payload and destroys the subscription afterwards."""
 
-        exposed_thing = handler_utils.get_exposed_thing(self._server, thing_name)
+        route = handler_utils.get_route(self._server, thing_name, name, InteractionTypes.EVENT)
+        exposed_thing = route.exposed_thing
         valid_creds = await self._server._check_credentials(exposed_thing.title, self.request)
         if not valid_creds:
             handler_utils.request_auth(self, self._server.security_scheme, thing_name)
         else:
-            thing_event = exposed_thing.events[name]
+            thing_event = exposed_thing.events[route.name]
 
             loop = asyncio.get_running_loop()
             future_next = loop.create_future()
@@ -11,6 +11,7 @@ import logging
 from tornado.web import RequestHandler, HTTPError
 
 import wotpy.protocols.http.handlers.utils as handler_utils
+from wotpy.wot.enums import InteractionTypes
 
 
 # noinspection PyAbstractClass
@@ -24,29 +25,83 @@ class PropertyReadWriteHandler(RequestHandler):
     async def get(self, thing_name, name):
         """Reads and returns the Property value."""
 
-        exposed_thing = handler_utils.get_exposed_thing(self._server, thing_name)
+        route = handler_utils.get_route(self._server, thing_name, name, InteractionTypes.PROPERTY)
+        exposed_thing = route.exposed_thing
         valid_creds = await self._server._check_credentials(exposed_thing.title, self.request)
         if not valid_creds:
             handler_utils.request_auth(self, self._server.security_scheme, thing_name)
         else:
-            value = await exposed_thing.properties[name].read()
+            value = await exposed_thing.properties[route.name].read()
             self.write({"value": value})
 
     async def put(self, thing_name, name):
         """Updates the Property value."""
 
-        exposed_thing = handler_utils.get_exposed_thing(self._server, thing_name)
+        route = handler_utils.get_route(self._server, thing_name, name, InteractionTypes.PROPERTY)
+        exposed_thing = route.exposed_thing
         valid_creds = await self._server._check_credentials(exposed_thing.title, self.request)
         if not valid_creds:
             handler_utils.request_auth(self, self._server.security_scheme, thing_name)
         else:
             value = handler_utils.get_argument(self, "value", self.request.body)
             try:
-                await exposed_thing.handle_write_property(name, value)
+                await exposed_thing.handle_write_property(route.name, value)
             except TypeError as ex:
                 raise HTTPError(str(ex))
 
 
+# noinspection PyAbstractClass
+class MultiplePropertiesHandler(RequestHandler):
+    """Handler for requests to read or write multiple Properties at once.
+    Unknown Things are answered with 404 and invalid requests with 400."""
+
+    # noinspection PyMethodOverriding,PyAttributeOutsideInit
+    def initialize(self, http_server):
+        self._server = http_server
+
+    async def get(self, thing_name):
+        """Reads and returns the values of the Properties in the comma-separated
+        names query argument (or all the readable Properties if missing)."""
+
+        exposed_thing = handler_utils.get_exposed_thing(self._server, thing_name, status_code=404)
+        valid_creds = await self._server._check_credentials(exposed_thing.title, self.request)
+        if not valid_creds:
+            handler_utils.request_auth(self, self._server.security_scheme, thing_name)
+            return
+
+        names = self.get_argument("names", None)
+
+        try:
+            if names is None:
+                values = await exposed_thing.read_all_properties()
+            else:
+                values = await exposed_thing.read_multiple_properties(
+                    [name for name in names.split(",") if name])
+        except ValueError as ex:
+            raise HTTPError(400, log_message=str(ex))
+
+        self.write({"values": values})
+
+    async def put(self, thing_name):
+        """Updates the values of the Properties in the values dict."""
+
+        exposed_thing = handler_utils.get_exposed_thing(self._server, thing_name, status_code=404)
+        valid_creds = await self._server._check_credentials(exposed_thing.title, self.request)
+        if not valid_creds:
+            handler_utils.request_auth(self, self._server.security_scheme, thing_name)
+            return
+
+        values = handler_utils.get_argument(self, "values", status_code=400)
+
+        if not isinstance(values, dict):
+            raise HTTPError(400, log_message="Not a JSON object: {}".format(values))
+
+        try:
+            await exposed_thing.handle_write_multiple_properties(values)
+        except (TypeError, ValueError) as ex:
+            raise HTTPError(400, log_message=str(ex))
+
+
 # noinspection PyAbstractClass,PyAttributeOutsideInit
 class PropertyObserverHandler(RequestHandler):
     """Handler for Property subscription requests."""
@@ -60,12 +115,13 @@ class PropertyObserverHandler(RequestHandler):
         """Subscribes to Property updates and waits for the next event (HTTP long-polling pattern).
         Returns the updated value and destroys the subscription."""
 
-        exposed_thing = handler_utils.get_exposed_thing(self._server, thing_name)
+        route = handler_utils.get_route(self._server, thing_name, name, InteractionTypes.PROPERTY)
+        exposed_thing = route.exposed_thing
         valid_creds = await self._server._check_credentials(exposed_thing.title, self.request)
         if not valid_creds:
             handler_utils.request_auth(self, self._server.security_scheme, thing_name)
         else:
-            thing_property = exposed_thing.properties[name]
+            thing_property = exposed_thing.properties[route.name]
 
             loop = asyncio.get_running_loop()
             future_next = loop.create_future()
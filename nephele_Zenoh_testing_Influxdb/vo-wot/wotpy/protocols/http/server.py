@@ -16,7 +16,10 @@ from wotpy.protocols.http.authenticator import BaseAuthenticator
 from wotpy.protocols.http.enums import HTTPSchemes
 from wotpy.protocols.http.handlers.action import ActionInvokeHandler
 from wotpy.protocols.http.handlers.event import EventObserverHandler
-from wotpy.protocols.http.handlers.property import PropertyObserverHandler, PropertyReadWriteHandler
+from wotpy.protocols.http.handlers.property import \
+    MultiplePropertiesHandler, \
+    PropertyObserverHandler, \
+    PropertyReadWriteHandler
 from wotpy.protocols.server import BaseProtocolServer
 from wotpy.wot.enums import InteractionTypes, SecuritySchemeType
 from wotpy.wot.form import Form
@@ -29,9 +32,10 @@ class HTTPServer(BaseProtocolServer):
     DEFAULT_SECURITY_SCHEME = {"scheme": SecuritySchemeType.NOSEC}
 
     def __init__(self, port=DEFAULT_PORT, ssl_context=None, action_ttl_secs=300,
-                 security_scheme=DEFAULT_SECURITY_SCHEME, form_port=None):
+                 security_scheme=DEFAULT_SECURITY_SCHEME, form_port=None, reuse_port=False):
         super().__init__(port=port, form_port=form_port)
         self._server = None
+        self._reuse_port = reuse_port
         self._servient = None
         self._app = self._build_app()
         self._ssl_context = ssl_context
@@ -50,6 +54,12 @@ class HTTPServer(BaseProtocolServer):
 
         return Protocols.HTTP
 
+    @property
+    def reuse_port(self):
+        """Returns True if the port is bound with SO_REUSEPORT."""
+
+        return self._reuse_port
+
     @property
     def security_scheme(self):
         """Returns the configured security scheme of this server."""
@@ -101,6 +111,10 @@ class HTTPServer(BaseProtocolServer):
         """Builds and returns the Tornado application for the WebSockets server."""
 
         return tornado.web.Application([(
+            r"/(?P<thing_name>[^\/]+)/properties",
+            MultiplePropertiesHandler,
+            {"http_server": self}
+        ), (
             r"/(?P<thing_name>[^\/]+)/property/(?P<name>[^\/]+)",
             PropertyReadWriteHandler,
             {"http_server": self}
@@ -190,6 +204,24 @@ class HTTPServer(BaseProtocolServer):
 
         return intrct_type_map[interaction.interaction_type](interaction, hostname)
 
+    def build_thing_forms(self, hostname, thing):
+        """Builds and returns the HTTP Thing-level Forms to read
+        and write multiple Properties in a single request."""
+
+        href = "{}://{}:{}/{}/properties".format(
+            self.scheme, hostname.rstrip("/").lstrip("/"), self.form_port, thing.url_name)
+
+        return [Form(
+            interaction=thing,
+            protocol=self.protocol,
+            href=href,
+            content_type=MediaTypes.JSON,
+            op=[
+                InteractionVerbs.READ_ALL_PROPERTIES,
+                InteractionVerbs.READ_MULTIPLE_PROPERTIES,
+                InteractionVerbs.WRITE_MULTIPLE_PROPERTIES
+            ])]
+
     def build_base_url(self, hostname, thing):
         """Returns the base URL for the given Thing in the context of this server."""
 
@@ -208,7 +240,7 @@ class HTTPServer(BaseProtocolServer):
         self._logr.info("Starting HTTP server on: {}".format(self.port))
 
         self._server = tornado.httpserver.HTTPServer(self.app, ssl_options=self._ssl_context)
-        self._server.listen(self.port)
+        self._server.listen(self.port, reuse_port=self._reuse_port)
 
     async def stop(self):
         """Stops the HTTP server."""
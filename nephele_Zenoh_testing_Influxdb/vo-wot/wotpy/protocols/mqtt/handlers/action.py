@@ -13,6 +13,7 @@ from amqtt.mqtt.constants import QOS_2
 
 from wotpy.protocols.mqtt.handlers.base import BaseMQTTHandler
 from wotpy.utils.utils import to_json_obj
+from wotpy.wot.enums import InteractionTypes
 
 
 class ActionMQTTHandler(BaseMQTTHandler):
@@ -77,17 +78,14 @@ class ActionMQTTHandler(BaseMQTTHandler):
 
         thing_url_name, action_url_name = topic_split[-2], topic_split[-1]
 
-        try:
-            exp_thing = next(
-                item for item in self.mqtt_server.exposed_things
-                if item.url_name == thing_url_name)
-
-            action = next(
-                exp_thing.thing.actions[key] for key in exp_thing.thing.actions
-                if exp_thing.thing.actions[key].url_name == action_url_name)
-        except StopIteration:
+        route = self.mqtt_server.routing_registry.resolve(
+            thing_url_name, action_url_name, InteractionTypes.ACTION)
+
+        if not route:
             return
 
+        exp_thing, action = route.exposed_thing, route.interaction
+
         input_value = parsed_msg.get(self.KEY_INPUT, None)
 
         data = {
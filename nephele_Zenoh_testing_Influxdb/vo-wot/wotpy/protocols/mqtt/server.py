@@ -148,6 +148,28 @@ class MQTTServer(BaseProtocolServer):
 
         return intrct_type_map[interaction.interaction_type](interaction)
 
+    def build_thing_forms(self, hostname, thing):
+        """Builds and returns the MQTT Thing-level Forms to read
+        and write multiple Properties in a single message."""
+
+        href = "{}/{}/property/requests/{}".format(
+            self._broker_url.rstrip("/"),
+            self.servient_id,
+            thing.url_name)
+
+        form = Form(
+            interaction=thing,
+            protocol=self.protocol,
+            href=href,
+            content_type=MediaTypes.JSON,
+            op=[
+                InteractionVerbs.READ_ALL_PROPERTIES,
+                InteractionVerbs.READ_MULTIPLE_PROPERTIES,
+                InteractionVerbs.WRITE_MULTIPLE_PROPERTIES
+            ])
+
+        return [form]
+
     def build_base_url(self, hostname, thing):
         """Returns the base URL for the given Thing in the context of this server."""
 
@@ -8,6 +8,7 @@ Class that represents the abstract server interface.
 from abc import ABCMeta, abstractmethod
 
 from wotpy.wot.exposed.thing_set import ExposedThingSet
+from wotpy.wot.routing import RoutingRegistry
 
 
 class BaseProtocolServer(metaclass=ABCMeta):
@@ -19,6 +20,7 @@ class BaseProtocolServer(metaclass=ABCMeta):
         self._port = port
         self._codecs = []
         self._exposed_thing_set = ExposedThingSet()
+        self._routing_registry = RoutingRegistry()
 
     @property
     @abstractmethod
@@ -41,6 +43,14 @@ class BaseProtocolServer(metaclass=ABCMeta):
 
         return self._form_port
 
+    @property
+    def reuse_port(self):
+        """Returns True if the port of this server can be shared by several
+        worker processes (SO_REUSEPORT). In a cluster, servers that can't
+        share their port only run on the leader worker."""
+
+        return False
+
     @property
     def exposed_thing_set(self):
         """Returns the ExposedThingSet instance that
@@ -48,6 +58,21 @@ class BaseProtocolServer(metaclass=ABCMeta):
 
         return self._exposed_thing_set
 
+    @property
+    def routing_registry(self):
+        """Returns the RoutingRegistry used to resolve the requests
+        (shared with the other servers when attached to a servient)."""
+
+        return self._routing_registry
+
+    @routing_registry.setter
+    def routing_registry(self, registry):
+        """Sets the RoutingRegistry used to resolve the requests
+        and registers the ExposedThings of this server in it."""
+
+        registry.register_many(self.exposed_things)
+        self._routing_registry = registry
+
     @property
     def exposed_things(self):
         """Returns an iterator for all the ExposedThings contained in this server."""
@@ -71,23 +96,36 @@ class BaseProtocolServer(metaclass=ABCMeta):
         """Adds the given ExposedThing to this server."""
 
         self._exposed_thing_set.add(exposed_thing)
+        self._routing_registry.register(exposed_thing)
 
     def remove_exposed_thing(self, thing_name):
         """Removes the given ExposedThing from this server."""
 
         self._exposed_thing_set.remove(thing_name)
+        self._routing_registry.unregister(thing_name)
 
     def get_exposed_thing(self, name):
         """Finds and returns an ExposedThing contained in this server by name.
         Raises ValueError if the ExposedThing is not present."""
 
-        exposed_thing = self._exposed_thing_set.find_by_thing_name(name)
+        exposed_thing = self._routing_registry.find_thing(name)
 
         if exposed_thing is None:
             raise ValueError("Unknown Exposed Thing: {}".format(name))
 
         return exposed_thing
 
+    def resolve_route(self, thing_name, name, kind):
+        """Returns the Route to the Interaction of the given kind and name
+        in the given ExposedThing. Raises ValueError if it can't be found."""
+
+        route = self._routing_registry.resolve(thing_name, name, kind)
+
+        if route is None:
+            raise ValueError("Unknown Interaction: {}/{}".format(thing_name, name))
+
+        return route
+
     @abstractmethod
     def build_forms(self, hostname, interaction):
         """Builds and returns a list with all Form that are
@@ -95,6 +133,12 @@ class BaseProtocolServer(metaclass=ABCMeta):
 
         raise NotImplementedError()
 
+    def build_thing_forms(self, hostname, thing):
+        """Builds and returns a list with the Thing-level Forms (e.g. to read
+        or write multiple Properties at once) linked to this server for the given Thing."""
+
+        return []
+
     @abstractmethod
     def build_base_url(self, hostname, thing):
         """Returns the base URL for the given Thing in the context of this server."""
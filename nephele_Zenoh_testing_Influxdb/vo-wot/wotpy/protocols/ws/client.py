@@ -14,7 +14,7 @@ import tornado.websocket
 import reactivex
 
 from wotpy.protocols.client import BaseProtocolClient
-from wotpy.protocols.enums import Protocols
+from wotpy.protocols.enums import Protocols, InteractionVerbs
 from wotpy.protocols.exceptions import FormNotFoundException, ClientRequestTimeout
 from wotpy.protocols.refs import ConnRefCounter
 from wotpy.protocols.utils import pick_form, is_scheme_form
@@ -423,6 +423,81 @@ class WebsocketClient(BaseProtocolClient):
         finally:
             await self._stop_conn(ws_url, ref_id)
 
+    def is_supported_thing_operation(self, td, op):
+        """Returns True if any of the Thing-level Forms for the given
+        operation is supported in this Protocol Binding client."""
+
+        return pick_form(td, td.get_thing_forms(), WebsocketSchemes.list(), op=op) is not None
+
+    async def _request_thing_operation(self, form, td, method, params, timeout=None):
+        """Sends a request for a Thing-level operation to the
+        WebSockets URL of the given Form and returns the result."""
+
+        ws_url = form.resolve_uri(td.base)
+        ref_id = uuid.uuid4().hex
+
+        try:
+            await self._init_conn(ws_url, ref_id)
+
+            msg_req = WebsocketMessageRequest(
+                method=method,
+                params=params,
+                msg_id=uuid.uuid4().hex)
+
+            condition = await self._send_message(ws_url, msg_req)
+
+            try:
+                await asyncio.wait_for(self._wait_condition(condition), timeout=timeout)
+            except asyncio.TimeoutError:
+                raise ClientRequestTimeout
+
+            return self._raise_message(ws_url, msg_req.id)
+        finally:
+            await self._stop_conn(ws_url, ref_id)
+
+    async def read_multiple_properties(self, td, names, timeout=None):
+        """Reads the values of the given Properties on a remote Thing in a single message.
+        Returns a dict of values indexed by Property name."""
+
+        form = pick_form(
+            td, td.get_thing_forms(), WebsocketSchemes.list(),
+            op=InteractionVerbs.READ_MULTIPLE_PROPERTIES)
+
+        if not form:
+            return await super().read_multiple_properties(td, names, timeout=timeout)
+
+        return await self._request_thing_operation(
+            form, td, WebsocketMethods.READ_MULTIPLE_PROPERTIES,
+            {"names": list(names)}, timeout=timeout)
+
+    async def read_all_properties(self, td, timeout=None):
+        """Reads the values of all the readable Properties on a remote Thing in a single message.
+        Returns a dict of values indexed by Property name."""
+
+        form = pick_form(
+            td, td.get_thing_forms(), WebsocketSchemes.list(),
+            op=InteractionVerbs.READ_ALL_PROPERTIES)
+
+        if not form:
+            return await super().read_all_properties(td, timeout=timeout)
+
+        return await self._request_thing_operation(
+            form, td, WebsocketMethods.READ_ALL_PROPERTIES, {}, timeout=timeout)
+
+    async def write_multiple_properties(self, td, values, timeout=None):
+        """Updates the values of the Properties in the given dict on a remote Thing in a single message."""
+
+        form = pick_form(
+            td, td.get_thing_forms(), WebsocketSchemes.list(),
+            op=InteractionVerbs.WRITE_MULTIPLE_PROPERTIES)
+
+        if not form:
+            return await super().write_multiple_properties(td, values, timeout=timeout)
+
+        await self._request_thing_operation(
+            form, td, WebsocketMethods.WRITE_MULTIPLE_PROPERTIES,
+            {"values": values}, timeout=timeout)
+
     def on_event(self, td, name):
         """Subscribes to an event on a remote Thing.
         Returns an Observable."""
@@ -9,7 +9,7 @@ from tornado import web
 from tornado.httpserver import HTTPServer
 
 from wotpy.codecs.enums import MediaTypes
-from wotpy.protocols.enums import Protocols
+from wotpy.protocols.enums import Protocols, InteractionVerbs
 from wotpy.protocols.server import BaseProtocolServer
 from wotpy.protocols.ws.enums import WebsocketSchemes
 from wotpy.protocols.ws.handler import WebsocketHandler
@@ -22,9 +22,10 @@ class WebsocketServer(BaseProtocolServer):
 
     DEFAULT_PORT = 8081
 
-    def __init__(self, port=DEFAULT_PORT, ssl_context=None):
+    def __init__(self, port=DEFAULT_PORT, ssl_context=None, reuse_port=False):
         super().__init__(port=port)
         self._server = None
+        self._reuse_port = reuse_port
         self._app = self._build_app()
         self._ssl_context = ssl_context
         self._servient = None
@@ -36,6 +37,12 @@ class WebsocketServer(BaseProtocolServer):
 
         return Protocols.WEBSOCKETS
 
+    @property
+    def reuse_port(self):
+        """Returns True if the port is bound with SO_REUSEPORT."""
+
+        return self._reuse_port
+
     @property
     def scheme(self):
         """Returns the URL scheme for this server."""
@@ -82,6 +89,23 @@ class WebsocketServer(BaseProtocolServer):
                 content_type=MediaTypes.JSON)
         ]
 
+    def build_thing_forms(self, hostname, thing):
+        """Builds and returns the WebSockets Thing-level Forms to read
+        and write multiple Properties in a single message."""
+
+        return [
+            Form(
+                interaction=thing,
+                protocol=self.protocol,
+                href=self.build_base_url(hostname=hostname, thing=thing),
+                content_type=MediaTypes.JSON,
+                op=[
+                    InteractionVerbs.READ_ALL_PROPERTIES,
+                    InteractionVerbs.READ_MULTIPLE_PROPERTIES,
+                    InteractionVerbs.WRITE_MULTIPLE_PROPERTIES
+                ])
+        ]
+
     def build_base_url(self, hostname, thing):
         """Returns the base URL for the given Thing in the context of this server."""
 
@@ -98,7 +122,7 @@ class WebsocketServer(BaseProtocolServer):
         self._servient = servient
 
         self._server = HTTPServer(self.app, ssl_options=self._ssl_context)
-        self._server.listen(self.port)
+        self._server.listen(self.port, reuse_port=self._reuse_port)
 
     async def stop(self):
         """Stops the WebSockets server."""
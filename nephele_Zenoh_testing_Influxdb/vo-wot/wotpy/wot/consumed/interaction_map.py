@@ -18,13 +18,24 @@ class ConsumedThingInteractionDict(UserDict):
 
     def __init__(self, *args, **kwargs):
         self._consumed_thing = kwargs.pop("consumed_thing")
+        self._url_name_index = None
         UserDict.__init__(self, *args, **kwargs)
 
     def _find_normalized_name(self, name):
         """Takes a case-insensitive URL-safe interaction name and returns
         the actual name in the interaction dict."""
 
-        return next((key for key in self.interaction_dict.keys() if slugify(key) == slugify(name)), None)
+        if name in self.interaction_dict:
+            return name
+
+        # The TD of a ConsumedThing does not change so the index is built only once
+        if self._url_name_index is None:
+            self._url_name_index = {}
+
+            for key in self.interaction_dict.keys():
+                self._url_name_index.setdefault(slugify(key), key)
+
+        return self._url_name_index.get(slugify(name))
 
     def __getitem__(self, name):
         """Lazily build and return an object that implements the Interaction interface."""
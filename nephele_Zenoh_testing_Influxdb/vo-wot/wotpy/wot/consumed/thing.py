@@ -8,6 +8,7 @@ Class that represents a Thing consumed by a servient.
 from reactivex.scheduler.eventloop import IOLoopScheduler
 from tornado import ioloop
 
+from wotpy.protocols.enums import InteractionVerbs
 from wotpy.wot.consumed.interaction_map import \
     ConsumedThingPropertyDict, \
     ConsumedThingActionDict, \
@@ -21,6 +22,9 @@ class ConsumedThing:
     def __init__(self, servient, td):
         self._servient = servient
         self._td = td
+        self._property_dict = ConsumedThingPropertyDict(consumed_thing=self)
+        self._action_dict = ConsumedThingActionDict(consumed_thing=self)
+        self._event_dict = ConsumedThingEventDict(consumed_thing=self)
 
     def __str__(self):
         return "<{}> {}".format(self.__class__.__name__, self.td.id)
@@ -90,6 +94,44 @@ class ConsumedThing:
 
         return value
 
+    async def read_multiple_properties(self, names, timeout=None, client_kwargs=None):
+        """Takes a list of Property names and requests their values from the remote Thing
+        in a single round trip when the Protocol Binding supports it.
+        Returns a Future that resolves with a dict of values indexed by Property name."""
+
+        client = self.servient.select_thing_client(self.td, InteractionVerbs.READ_MULTIPLE_PROPERTIES)
+        client_kwargs = client_kwargs if client_kwargs else {}
+
+        return await client.read_multiple_properties(
+            self.td, list(names),
+            timeout=timeout,
+            **client_kwargs.get(client.protocol, {}))
+
+    async def read_all_properties(self, timeout=None, client_kwargs=None):
+        """Requests the values of all the readable Properties from the remote Thing.
+        Returns a Future that resolves with a dict of values indexed by Property name."""
+
+        client = self.servient.select_thing_client(self.td, InteractionVerbs.READ_ALL_PROPERTIES)
+        client_kwargs = client_kwargs if client_kwargs else {}
+
+        return await client.read_all_properties(
+            self.td,
+            timeout=timeout,
+            **client_kwargs.get(client.protocol, {}))
+
+    async def write_multiple_properties(self, values, timeout=None, client_kwargs=None):
+        """Takes a dict of values indexed by Property name and requests
+        the remote Thing to update them in a single round trip when
+        the Protocol Binding supports it."""
+
+        client = self.servient.select_thing_client(self.td, InteractionVerbs.WRITE_MULTIPLE_PROPERTIES)
+        client_kwargs = client_kwargs if client_kwargs else {}
+
+        await client.write_multiple_properties(
+            self.td, values,
+            timeout=timeout,
+            **client_kwargs.get(client.protocol, {}))
+
     def on_event(self, name, client_kwargs=None):
         """Returns an Observable for the Event specified in the name argument,
         allowing subscribing to and unsubscribing from notifications."""
@@ -122,19 +164,19 @@ class ConsumedThing:
     def properties(self):
         """Returns a dictionary of ThingProperty items."""
 
-        return ConsumedThingPropertyDict(consumed_thing=self)
+        return self._property_dict
 
     @property
     def actions(self):
         """Returns a dictionary of ThingAction items."""
 
-        return ConsumedThingActionDict(consumed_thing=self)
+        return self._action_dict
 
     @property
     def events(self):
         """Returns a dictionary of ThingEvent items."""
 
-        return ConsumedThingEventDict(consumed_thing=self)
+        return self._event_dict
 
     @property
     def links(self):
@@ -8,10 +8,45 @@ Base class for WoT dictionaries.
 from wotpy.utils.utils import merge_args_kwargs_dict, to_camel, to_snake
 
 
-class WotBaseDict:
+def _copy_json(value):
+    """Returns a copy of the lists and dicts of the given JSON-serializable value."""
+
+    if isinstance(value, dict):
+        return {key: _copy_json(val) for key, val in value.items()}
+
+    if isinstance(value, list):
+        return [_copy_json(item) for item in value]
+
+    return value
+
+
+class WotDictMeta(type):
+    """Metaclass that generates WoT dictionary classes without an instance __dict__
+    (unless a class explicitly declares its own __slots__) and precomputes
+    the maps between the attribute names and the camelCase field names."""
+
+    def __new__(mcs, name, bases, namespace):
+        namespace.setdefault("__slots__", ())
+
+        cls = super().__new__(mcs, name, bases, namespace)
+
+        fields = sorted(cls.Meta.fields)
+
+        cls._field_names = {to_snake(field): field for field in fields}
+        cls._field_names.update({field: field for field in fields})
+        cls._fields = tuple(
+            (field, to_snake(field), hasattr(cls, to_snake(field)))
+            for field in fields)
+
+        return cls
+
+
+class WotBaseDict(metaclass=WotDictMeta):
     """Base class for all WoT data types represented
     as dictionaries in the Scripting API specification."""
 
+    __slots__ = ("_init", "_dict")
+
     class Meta:
         fields = set()
         required = set()
@@ -24,6 +59,7 @@ class WotBaseDict:
         init_dict = merge_args_kwargs_dict(args, kwargs)
 
         self._init = {}
+        self._dict = None
 
         for key, val in init_dict.items():
             self._init.update({to_camel(key): val})
@@ -41,9 +77,9 @@ class WotBaseDict:
         """Transforms the field name to camelCase and
         attemps to retrieve it from the internal dict."""
 
-        name_camel = to_camel(name)
+        name_camel = self._field_names.get(name)
 
-        if name_camel not in self.Meta.fields:
+        if name_camel is None:
             raise AttributeError(name)
 
         if name_camel in self._init:
@@ -54,8 +90,8 @@ class WotBaseDict:
         except AttributeError:
             return None
 
-    def to_dict(self):
-        """Returns the pure dict (JSON-serializable) representation of this WoT dictionary."""
+    def _build_dict(self):
+        """Builds the pure dict representation of this WoT dictionary."""
 
         ret = {}
 
@@ -68,13 +104,14 @@ class WotBaseDict:
         def is_wot_dict(x):
             return hasattr(x, "to_dict")
 
-        existing_fields = [
-            f for f in self.Meta.fields
-            if f in self._init or (to_snake(f) in dir(self) and getattr(self, to_snake(f)) is not None)
-        ]
+        for name_camel, name_snake, is_class_attr in self._fields:
+            if name_camel not in self._init and not is_class_attr:
+                continue
+
+            field_val = getattr(self, name_snake)
 
-        for name_camel in existing_fields:
-            field_val = getattr(self, to_snake(name_camel))
+            if name_camel not in self._init and field_val is None:
+                continue
 
             if is_list_wot_dicts(field_val):
                 field_val = [item.to_dict() for item in field_val]
@@ -86,3 +123,11 @@ class WotBaseDict:
             ret.update({name_camel: field_val})
 
         return ret
+
+    def to_dict(self):
+        """Returns the pure dict (JSON-serializable) representation of this WoT dictionary."""
+
+        if self._dict is None:
+            self._dict = self._build_dict()
+
+        return _copy_json(self._dict)
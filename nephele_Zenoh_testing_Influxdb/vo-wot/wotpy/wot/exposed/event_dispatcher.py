@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Class that dispatches the events emitted by an ExposedThing to its subscribers.
+"""
+
+import reactivex
+from reactivex.disposable import Disposable
+
+from wotpy.utils.enums import EnumListMixin
+from wotpy.wot.enums import DefaultThingEvent
+from wotpy.wot.events import \
+    PropertyChangeEmittedEvent, \
+    ActionInvocationEmittedEvent, \
+    ThingDescriptionChangeEmittedEvent
+
+
+class EventDispatcher:
+    """Registry of the observers of an ExposedThing keyed by the kind of
+    emission and the name of the interaction. Every emitted item is only
+    delivered to the observers of its keys, so the cost of an emission
+    depends on the number of matching subscribers instead of the total."""
+
+    class Kinds(EnumListMixin):
+        """Enumeration of the kinds of emissions."""
+
+        EVENT = "event"
+        PROPERTY_CHANGE = DefaultThingEvent.PROPERTY_CHANGE
+        ACTION_INVOCATION = DefaultThingEvent.ACTION_INVOCATION
+        DESCRIPTION_CHANGE = DefaultThingEvent.DESCRIPTION_CHANGE
+
+    def __init__(self):
+        self._observers = {}
+
+    @classmethod
+    def keys(cls, item):
+        """Returns the (kind, name) keys of the given emitted item.
+        Every item matches the event kind with the name of the item,
+        and default events also match their own kind with the name
+        of the related interaction."""
+
+        keys = [(cls.Kinds.EVENT, item.name)]
+
+        if isinstance(item, PropertyChangeEmittedEvent):
+            keys.append((cls.Kinds.PROPERTY_CHANGE, item.data.name))
+        elif isinstance(item, ActionInvocationEmittedEvent):
+            keys.append((cls.Kinds.ACTION_INVOCATION, item.data.action_name))
+        elif isinstance(item, ThingDescriptionChangeEmittedEvent):
+            keys.append((cls.Kinds.DESCRIPTION_CHANGE, None))
+
+        return keys
+
+    def observable(self, kind, name=None):
+        """Returns an Observable of the items emitted with the given key."""
+
+        key = (kind, name)
+
+        def subscribe(observer, scheduler=None):
+            token = object()
+            self._observers.setdefault(key, {})[token] = observer
+
+            def dispose():
+                observers = self._observers.get(key, {})
+                observers.pop(token, None)
+
+                if not observers:
+                    self._observers.pop(key, None)
+
+            return Disposable(dispose)
+
+        # noinspection PyUnresolvedReferences
+        return reactivex.create(subscribe)
+
+    def dispatch(self, item):
+        """Delivers the given item to the observers of its keys."""
+
+        for key in self.keys(item):
+            observers = self._observers.get(key)
+
+            if not observers:
+                continue
+
+            for observer in list(observers.values()):
+                observer.on_next(item)
+
+    def subscriber_count(self, kind, name=None):
+        """Returns the number of observers of the given key."""
+
+        return len(self._observers.get((kind, name), {}))
+
+    @property
+    def subscriber_counts(self):
+        """Returns a dict with the number of observers
+        of each interaction name grouped by kind."""
+
+        counts = {}
+
+        for (kind, name), observers in self._observers.items():
+            counts.setdefault(kind, {})[name] = len(observers)
+
+        return counts
@@ -0,0 +1,246 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Classes that store the values and the recent history of the Properties of an ExposedThing.
+"""
+
+import array
+import bisect
+import collections
+import time
+
+from wotpy.wot.enums import DataType
+
+PropertySample = collections.namedtuple("PropertySample", ["value", "version", "timestamp"])
+
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+
+
+class PropertyHistory:
+    """Ring buffer with the last samples of a Property. The values of numeric
+    Properties are kept in a typed array instead of a list of objects."""
+
+    def __init__(self, size, typecode=None):
+        if size < 0:
+            raise ValueError("Invalid history size: {}".format(size))
+
+        self._size = size
+        self._typecode = typecode
+        self._values = array.array(typecode, [0]) * size if typecode else [None] * size
+        self._versions = array.array("q", [0]) * size
+        self._timestamps = array.array("d", [0.0]) * size
+        self._start = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def size(self):
+        """Returns the maximum number of samples kept in the history."""
+
+        return self._size
+
+    @property
+    def typecode(self):
+        """Returns the typecode of the array of values (None if values are kept in a list)."""
+
+        return self._typecode
+
+    def accepts(self, value):
+        """Returns True if the given value can be stored in the array of values."""
+
+        if self._typecode is None:
+            return True
+
+        if isinstance(value, bool):
+            return False
+
+        if self._typecode == "q":
+            return isinstance(value, int) and _INT64_MIN <= value <= _INT64_MAX
+
+        return isinstance(value, (int, float))
+
+    def append(self, sample):
+        """Adds a sample, replacing the oldest one if the history is full."""
+
+        if not self._size:
+            return
+
+        idx = (self._start + self._count) % self._size
+
+        if self._count == self._size:
+            self._start = (self._start + 1) % self._size
+        else:
+            self._count += 1
+
+        self._values[idx] = sample.value
+        self._versions[idx] = sample.version
+        self._timestamps[idx] = sample.timestamp
+
+    def _sample(self, position):
+        """Returns the sample in the given position (0 is the oldest)."""
+
+        idx = (self._start + position) % self._size
+
+        return PropertySample(self._values[idx], self._versions[idx], self._timestamps[idx])
+
+    def samples(self):
+        """Returns the list of samples from the oldest to the newest."""
+
+        return [self._sample(position) for position in range(self._count)]
+
+    def last(self, count):
+        """Returns the list of the last count samples from the oldest to the newest."""
+
+        count = max(0, min(count, self._count))
+
+        return [self._sample(position) for position in range(self._count - count, self._count)]
+
+    def since(self, version):
+        """Returns the list of samples with a version greater than the given one."""
+
+        positions = _Positions(self)
+        first = bisect.bisect_right(positions, version)
+
+        return [self._sample(position) for position in range(first, self._count)]
+
+    def resized(self, size, typecode=None):
+        """Returns a new history with the given size (and typecode) that contains the newest samples."""
+
+        history = PropertyHistory(size, typecode=typecode)
+
+        for sample in self.last(size):
+            history.append(sample)
+
+        return history
+
+
+class _Positions:
+    """Sequence view of the versions of a PropertyHistory used to bisect it."""
+
+    def __init__(self, history):
+        self._history = history
+
+    def __len__(self):
+        return len(self._history)
+
+    def __getitem__(self, position):
+        history = self._history
+
+        return history._versions[(history._start + position) % history._size]
+
+
+class PropertyStore:
+    """Stores the current value of each Property of an ExposedThing along with the
+    version and the timestamp of the write that set it. Versions are monotonic
+    across all the Properties. The last samples of each Property are kept in
+    an in-memory ring buffer so recent history can be queried locally."""
+
+    DEFAULT_HISTORY_SIZE = 100
+
+    NUMERIC_TYPECODES = {
+        DataType.NUMBER: "d",
+        DataType.INTEGER: "q"
+    }
+
+    def __init__(self, history_size=None):
+        self._history_size = self.DEFAULT_HISTORY_SIZE if history_size is None else int(history_size)
+        self._history_sizes = {}
+        self._version = 0
+        self._samples = {}
+        self._histories = {}
+
+        if self._history_size < 0:
+            raise ValueError("Invalid history size: {}".format(history_size))
+
+    @property
+    def version(self):
+        """Returns the version of the last write on any Property."""
+
+        return self._version
+
+    def history_size(self, name):
+        """Returns the size of the history of the given Property."""
+
+        return self._history_sizes.get(name, self._history_size)
+
+    def set_history_size(self, name, size):
+        """Sets the size of the history of the given Property, keeping the newest samples."""
+
+        if size < 0:
+            raise ValueError("Invalid history size: {}".format(size))
+
+        self._history_sizes[name] = size
+
+        if name in self._histories:
+            history = self._histories[name]
+            self._histories[name] = history.resized(size, typecode=history.typecode)
+
+    def _history(self, name, value, data_type=None):
+        """Returns the history of the given Property that can store the given value."""
+
+        history = self._histories.get(name)
+
+        if history is None:
+            typecode = self.NUMERIC_TYPECODES.get(data_type)
+            history = PropertyHistory(self.history_size(name), typecode=typecode)
+
+            if not history.accepts(value):
+                history = PropertyHistory(self.history_size(name))
+
+            self._histories[name] = history
+        elif not history.accepts(value):
+            history = history.resized(history.size)
+            self._histories[name] = history
+
+        return history
+
+    def write(self, name, value, data_type=None):
+        """Sets the value of the given Property and records it in its history.
+        The data type is used to store the history of numeric Properties
+        in an array. Returns the new PropertySample."""
+
+        self._version += 1
+
+        sample = PropertySample(value, self._version, time.time())
+
+        self._samples[name] = sample
+        self._history(name, value, data_type=data_type).append(sample)
+
+        return sample
+
+    def read(self, name):
+        """Returns the current value of the given Property."""
+
+        sample = self._samples.get(name)
+
+        return sample.value if sample else None
+
+    def sample(self, name):
+        """Returns the PropertySample of the last write of the given Property."""
+
+        return self._samples.get(name)
+
+    def last(self, name, count):
+        """Returns the last count samples of the given Property."""
+
+        history = self._histories.get(name)
+
+        return history.last(count) if history else []
+
+    def since(self, name, version):
+        """Returns the samples of the given Property written after the given version."""
+
+        history = self._histories.get(name)
+
+        return history.since(version) if history else []
+
+    def remove(self, name):
+        """Removes the value and the history of the given Property."""
+
+        self._samples.pop(name, None)
+        self._histories.pop(name, None)
+        self._history_sizes.pop(name, None)
@@ -28,6 +28,7 @@ class InteractionPattern(metaclass=ABCMeta):
 
         self._thing = thing
         self._name = name
+        self._url_name = slugify(name)
         self._autogenerated_forms = []
         self._td_forms = []
         if self._init_dict.forms:
@@ -77,7 +78,7 @@ class InteractionPattern(metaclass=ABCMeta):
     def url_name(self):
         """URL-safe version of the name."""
 
-        return slugify(self.name)
+        return self._url_name
 
     @property
     def forms(self):
@@ -89,6 +90,7 @@ class InteractionPattern(metaclass=ABCMeta):
         """Removes all autogenerated Forms from this Interaction."""
 
         self._autogenerated_forms = []
+        self._thing.invalidate_fragment()
 
     def add_form(self, form):
         """Add a new autogenerated Form."""
@@ -101,6 +103,7 @@ class InteractionPattern(metaclass=ABCMeta):
             raise ValueError("Duplicate Form: {}".format(form))
 
         self._autogenerated_forms.append(form)
+        self._thing.invalidate_fragment()
 
     def remove_form(self, form):
         """Remove an existing autogenerated Form."""
@@ -109,7 +112,9 @@ class InteractionPattern(metaclass=ABCMeta):
             pop_idx = self._autogenerated_forms.index(form)
             self._autogenerated_forms.pop(pop_idx)
         except ValueError:
-            pass
+            return
+
+        self._thing.invalidate_fragment()
 
 
 class Property(InteractionPattern):
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Classes that map the requests received by the protocol servers to ExposedThings and Interactions.
+"""
+
+from wotpy.wot.enums import InteractionTypes
+
+
+class Route:
+    """Resolved target of a request: the ExposedThing, the Interaction and its kind,
+    the data schema of the Interaction and the security schemes of the Thing."""
+
+    __slots__ = ("exposed_thing", "interaction", "kind", "schema", "security", "revision")
+
+    def __init__(self, exposed_thing, interaction):
+        self.exposed_thing = exposed_thing
+        self.interaction = interaction
+        self.kind = interaction.interaction_type
+        self.schema = self._interaction_schema(interaction)
+        self.security = self._thing_security(exposed_thing.thing)
+        self.revision = exposed_thing.thing.revision
+
+    def __repr__(self):
+        return "<{}> ({}::{}::{})".format(
+            self.__class__.__name__, self.exposed_thing.title, self.kind, self.name)
+
+    @classmethod
+    def _thing_security(cls, thing):
+        """Returns the list of names of the security schemes that apply to the given Thing."""
+
+        security = thing.security or []
+
+        return [security] if isinstance(security, str) else list(security)
+
+    @classmethod
+    def _interaction_schema(cls, interaction):
+        """Returns the DataSchemaDict of the values exchanged with the given Interaction
+        (the value of a Property, the input of an Action or the data of an Event)."""
+
+        fragment = interaction.interaction_fragment
+
+        if interaction.interaction_type == InteractionTypes.PROPERTY:
+            return fragment.data_schema
+
+        if interaction.interaction_type == InteractionTypes.ACTION:
+            return fragment.input
+
+        return fragment.data
+
+    @property
+    def name(self):
+        """Returns the name of the Interaction."""
+
+        return self.interaction.name
+
+
+class RoutingRegistry:
+    """Index of the Routes of a set of ExposedThings keyed by (Thing name, Interaction name, kind).
+    Thing and Interaction names may be the original names or their URL-safe versions,
+    so resolving a request is a single dict lookup. The Routes of a Thing are rebuilt
+    synchronously when it is registered or when its Interactions change, so request
+    handlers never observe a partially updated registry."""
+
+    def __init__(self):
+        self._things = {}
+        self._routes = {}
+        self._keys = {}
+        self._revisions = {}
+
+    def __contains__(self, exposed_thing):
+        return self._things.get(exposed_thing.thing.title) is exposed_thing
+
+    def __len__(self):
+        return len(self._keys)
+
+    @classmethod
+    def _thing_names(cls, exposed_thing):
+        """Returns the names that identify the given ExposedThing in requests."""
+
+        return {exposed_thing.thing.title, exposed_thing.thing.url_name}
+
+    def _build_routes(self, exposed_thing):
+        """Returns a dict with the Routes to the Interactions of the given ExposedThing."""
+
+        routes = {}
+
+        for interaction in exposed_thing.thing.interactions:
+            route = Route(exposed_thing, interaction)
+
+            for thing_name in self._thing_names(exposed_thing):
+                for name in (interaction.name, interaction.url_name):
+                    routes[(thing_name, name, route.kind)] = route
+
+        return routes
+
+    def _discard(self, title):
+        """Removes the Routes of the ExposedThing with the given title."""
+
+        thing_names, route_keys = self._keys.pop(title, ((), ()))
+        self._revisions.pop(title, None)
+
+        for thing_name in thing_names:
+            self._things.pop(thing_name, None)
+
+        for key in route_keys:
+            self._routes.pop(key, None)
+
+    def register(self, exposed_thing):
+        """Adds the given ExposedThing to the registry or rebuilds
+        its Routes if they are outdated. Raises ValueError if another
+        ExposedThing with the same name is already registered."""
+
+        title = exposed_thing.thing.title
+        existing = self._things.get(title)
+
+        if existing is not None and existing is not exposed_thing:
+            raise ValueError("Duplicate Exposed Thing: {}".format(title))
+
+        if existing is not None and self._revisions[title] == exposed_thing.thing.revision:
+            return
+
+        routes = self._build_routes(exposed_thing)
+        thing_names = self._thing_names(exposed_thing)
+
+        self._discard(title)
+        self._routes.update(routes)
+        self._things.update({thing_name: exposed_thing for thing_name in thing_names})
+        self._keys[title] = (thing_names, list(routes.keys()))
+        self._revisions[title] = exposed_thing.thing.revision
+
+    def register_many(self, exposed_things):
+        """Adds the given ExposedThings to the registry."""
+
+        for exposed_thing in exposed_things:
+            self.register(exposed_thing)
+
+    def unregister(self, thing_name):
+        """Removes the ExposedThing with the given name (or URL-safe name) from the registry."""
+
+        exposed_thing = self._things.get(thing_name)
+
+        if exposed_thing is not None:
+            self._discard(exposed_thing.thing.title)
+
+    def find_thing(self, thing_name):
+        """Returns the ExposedThing with the given name (or URL-safe name) or None."""
+
+        return self._things.get(thing_name)
+
+    def resolve(self, thing_name, name, kind):
+        """Returns the Route to the Interaction of the given kind and name in
+        the given ExposedThing or None if it can't be found. The Routes of a
+        Thing are rebuilt if its Interactions have changed since they were built."""
+
+        route = self._routes.get((thing_name, name, kind))
+
+        if route is not None and route.revision == route.exposed_thing.thing.revision:
+            return route
+
+        exposed_thing = self._things.get(thing_name)
+
+        if exposed_thing is None:
+            return None
+
+        if self._revisions[exposed_thing.thing.title] == exposed_thing.thing.revision:
+            return route
+
+        self.register(exposed_thing)
+
+        return self._routes.get((thing_name, name, kind))
@@ -7,66 +7,88 @@ Class that represents a WoT servient.
 
 import asyncio
 import functools
+import itertools
 import re
 import socket
 
 import tornado.web
-from influxdb_client import InfluxDBClient
 from wotpy.protocols.enums import Protocols
-from wotpy.protocols.http.client import HTTPClient
-from wotpy.protocols.ws.client import WebsocketClient
 from wotpy.support import (is_coap_supported, is_mqtt_supported)
+from wotpy.utils.profiling import startup_phase
 from wotpy.utils.utils import get_main_ipv4_address
-from wotpy.database.influxdb_database import InfluxDB
+from wotpy.database.enums import InfluxDBLayout
+from wotpy.database.sqlite_blob_store import SQLiteBlobStore
 from wotpy.database.sqlite_database import SQLiteDatabase
+from wotpy.wot.catalogue import TDCatalogue
 from wotpy.wot.enums import InteractionTypes
+from wotpy.wot.exposed.action_engine import ActionPools
 from wotpy.wot.exposed.thing_set import ExposedThingSet
-from wotpy.wot.td import ThingDescription
+from wotpy.wot.routing import RoutingRegistry
 from wotpy.wot.wot import WoT
 
 
-class TDHandler(tornado.web.RequestHandler):
-    """Handler that returns the TD document of a given Thing."""
+class BaseTDHandler(tornado.web.RequestHandler):
+    """Base handler that writes pre-serialized documents of the TD catalogue
+    using the encoding negotiated with the client and answers with
+    304 Not Modified when the ETag of the document has not changed."""
+
+    HEADER_VERSION = "X-Catalogue-Version"
 
     def initialize(self, servient):
         self.servient = servient
 
-    def get(self, thing_url_name):
-        exp_thing = self.servient.exposed_thing_set.find_by_thing_name(
-            thing_url_name)
+    def write_document(self, document):
+        """Writes the given EncodedDocument."""
 
-        td_doc = ThingDescription.from_thing(exp_thing.thing).to_dict()
-        base_url = self.servient.get_thing_base_url(exp_thing)
+        encoding = document.negotiate(self.request.headers.get("Accept-Encoding"))
 
-        if base_url:
-            td_doc.update({"base": base_url})
+        self.set_header("Content-Type", "application/json; charset=UTF-8")
+        self.set_header("Vary", "Accept-Encoding")
+        self.set_header("Etag", document.etag(encoding))
+        self.set_header(self.HEADER_VERSION, str(self.servient.td_catalogue.version))
 
-        self.write(td_doc)
+        if self._matches_etag(document):
+            self.set_status(304)
+            return
 
+        if encoding != "identity":
+            self.set_header("Content-Encoding", encoding)
 
-class TDCatalogueHandler(tornado.web.RequestHandler):
-    """Handler that returns the entire catalogue of Things contained in this servient.
-    May return TDs in expanded format or URL pointers to the individual TDs."""
+        self.write(document.encode(encoding))
 
-    def initialize(self, servient):
-        self.servient = servient
+    def _matches_etag(self, document):
+        """Returns True if the If-None-Match header matches any representation of the document."""
 
-    def get(self):
-        response = {}
+        header = self.request.headers.get("If-None-Match", "")
 
-        for exp_thing in self.servient.enabled_exposed_things:
-            thing_name = exp_thing.thing.title
+        if header.strip() == "*":
+            return True
+
+        tags = {tag.strip()[2:] if tag.strip().startswith("W/") else tag.strip() for tag in header.split(",")}
+
+        return any(etag in tags for etag in document.etags)
 
-            if self.get_argument("expanded", False):
-                val = ThingDescription.from_thing(exp_thing.thing).to_dict()
-                val.update(
-                    {"base": self.servient.get_thing_base_url(exp_thing)})
-            else:
-                val = "/{}".format(exp_thing.thing.url_name)
 
-            response[thing_name] = val
+class TDHandler(BaseTDHandler):
+    """Handler that returns the TD document of a given Thing."""
+
+    def get(self, thing_url_name):
+        document = self.servient.td_catalogue.thing_document(thing_url_name)
+
+        if document is None:
+            raise tornado.web.HTTPError(404)
+
+        self.write_document(document)
+
+
+class TDCatalogueHandler(BaseTDHandler):
+    """Handler that returns the entire catalogue of Things contained in this servient.
+    May return TDs in expanded format or URL pointers to the individual TDs."""
+
+    def get(self):
+        expanded = bool(self.get_argument("expanded", False))
 
-        self.write(response)
+        self.write_document(self.servient.td_catalogue.catalogue_document(expanded=expanded))
 
 
 class ServientStateException(Exception):
@@ -118,7 +140,12 @@ class Servient:
     def __init__(self, hostname=None, catalogue_port=9090,
                  clients=None, clients_config=None, create_default_forms=True,
                  influxdb_enabled=False, influxdb_token=None, influxdb_url=None,
-                 sqlite_db_path=None):
+                 influxdb_batch_options=None, influxdb_layout=None, influxdb_bucket=None,
+                 influxdb_connection_options=None, influxdb_event_log_options=None,
+                 sqlite_db_path=None, sqlite_options=None, blob_chunk_size=None,
+                 property_history_size=None, property_change_policies=None,
+                 action_execution_policies=None, action_thread_pool_size=None,
+                 action_process_pool_size=None, cluster=None):
         self._hostname = hostname if hostname is not None else _get_hostname_fallback()
 
         if not isinstance(self._hostname, str):
@@ -132,22 +159,39 @@ class Servient:
         self._clients_config = clients_config
         self._catalogue_port = catalogue_port
         self._catalogue_server = None
+        self._td_catalogue = TDCatalogue(self)
         self._exposed_thing_set = ExposedThingSet()
+        self._routing_registry = RoutingRegistry()
         self._servient_lock = asyncio.Lock()
         self._is_running = False
         self._create_default_forms = create_default_forms
         self._enabled_exposed_thing_names = set()
         self._credential_store = {}
+        self._property_history_size = property_history_size
+        self._property_change_policies = property_change_policies or {}
+        self._action_execution_policies = action_execution_policies or {}
+        self._action_pools = ActionPools(
+            thread_pool_size=action_thread_pool_size,
+            process_pool_size=action_process_pool_size)
+        self._cluster = cluster
         self._influxdb_enabled = influxdb_enabled
-        self._sqlite_db = SQLiteDatabase(sqlite_db_path)
         self._influxdb = None
-        if influxdb_enabled:
-            self._influxdb = InfluxDB(url=influxdb_url, org="wot", token=influxdb_token)
-            if not self._influxdb.is_reachable:
-                raise ConnectionError(f"Connection to the InfluxDB database failed")
 
-        if not len(self._clients):
-            self._build_default_clients()
+        with startup_phase("DB init"):
+            self._sqlite_db = SQLiteDatabase(sqlite_db_path, **(sqlite_options or {}))
+            self._blob_store = SQLiteBlobStore(self._sqlite_db, chunk_size=blob_chunk_size)
+
+            if influxdb_enabled:
+                from wotpy.database.influxdb_database import InfluxDB
+                self._influxdb = InfluxDB(
+                    url=influxdb_url, org="wot", token=influxdb_token,
+                    batch_options=influxdb_batch_options,
+                    layout=influxdb_layout or InfluxDBLayout.BUCKET_PER_KEY,
+                    bucket=influxdb_bucket,
+                    connection_options=influxdb_connection_options,
+                    event_log_options=influxdb_event_log_options)
+
+        self._default_clients_pending = not len(self._clients)
 
     @staticmethod
     def _default_select_client(clients, td, name):
@@ -216,6 +260,46 @@ class Servient:
 
         return self._sqlite_db
 
+    @property
+    def blob_store(self):
+        """Returns a store of binary blobs kept in the sqlite database."""
+
+        return self._blob_store
+
+    @property
+    def property_history_size(self):
+        """Returns the number of samples kept in memory for each
+        Property of the ExposedThings (None for the default)."""
+
+        return self._property_history_size
+
+    @property
+    def property_change_policies(self):
+        """Returns a dict with the change policies of the
+        Properties of the ExposedThings indexed by Property name."""
+
+        return self._property_change_policies
+
+    @property
+    def action_execution_policies(self):
+        """Returns a dict with the execution policies of the
+        Actions of the ExposedThings indexed by Action name."""
+
+        return self._action_execution_policies
+
+    @property
+    def action_pools(self):
+        """Returns the pools of threads and processes that run Action handlers."""
+
+        return self._action_pools
+
+    @property
+    def cluster(self):
+        """Returns the ServientCluster that shares the state of the
+        ExposedThings with other worker processes (None if standalone)."""
+
+        return self._cluster
+
     @property
     def is_running(self):
         """Returns True if the Servient is currently running
@@ -236,6 +320,13 @@ class Servient:
 
         return self._exposed_thing_set
 
+    @property
+    def routing_registry(self):
+        """Returns the RoutingRegistry shared by the servers of this servient
+        to resolve the requests to the enabled ExposedThings."""
+
+        return self._routing_registry
+
     @property
     def exposed_things(self):
         """Returns an iterator for the ExposedThings contained in this Servient."""
@@ -258,7 +349,12 @@ class Servient:
 
     @property
     def clients(self):
-        """Returns the dict of Protocol Binding clients attached to this servient."""
+        """Returns the dict of Protocol Binding clients attached to this servient.
+        The default clients are built the first time they are needed."""
+
+        if self._default_clients_pending:
+            self._default_clients_pending = False
+            self._build_default_clients()
 
         return self._clients
 
@@ -268,6 +364,12 @@ class Servient:
 
         return self._catalogue_port
 
+    @property
+    def td_catalogue(self):
+        """Returns the cache of the serialized documents of the TD catalogue."""
+
+        return self._td_catalogue
+
     @catalogue_port.setter
     @_stopped_servient_only
     def catalogue_port(self, port):
@@ -282,6 +384,9 @@ class Servient:
 
         conf = self._clients_config if self._clients_config else {}
 
+        from wotpy.protocols.http.client import HTTPClient
+        from wotpy.protocols.ws.client import WebsocketClient
+
         self._clients.update({
             Protocols.WEBSOCKETS: WebsocketClient(**conf.get(Protocols.WEBSOCKETS, {})),
             Protocols.HTTP: HTTPClient(**conf.get(Protocols.HTTP, {}))
@@ -313,7 +418,8 @@ class Servient:
             return
 
         catalogue_app = self._build_td_catalogue_app()
-        self._catalogue_server = catalogue_app.listen(self._catalogue_port)
+        self._catalogue_server = catalogue_app.listen(
+            self._catalogue_port, reuse_port=self._cluster is not None)
 
     def _stop_catalogue(self):
         """Stops the TD catalogue server if running."""
@@ -329,6 +435,8 @@ class Servient:
         contained in this Servient."""
 
         for exposed_thing in self._exposed_thing_set.exposed_things:
+            exposed_thing.thing.clean_forms()
+
             for interaction in exposed_thing.thing.interactions:
                 interaction.clean_forms()
 
@@ -339,14 +447,14 @@ class Servient:
         assert self._exposed_thing_set.contains(exposed_thing)
         assert protocol in self._servers
 
-        for interaction in exposed_thing.thing.interactions:
+        for item in itertools.chain([exposed_thing.thing], exposed_thing.thing.interactions):
             forms_to_remove = [
-                form for form in interaction.forms
+                form for form in item.forms
                 if form.protocol == protocol
             ]
 
             for form in forms_to_remove:
-                interaction.remove_form(form)
+                item.remove_form(form)
 
     def _server_has_exposed_thing(self, server, exposed_thing):
         """Returns True if the given server contains the ExposedThing."""
@@ -369,15 +477,41 @@ class Servient:
             for form in forms:
                 interaction.add_form(form)
 
-    def _regenerate_server_forms(self, server):
-        """Cleans and regenerates Forms for the given server in all ExposedThings."""
+        for form in server.build_thing_forms(hostname=self._hostname, thing=exposed_thing.thing):
+            exposed_thing.thing.add_form(form)
 
-        assert server in self._servers.values()
+    def _regenerate_thing_forms(self, exposed_thing):
+        """Cleans and regenerates the Forms of all the servers for the given ExposedThing only."""
 
-        for exp_thing in self._exposed_thing_set.exposed_things:
-            self._clean_protocol_forms(exp_thing, server.protocol)
-            if self._server_has_exposed_thing(server, exp_thing):
-                self._add_interaction_forms(server, exp_thing)
+        for server in self._servers.values():
+            self._clean_protocol_forms(exposed_thing, server.protocol)
+            if self._server_has_exposed_thing(server, exposed_thing):
+                self._add_interaction_forms(server, exposed_thing)
+
+    def refresh_interaction_forms(self, exposed_thing, interaction):
+        """Regenerates the Forms of a single Interaction of an enabled ExposedThing
+        (e.g. after the Interaction has been added to the Thing)."""
+
+        if not self._exposed_thing_set.contains(exposed_thing):
+            return
+
+        if exposed_thing.title not in self._enabled_exposed_thing_names:
+            return
+
+        for server in self._servers.values():
+            for form in [item for item in interaction.forms if item.protocol == server.protocol]:
+                interaction.remove_form(form)
+
+            if self._server_has_exposed_thing(server, exposed_thing):
+                for form in server.build_forms(hostname=self._hostname, interaction=interaction):
+                    interaction.add_form(form)
+
+    def _resolve_influxdb_buckets(self, exposed_thing):
+        """Adds the buckets used by the given ExposedThing to the
+        InfluxDB bucket registry so they are not looked up on every write."""
+
+        self.influxdb.resolve_buckets(
+            exposed_thing.title, exposed_thing.thing.properties.keys())
 
     def get_thing_base_url(self, exposed_thing):
         """Return the base URL for the given ExposedThing
@@ -418,29 +552,52 @@ class Servient:
 
         return Servient._default_select_client(self.clients.values(), td, name)
 
+    def select_thing_client(self, td, op):
+        """Returns the Protocol Binding client instance to execute the given Thing-level
+        operation (e.g. readmultipleproperties) on the given TD. Clients with a Thing-level
+        Form for the operation are preferred, otherwise the client selected for the
+        first Property is returned (which falls back to one request per Property)."""
+
+        protocol_prefs = [Protocols.MQTT, Protocols.HTTP, Protocols.COAP, Protocols.WEBSOCKETS]
+
+        for protocol in protocol_prefs:
+            client = self.clients.get(protocol)
+
+            if client and client.is_supported_thing_operation(td, op):
+                return client
+
+        if not len(td.properties):
+            raise ValueError("Thing has no Properties")
+
+        return self.select_client(td, next(iter(td.properties)))
+
     @_stopped_servient_only
     def add_client(self, client):
         """Adds a new Protocol Binding client to this servient."""
 
-        self._clients[client.protocol] = client
+        self.clients[client.protocol] = client
 
     @_stopped_servient_only
     def remove_client(self, protocol):
         """Removes the Protocol Binding client with the given protocol from this servient."""
 
-        self._clients.pop(protocol, None)
+        self.clients.pop(protocol, None)
 
     @_stopped_servient_only
     def add_server(self, server):
         """Adds a new Protocol Binding server to this servient."""
 
+        server.routing_registry = self._routing_registry
         self._servers[server.protocol] = server
 
     @_stopped_servient_only
     def remove_server(self, protocol):
         """Removes the Protocol Binding server with the given protocol from this servient."""
 
-        self._servers.pop(protocol, None)
+        server = self._servers.pop(protocol, None)
+
+        if server is not None:
+            server.routing_registry = RoutingRegistry()
 
     def refresh_forms(self):
         """Cleans and regenerates autogenerated Forms for all the
@@ -448,20 +605,35 @@ class Servient:
 
         self._clean_forms()
 
-        for server in self._servers.values():
-            self._regenerate_server_forms(server)
+        for exp_thing in self._exposed_thing_set.exposed_things:
+            self._regenerate_thing_forms(exp_thing)
 
     def enable_exposed_thing(self, thing_name):
         """Enables the ExposedThing with the given Name.
         This is, the servers will listen for requests for this thing."""
 
-        exposed_thing = self.get_exposed_thing(thing_name)
+        self.expose_many([thing_name])
 
-        for server in self._servers.values():
-            server.add_exposed_thing(exposed_thing)
-            self._regenerate_server_forms(server)
+    def expose_many(self, thing_names):
+        """Enables the ExposedThings with the given Names in a single pass.
+        Only the Forms of these ExposedThings are generated and the
+        TD catalogue picks up the whole batch as a single new version.
+        The Routes of the batch are registered once its Forms are generated."""
+
+        exposed_things = [self.get_exposed_thing(thing_name) for thing_name in thing_names]
+
+        for exposed_thing in exposed_things:
+            for server in self._servers.values():
+                server.add_exposed_thing(exposed_thing)
 
-        self._enabled_exposed_thing_names.add(exposed_thing.title)
+            self._regenerate_thing_forms(exposed_thing)
+
+            if self._influxdb_enabled and self._is_running:
+                self._resolve_influxdb_buckets(exposed_thing)
+
+            self._enabled_exposed_thing_names.add(exposed_thing.title)
+
+        self._routing_registry.register_many(exposed_things)
 
     def disable_exposed_thing(self, thing_name):
         """Disables the ExposedThing with the given Name.
@@ -475,8 +647,9 @@ class Servient:
 
         for server in self._servers.values():
             server.remove_exposed_thing(exposed_thing.title)
-            self._regenerate_server_forms(server)
 
+        self._routing_registry.unregister(exposed_thing.title)
+        self._regenerate_thing_forms(exposed_thing)
         self._enabled_exposed_thing_names.remove(exposed_thing.title)
 
     def add_exposed_thing(self, exposed_thing):
@@ -485,6 +658,9 @@ class Servient:
 
         self._exposed_thing_set.add(exposed_thing)
 
+        if self._cluster is not None:
+            self._cluster.request_snapshot(exposed_thing)
+
     def remove_exposed_thing(self, thing_name):
         """Disables and removes an ExposedThing from this Servient."""
 
@@ -515,12 +691,19 @@ class Servient:
 
         async with self._servient_lock:
             if self._influxdb_enabled:
-                self.influxdb.init_apis()
+                with startup_phase("DB init"):
+                    self.influxdb.init_apis()
+                    for exposed_thing in self.exposed_things:
+                        self._resolve_influxdb_buckets(exposed_thing)
             if self._create_default_forms:
                 self.refresh_forms()
-            for server in self._servers.values():
-                await server.start(self)
-            self._start_catalogue()
+            with startup_phase("server bind"):
+                if self._cluster is not None:
+                    await self._cluster.start(self)
+                for server in self._servers.values():
+                    if self._cluster is None or self._cluster.is_leader or server.reuse_port:
+                        await server.start(self)
+                self._start_catalogue()
             self._is_running = True
 
             return WoT(servient=self)
@@ -530,8 +713,13 @@ class Servient:
 
         async with self._servient_lock:
             if self._influxdb_enabled:
+                await self.influxdb.shutdown()
                 self.influxdb.close_apis()
+            await self._sqlite_db.flush()
             for server in self._servers.values():
                 await server.stop()
             self._stop_catalogue()
+            if self._cluster is not None:
+                await self._cluster.stop()
+            self._action_pools.shutdown()
             self._is_running = False
@@ -7,6 +7,8 @@ Schema following the JSON Schema specification used to validate the shape of Thi
 
 import re
 
+import jsonschema
+
 from wotpy.wot.enums import InteractionTypes
 
 REGEX_SAFE_NAME = r"^[a-zA-Z0-9_-]+$"
@@ -1453,6 +1455,13 @@ SCHEMA_THING = {
 }
 
 
+"""Validator compiled once for the TD schema, which is much faster
+than building a new one from the schema on every validation."""
+
+THING_VALIDATOR = jsonschema.Draft7Validator(
+    SCHEMA_THING, format_checker=jsonschema.Draft7Validator.FORMAT_CHECKER)
+
+
 def is_valid_uri(val):
     """Returns True if the given value is a valid URI."""
 
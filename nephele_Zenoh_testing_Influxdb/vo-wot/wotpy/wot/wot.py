@@ -11,7 +11,6 @@ import logging
 import reactivex
 from tornado.httpclient import AsyncHTTPClient, HTTPRequest
 
-from wotpy.protocols.http.credential import OIDC4VPCredential
 from wotpy.wot.consumed.thing import ConsumedThing
 from wotpy.wot.dictionaries.thing import ThingFragment
 from wotpy.wot.enums import DiscoveryMethod
@@ -83,6 +82,8 @@ class WoT:
             if requester is None:
                 raise ValueError("Missing Verifiable credentials requester URL/IP")
 
+            from wotpy.protocols.http.credential import OIDC4VPCredential
+
             token = await OIDC4VPCredential.holder_token_request(
                 holder_url, url, "GET", requester
             )